@@ -56,13 +56,18 @@ from .models import (
     is_electron_mcp_enabled,
 )
 from .permissions import get_all_agent_types, get_allowed_tools
-from .registry import create_auto_claude_mcp_server, is_tools_available
+from .registry import (
+    TOOLS_AVAILABLE,
+    create_auto_claude_mcp_server,
+    is_tools_available,
+)
 
 __all__ = [
     # Main API
     "create_auto_claude_mcp_server",
     "get_allowed_tools",
     "is_tools_available",
+    "TOOLS_AVAILABLE",
     # Agent configuration registry
     "AGENT_CONFIGS",
     "get_agent_config",
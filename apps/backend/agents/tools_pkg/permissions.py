@@ -24,7 +24,7 @@ from .models import (
     get_agent_config,
     get_required_mcp_servers,
 )
-from .registry import is_tools_available
+from .registry import TOOLS_AVAILABLE
 
 
 def get_allowed_tools(
@@ -68,7 +68,7 @@ def get_allowed_tools(
 
     # Add auto-claude tools ONLY if the MCP server is available
     # This prevents allowing tools that won't work because the server isn't running
-    if "auto-claude" in required_servers and is_tools_available():
+    if "auto-claude" in required_servers and TOOLS_AVAILABLE:
         tools.extend(config.get("auto_claude_tools", []))
 
     # Add MCP tool names based on required servers
@@ -9,6 +9,7 @@ glm_mcp.py module. This registry provides tool definitions that can
 be exposed via a custom MCP server if needed.
 """
 
+from functools import lru_cache
 from pathlib import Path
 
 from .tools import (
@@ -18,27 +19,74 @@ from .tools import (
     create_subtask_tools,
 )
 
+# Custom tools are always available with GLM
+TOOLS_AVAILABLE: bool = True
 
-def create_all_tools(spec_dir: Path, project_dir: Path) -> list:
+# Tool factories by category, in the order their tools are listed
+TOOL_FACTORIES = {
+    "subtask": create_subtask_tools,
+    "progress": create_progress_tools,
+    "memory": create_memory_tools,
+    "qa": create_qa_tools,
+}
+
+
+@lru_cache(maxsize=32)
+def _create_all_tools_cached(
+    spec_key: str, project_key: str, categories: frozenset[str] | None
+) -> tuple:
+    """Build the tool list for a resolved (spec_dir, project_dir) pair."""
+    spec_dir = Path(spec_key)
+    project_dir = Path(project_key)
+
+    all_tools = []
+
+    # Create tools by category, skipping factories that were not requested
+    for category, factory in TOOL_FACTORIES.items():
+        if categories is None or category in categories:
+            all_tools.extend(factory(spec_dir, project_dir))
+
+    return tuple(all_tools)
+
+
+def create_all_tools(
+    spec_dir: Path,
+    project_dir: Path,
+    categories: frozenset[str] | None = None,
+) -> list:
     """
-    Create all custom tools with the given spec and project directories.
+    Create custom tools with the given spec and project directories.
+
+    Results are cached per resolved (spec_dir, project_dir, categories), so
+    repeated client creation across agent phases reuses the same tool closures.
+    Use clear_tool_cache() to drop the cache.
 
     Args:
         spec_dir: Path to the spec directory
         project_dir: Path to the project root
+        categories: Optional subset of TOOL_FACTORIES keys to build
+                    (None = all categories)
 
     Returns:
-        List of all tool functions
+        List of tool functions (a fresh list; safe to mutate)
+
+    Raises:
+        ValueError: If categories contains an unknown category name
     """
-    all_tools = []
+    if categories is not None:
+        categories = frozenset(categories)
+        unknown = categories - TOOL_FACTORIES.keys()
+        if unknown:
+            raise ValueError(f"Unknown tool categories: {sorted(unknown)}")
+
+    spec_key = str(Path(spec_dir).resolve())
+    project_key = str(Path(project_dir).resolve())
+    return list(_create_all_tools_cached(spec_key, project_key, categories))
 
-    # Create tools by category
-    all_tools.extend(create_subtask_tools(spec_dir, project_dir))
-    all_tools.extend(create_progress_tools(spec_dir, project_dir))
-    all_tools.extend(create_memory_tools(spec_dir, project_dir))
-    all_tools.extend(create_qa_tools(spec_dir, project_dir))
 
-    return all_tools
+def clear_tool_cache() -> None:
+    """Drop the tool lists cached by create_all_tools()."""
+    _create_all_tools_cached.cache_clear()
 
 
 def create_auto_claude_mcp_server(spec_dir: Path, project_dir: Path):
@@ -64,6 +112,6 @@ def create_auto_claude_mcp_server(spec_dir: Path, project_dir: Path):
 def is_tools_available() -> bool:
     """Check if custom tools functionality is available.
     
-    Returns True since tools are always available with GLM.
+    Kept for API compatibility; internal callers read TOOLS_AVAILABLE directly.
     """
-    return True
+    return TOOLS_AVAILABLE
@@ -6,7 +6,6 @@ GLM-compatible tool decorator that works without Claude SDK.
 Provides a simple way to define tools with metadata.
 """
 
-from functools import wraps
 from typing import Any, Callable, Dict
 
 
@@ -35,17 +34,19 @@ def tool(name: str, description: str, parameters: Dict[str, type]) -> Callable:
             return {"content": [{"type": "text", "text": "Done"}]}
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            return await func(*args, **kwargs)
+        # Attach metadata directly; no forwarding wrapper is needed
+        func._tool_name = name
+        func._tool_description = description
+        func._tool_parameters = parameters
+        func._is_tool = True
+        # Pre-built metadata dict returned by get_tool_metadata()
+        func._tool_metadata = {
+            "name": name,
+            "description": description,
+            "parameters": parameters,
+        }
         
-        # Attach metadata to the function
-        wrapper._tool_name = name
-        wrapper._tool_description = description
-        wrapper._tool_parameters = parameters
-        wrapper._is_tool = True
-        
-        return wrapper
+        return func
     
     return decorator
 
@@ -58,19 +59,19 @@ def get_tool_metadata(func: Callable) -> Dict[str, Any]:
         func: A tool-decorated function
         
     Returns:
-        Dict with name, description, and parameters
+        Dict with name, description, and parameters. The same dict is
+        returned on every call; treat it as read-only.
         
     Raises:
         ValueError: If function is not a tool
     """
-    if not getattr(func, "_is_tool", False):
+    # Metadata lives in the function's own __dict__, so read it directly
+    # rather than going through per-attribute getattr lookups
+    attrs = getattr(func, "__dict__", {})
+    if not attrs.get("_is_tool", False):
         raise ValueError(f"Function {func.__name__} is not a decorated tool")
     
-    return {
-        "name": func._tool_name,
-        "description": func._tool_description,
-        "parameters": func._tool_parameters,
-    }
+    return attrs["_tool_metadata"]
 
 
 def is_tool(func: Callable) -> bool:
@@ -80,6 +80,7 @@ def handle_build_command(
     """
     # Lazy imports to avoid loading heavy modules
     from agent import run_autonomous_agent, sync_plan_to_source
+    from core.glm_client import run_then_shutdown
     from debug import (
         debug,
         debug_info,
@@ -224,13 +225,15 @@ def handle_build_command(
         debug("run.py", "Starting agent execution")
 
         asyncio.run(
-            run_autonomous_agent(
-                project_dir=working_dir,  # Use worktree if isolated
-                spec_dir=spec_dir,
-                model=model,
-                max_iterations=max_iterations,
-                verbose=verbose,
-                source_spec_dir=source_spec_dir,  # For syncing progress back to main project
+            run_then_shutdown(
+                run_autonomous_agent(
+                    project_dir=working_dir,  # Use worktree if isolated
+                    spec_dir=spec_dir,
+                    model=model,
+                    max_iterations=max_iterations,
+                    verbose=verbose,
+                    source_spec_dir=source_spec_dir,  # For syncing progress back to main project
+                )
             )
         )
         debug_success("run.py", "Agent execution completed")
@@ -247,11 +250,13 @@ def handle_build_command(
 
             try:
                 qa_approved = asyncio.run(
-                    run_qa_validation_loop(
-                        project_dir=working_dir,
-                        spec_dir=spec_dir,
-                        model=model,
-                        verbose=verbose,
+                    run_then_shutdown(
+                        run_qa_validation_loop(
+                            project_dir=working_dir,
+                            spec_dir=spec_dir,
+                            model=model,
+                            verbose=verbose,
+                        )
                     )
                 )
 
@@ -337,6 +342,7 @@ def _handle_build_interrupt(
         verbose: Verbose mode flag
     """
     from agent import run_autonomous_agent
+    from core.glm_client import run_then_shutdown
 
     # Print paused banner
     print_paused_banner(spec_dir, spec_dir.name, has_worktree=bool(worktree_manager))
@@ -435,12 +441,14 @@ def _handle_build_interrupt(
             print_status("Resuming build...", "info")
             status_manager.update(state=BuildState.RUNNING)
             asyncio.run(
-                run_autonomous_agent(
-                    project_dir=working_dir,
-                    spec_dir=spec_dir,
-                    model=model,
-                    max_iterations=max_iterations,
-                    verbose=verbose,
+                run_then_shutdown(
+                    run_autonomous_agent(
+                        project_dir=working_dir,
+                        spec_dir=spec_dir,
+                        model=model,
+                        max_iterations=max_iterations,
+                        verbose=verbose,
+                    )
                 )
             )
             # Build completed or was interrupted again - exit
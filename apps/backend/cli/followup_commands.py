@@ -233,6 +233,7 @@ def handle_followup_command(
     """
     # Lazy imports to avoid loading heavy modules
     from agent import run_followup_planner
+    from core.glm_client import run_then_shutdown
 
     from .utils import print_banner, validate_environment
 
@@ -330,11 +331,13 @@ def handle_followup_command(
 
     try:
         success_result = asyncio.run(
-            run_followup_planner(
-                project_dir=project_dir,
-                spec_dir=spec_dir,
-                model=model,
-                verbose=verbose,
+            run_then_shutdown(
+                run_followup_planner(
+                    project_dir=project_dir,
+                    spec_dir=spec_dir,
+                    model=model,
+                    verbose=verbose,
+                )
             )
         )
 
@@ -14,6 +14,7 @@ _PARENT_DIR = Path(__file__).parent.parent
 if str(_PARENT_DIR) not in sys.path:
     sys.path.insert(0, str(_PARENT_DIR))
 
+from core.glm_client import run_then_shutdown
 from progress import count_subtasks
 from qa_loop import (
     is_qa_approved,
@@ -110,11 +111,13 @@ def handle_qa_command(
 
     try:
         approved = asyncio.run(
-            run_qa_validation_loop(
-                project_dir=project_dir,
-                spec_dir=spec_dir,
-                model=model,
-                verbose=verbose,
+            run_then_shutdown(
+                run_qa_validation_loop(
+                    project_dir=project_dir,
+                    spec_dir=spec_dir,
+                    model=model,
+                    verbose=verbose,
+                )
             )
         )
         if approved:
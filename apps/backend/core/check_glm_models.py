@@ -5,6 +5,22 @@ import asyncio
 import os
 from openai import AsyncOpenAI
 
+# Model names to try
+MODELS_TO_TRY = (
+    "glm-4",
+    "glm-4-flash",
+    "glm-4-plus",
+    "glm-4-air",
+    "glm-4-0520",
+    "glm-4v",
+    "glm-4-alltools",
+    "glm-4-9b-chat",
+)
+
+# Column width for model names in the report
+MODEL_NAME_WIDTH = 20
+
+
 async def test_models():
     """Test different GLM model names."""
     api_key = os.environ.get("ZHIPUAI_API_KEY")
@@ -17,36 +33,32 @@ async def test_models():
         base_url="https://open.bigmodel.cn/api/paas/v4/"
     )
     
-    # Model names to try
-    models_to_try = [
-        "glm-4",
-        "glm-4-flash",
-        "glm-4-plus",
-        "glm-4-air",
-        "glm-4-0520",
-        "glm-4v",
-        "glm-4-alltools",
-        "glm-4-9b-chat",
-    ]
-    
     print("Testing GLM Models...")
     print("=" * 60)
     
-    for model in models_to_try:
+    async def probe(model):
         try:
             response = await client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": "Hi"}],
                 max_tokens=10
             )
-            print(f"✅ {model:20} - WORKS")
-            print(f"   Response: {response.choices[0].message.content}")
+            return model, True, response.choices[0].message.content, None
         except Exception as e:
-            error_msg = str(e)
-            if "1211" in error_msg:
-                print(f"❌ {model:20} - Model not found")
-            else:
-                print(f"⚠️  {model:20} - Error: {error_msg[:50]}")
+            return model, False, None, str(e)
+    
+    # Probes are independent, so run them concurrently and report in order
+    results = await asyncio.gather(*(probe(model) for model in MODELS_TO_TRY))
+    
+    for model, ok, content, error_msg in results:
+        if ok:
+            print(f"✅ {model:<{MODEL_NAME_WIDTH}} - WORKS")
+            if content:
+                print(f"   Response: {content}")
+        elif "1211" in error_msg:
+            print(f"❌ {model:<{MODEL_NAME_WIDTH}} - Model not found")
+        else:
+            print(f"⚠️  {model:<{MODEL_NAME_WIDTH}} - Error: {error_msg[:50]}")
     
     await client.close()
 
@@ -19,35 +19,75 @@ Environment Variables:
     GLM_MODEL: Optional - Default model (defaults to glm-4.7)
 """
 
-import json
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-
-from agents.tools_pkg import (
-    CONTEXT7_TOOLS,
-    ELECTRON_TOOLS,
-    GRAPHITI_MCP_TOOLS,
-    LINEAR_TOOLS,
-    PUPPETEER_TOOLS,
-    create_auto_claude_mcp_server,
-    get_allowed_tools,
-    get_required_mcp_servers,
-    is_tools_available,
+from typing import TYPE_CHECKING
+
+# Heavy dependencies (GLM client, prompt helpers, security hooks, tool registry)
+# are imported lazily inside create_client() so that `import core.client` stays
+# cheap for CLI paths that never construct a client.
+if TYPE_CHECKING:
+    from core.glm_client import GLMAgentClient
+
+
+def __getattr__(name):
+    """Lazy imports for names that used to be imported at module load."""
+    if name == "GLMAgentClient":
+        from core.glm_client import GLMAgentClient
+
+        return GLMAgentClient
+    elif name == "GLMAgentOptions":
+        from core.glm_options import GLMAgentOptions
+
+        return GLMAgentOptions
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Static stdio MCP server commands, keyed by server name. Servers that need
+# runtime data (linear, graphiti) are configured inside create_client().
+_MCP_SERVER_TEMPLATES = {
+    "context7": ("npx", ("-y", "@upstash/context7-mcp")),
+    "electron": ("npm", ("exec", "electron-mcp-server")),
+    "puppeteer": ("npx", ("puppeteer-mcp-server",)),
+}
+
+
+# Agent types that get the detected project capabilities in their diagnostics
+_QA_AGENT_TYPES = frozenset({"qa_reviewer", "qa_fixer"})
+
+# Display names for the keys returned by detect_project_capabilities()
+_CAPABILITY_DISPLAY_NAMES = {
+    "is_electron": "electron",
+    "is_tauri": "tauri",
+    "is_expo": "expo",
+    "is_react_native": "react_native",
+    "is_web_frontend": "web_frontend",
+    "is_nextjs": "nextjs",
+    "is_nuxt": "nuxt",
+    "has_api": "api",
+    "has_database": "database",
+}
+
+# Static system prompt shared by every agent; {cwd} is the resolved project dir.
+_BASE_PROMPT_TEMPLATE = (
+    "You are an expert full-stack developer building production-quality software. "
+    "Your working directory is: {cwd}\n"
+    "Your filesystem access is RESTRICTED to this directory only. "
+    "Use relative paths (starting with ./) for all file operations. "
+    "Never use absolute paths or try to access files outside your working directory.\n\n"
+    "IMPORTANT TOOL USAGE RULES:\n"
+    "- Use the Write tool to create or update files (NOT bash commands like cat > file)\n"
+    "- Use the Edit tool to modify existing files (NOT sed or other bash text tools)\n"
+    "- Use the Read tool to read file contents (NOT cat or head)\n"
+    "- Use Bash tool ONLY for: running tests, building projects, starting servers, or system commands\n"
+    "- NEVER use bash heredocs (<<EOF) or redirection (>) for file writes - use Write tool\n\n"
+    "You follow existing code patterns, write clean maintainable code, and verify "
+    "your work through thorough testing. You communicate progress through Git commits "
+    "and build-progress.txt updates."
 )
 
-# Import GLM client
-from core.glm_client import GLMAgentClient
-from core.glm_options import GLMAgentOptions
-
-from linear_updater import is_linear_enabled
-from prompts_pkg.project_context import detect_project_capabilities, load_project_index
-from security import bash_security_hook
-
-
-def get_electron_debug_port() -> int:
-    """Get the Electron debugging port from environment."""
-    return int(os.environ.get("ELECTRON_DEBUG_PORT", "9222"))
-
 
 def is_graphiti_mcp_enabled() -> bool:
     """
@@ -85,10 +125,16 @@ def should_use_claude_md() -> bool:
     return os.environ.get("USE_CLAUDE_MD", "").lower() == "true"
 
 
+# CLAUDE.md contents keyed by path, stored with the (mtime_ns, size) they were read at
+_claude_md_cache: dict[str, tuple[tuple[int, int], str]] = {}
+
+
 def load_claude_md(project_dir: Path) -> str | None:
     """
     Load CLAUDE.md content from project root if it exists.
 
+    The content is cached and only re-read when the file's mtime or size changes.
+
     Args:
         project_dir: Root directory of the project
 
@@ -96,12 +142,64 @@ def load_claude_md(project_dir: Path) -> str | None:
         Content of CLAUDE.md if found, None otherwise
     """
     claude_md_path = project_dir / "CLAUDE.md"
-    if claude_md_path.exists():
-        try:
-            return claude_md_path.read_text(encoding="utf-8")
-        except Exception:
-            return None
-    return None
+    try:
+        st = claude_md_path.stat()
+    except OSError:
+        return None
+
+    cache_key = str(claude_md_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _claude_md_cache.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        content = claude_md_path.read_text(encoding="utf-8")
+    except Exception:
+        return None
+    _claude_md_cache[cache_key] = (stamp, content)
+    return content
+
+
+@lru_cache(maxsize=8)
+def _cached_project_state(
+    project_dir_str: str, index_stamp: tuple[int, int] | None
+) -> tuple[dict, dict]:
+    """
+    Load the project index and detected capabilities for a project.
+
+    ``index_stamp`` is part of the cache key only, so a changed
+    project_index.json (new mtime/size) automatically misses the cache.
+    """
+    from prompts_pkg.project_context import (
+        detect_project_capabilities,
+        load_project_index,
+    )
+
+    project_index = load_project_index(Path(project_dir_str))
+    return project_index, detect_project_capabilities(project_index)
+
+
+def get_project_state(project_dir: Path) -> tuple[dict, dict]:
+    """
+    Get (project_index, project_capabilities) for a project, cached per run.
+
+    The cache is revalidated against the mtime and size of
+    .auto-claude/project_index.json on every call.
+
+    Args:
+        project_dir: Root directory of the project
+
+    Returns:
+        Tuple of (project_index, project_capabilities). Treat as read-only.
+    """
+    index_file = project_dir / ".auto-claude" / "project_index.json"
+    try:
+        st = index_file.stat()
+        index_stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        index_stamp = None
+    return _cached_project_state(str(project_dir.resolve()), index_stamp)
 
 
 def create_client(
@@ -111,7 +209,7 @@ def create_client(
     agent_type: str = "coder",
     max_thinking_tokens: int | None = None,
     output_format: dict | None = None,
-) -> GLMAgentClient:
+) -> "GLMAgentClient":
     """
     Create a GLM AI agent client with multi-layered security.
 
@@ -146,6 +244,11 @@ def create_client(
        (see security.py for ALLOWED_COMMANDS)
     3. Tool filtering - Each agent type only sees relevant tools (prevents misuse)
     """
+    from agents.tools_pkg import get_allowed_tools, get_required_mcp_servers
+    from core.glm_client import GLMAgentClient
+    from core.glm_options import GLMAgentOptions
+    from linear_updater import is_linear_enabled
+
     # Check API key
     if not os.environ.get("ZHIPUAI_API_KEY"):
         raise ValueError(
@@ -153,17 +256,16 @@ def create_client(
             "Get your key from: https://open.bigmodel.cn/"
         )
     
-    # Load project capabilities
-    project_index = load_project_index(project_dir)
-    project_capabilities = detect_project_capabilities(project_index)
+    # Resolve once; reused for the prompt, diagnostics and client cwd
+    resolved_project_dir = project_dir.resolve()
+    
+    # Load project capabilities (cached until project_index.json changes)
+    project_index, project_capabilities = get_project_state(resolved_project_dir)
     
     # Check if Linear integration is enabled
     linear_enabled = is_linear_enabled()
     linear_api_key = os.environ.get("LINEAR_API_KEY", "")
     
-    # Check if custom auto-claude tools are available
-    auto_claude_tools_enabled = is_tools_available()
-    
     # Get allowed tools using phase-aware configuration
     allowed_tools_list = get_allowed_tools(
         agent_type,
@@ -171,102 +273,82 @@ def create_client(
         linear_enabled,
     )
     
-    # Get required MCP servers for this agent type
-    required_servers = get_required_mcp_servers(
-        agent_type,
-        project_capabilities,
-        linear_enabled,
+    # Get required MCP servers for this agent type (frozenset for O(1) lookups)
+    required_servers = frozenset(
+        get_required_mcp_servers(
+            agent_type,
+            project_capabilities,
+            linear_enabled,
+        )
     )
     
-    # Build MCP server configurations
-    mcp_servers = {}
-    
-    if "context7" in required_servers:
-        mcp_servers["context7"] = {
-            "command": "npx",
-            "args": ["-y", "@upstash/context7-mcp"],
-        }
-    
-    if "electron" in required_servers:
-        mcp_servers["electron"] = {
-            "command": "npm",
-            "args": ["exec", "electron-mcp-server"],
-        }
-    
-    if "puppeteer" in required_servers:
-        mcp_servers["puppeteer"] = {
-            "command": "npx",
-            "args": ["puppeteer-mcp-server"],
+    # Build MCP server configurations (fresh dicts, so callers may mutate them).
+    # Agents without MCP servers skip the build entirely.
+    if required_servers:
+        mcp_servers = {
+            name: {"command": command, "args": list(args)}
+            for name, (command, args) in _MCP_SERVER_TEMPLATES.items()
+            if name in required_servers
         }
+        
+        if "linear" in required_servers:
+            mcp_servers["linear"] = {
+                "type": "http",
+                "url": "https://mcp.linear.app/mcp",
+                "headers": {"Authorization": f"Bearer {linear_api_key}"},
+            }
+        
+        # Graphiti MCP server for knowledge graph memory
+        if "graphiti" in required_servers:
+            mcp_servers["graphiti-memory"] = {
+                "type": "http",
+                "url": get_graphiti_mcp_url(),
+            }
+    else:
+        mcp_servers = {}
     
-    if "linear" in required_servers:
-        mcp_servers["linear"] = {
-            "type": "http",
-            "url": "https://mcp.linear.app/mcp",
-            "headers": {"Authorization": f"Bearer {linear_api_key}"},
-        }
-    
-    # Graphiti MCP server for knowledge graph memory
-    graphiti_mcp_enabled = "graphiti" in required_servers
-    if graphiti_mcp_enabled:
-        graphiti_url = os.environ.get("GRAPHITI_MCP_URL", "http://localhost:8000")
-        mcp_servers["graphiti-memory"] = {
-            "type": "http",
-            "url": graphiti_url,
-        }
+    # Diagnostics are collected and written to stdout in one go at the end
+    diagnostics = []
     
     # Build system prompt
-    base_prompt = (
-        f"You are an expert full-stack developer building production-quality software. "
-        f"Your working directory is: {project_dir.resolve()}\n"
-        f"Your filesystem access is RESTRICTED to this directory only. "
-        f"Use relative paths (starting with ./) for all file operations. "
-        f"Never use absolute paths or try to access files outside your working directory.\n\n"
-        f"IMPORTANT TOOL USAGE RULES:\n"
-        f"- Use the Write tool to create or update files (NOT bash commands like cat > file)\n"
-        f"- Use the Edit tool to modify existing files (NOT sed or other bash text tools)\n"
-        f"- Use the Read tool to read file contents (NOT cat or head)\n"
-        f"- Use Bash tool ONLY for: running tests, building projects, starting servers, or system commands\n"
-        f"- NEVER use bash heredocs (<<EOF) or redirection (>) for file writes - use Write tool\n\n"
-        f"You follow existing code patterns, write clean maintainable code, and verify "
-        f"your work through thorough testing. You communicate progress through Git commits "
-        f"and build-progress.txt updates."
-    )
+    base_prompt = _BASE_PROMPT_TEMPLATE.format(cwd=resolved_project_dir)
     
     # Include CLAUDE.md if enabled (project instructions work for any AI)
     if should_use_claude_md():
         claude_md_content = load_claude_md(project_dir)
         if claude_md_content:
-            base_prompt = f"{base_prompt}\n\n# Project Instructions (from CLAUDE.md)\n\n{claude_md_content}"
-            print("   - Project instructions: included from CLAUDE.md")
+            base_prompt = "\n\n# Project Instructions (from CLAUDE.md)\n\n".join(
+                (base_prompt, claude_md_content)
+            )
+            diagnostics.append("   - Project instructions: included from CLAUDE.md")
     
     # Display configuration
-    print(f"AI Provider: GLM ({model})")
-    print(f"Security settings:")
-    print(f"   - Filesystem restricted to: {project_dir.resolve()}")
-    print(f"   - Bash commands restricted to allowlist")
+    diagnostics.append(f"AI Provider: GLM ({model})")
+    diagnostics.append("Security settings:")
+    diagnostics.append(f"   - Filesystem restricted to: {resolved_project_dir}")
+    diagnostics.append("   - Bash commands restricted to allowlist")
     if max_thinking_tokens:
-        print(f"   - Extended thinking: {max_thinking_tokens:,} tokens")
+        diagnostics.append(f"   - Extended thinking: {max_thinking_tokens:,} tokens")
     else:
-        print("   - Extended thinking: disabled")
-    print(f"   - Tools: {len(allowed_tools_list)} allowed")
+        diagnostics.append("   - Extended thinking: disabled")
+    diagnostics.append(f"   - Tools: {len(allowed_tools_list)} allowed")
     
     # Show MCP servers
     if mcp_servers:
-        mcp_list = list(mcp_servers.keys())
-        print(f"   - MCP servers: {', '.join(mcp_list)}")
+        diagnostics.append(f"   - MCP servers: {', '.join(mcp_servers)}")
     else:
-        print("   - MCP servers: none (minimal configuration)")
+        diagnostics.append("   - MCP servers: none (minimal configuration)")
     
     # Show detected project capabilities for QA agents
-    if agent_type in ("qa_reviewer", "qa_fixer") and any(project_capabilities.values()):
+    if agent_type in _QA_AGENT_TYPES:
         caps = [
-            k.replace("is_", "").replace("has_", "")
+            _CAPABILITY_DISPLAY_NAMES.get(k, k)
             for k, v in project_capabilities.items()
             if v
         ]
-        print(f"   - Project capabilities: {', '.join(caps)}")
-    print()
+        if caps:
+            diagnostics.append(f"   - Project capabilities: {', '.join(caps)}")
+    sys.stdout.write("\n".join(diagnostics) + "\n\n")
     
     # Create GLM options
     options = GLMAgentOptions(
@@ -275,7 +357,7 @@ def create_client(
         allowed_tools=allowed_tools_list,
         mcp_servers=mcp_servers,
         max_turns=1000,
-        cwd=str(project_dir.resolve()),
+        cwd=str(resolved_project_dir),
         max_thinking_tokens=max_thinking_tokens,
         output_format=output_format,
     )
@@ -18,31 +18,301 @@ Key features:
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
+import random
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, AsyncIterator
+from types import SimpleNamespace
+from typing import Any, TypeVar
 
+from . import glm_json
 from .glm_converters import (
     AssistantMessage,
+    ParsedToolCall,
+    TextBlock,
+    ToolUseBlock,
     UserMessage,
     convert_glm_to_assistant_message,
     convert_tool_results_to_user_message,
     format_tool_results_for_glm,
+    parse_tool_calls,
 )
 from .glm_options import GLMAgentOptions
+from .glm_tools import (
+    get_tool_definitions,
+    get_tool_executor,
+    shutdown_web_client,
+    tool_cwd,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Core tools without side effects; consecutive calls to these run concurrently
+READ_ONLY_TOOLS = frozenset({"Read", "Glob", "Grep", "WebFetch", "WebSearch"})
+
 # Check if openai is available
 try:
+    import openai
     from openai import AsyncOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("openai package not available - install with: pip install openai")
 
+# Check if the aiohttp transport is available (pip install "openai[aiohttp]")
+try:
+    import aiohttp  # noqa: F401
+    from openai import DefaultAioHttpClient
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Check if the security module is available for bash validation
+try:
+    from security.profile import get_security_profile
+    SECURITY_PROFILE_AVAILABLE = True
+except ImportError:
+    SECURITY_PROFILE_AVAILABLE = False
+
+# Check if HTTP/2 support is available for httpx (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Check if tiktoken is available for counting history tokens
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Connection pool settings for the httpx transport
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_TIMEOUT_SECONDS = 120.0
+
+
+def _create_httpx_client() -> Any:
+    """
+    Create an httpx client for the OpenAI SDK.
+    
+    Enables HTTP/2 when the h2 package is installed so concurrent requests
+    share one connection. ALPN negotiation falls back to HTTP/1.1 if the
+    endpoint does not offer h2.
+    """
+    import httpx
+    try:
+        from openai import DefaultAsyncHttpxClient as client_class
+    except ImportError:
+        # Older openai releases lack the wrapper around httpx.AsyncClient
+        client_class = httpx.AsyncClient
+    
+    return client_class(
+        http2=HTTP2_AVAILABLE,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=HTTP_TIMEOUT_SECONDS,
+    )
+
+
+def _create_openai_client(api_key: str, base_url: str) -> "AsyncOpenAI":
+    """
+    Create the AsyncOpenAI client for the GLM endpoint.
+    
+    Uses httpx with HTTP/2 multiplexing by default. Set GLM_HTTP_BACKEND=aiohttp
+    to use the aiohttp transport instead (requires the openai[aiohttp] extra).
+    
+    The SDK's own retries are disabled, so a timed-out request fails after
+    API_TIMEOUT_SECONDS instead of being retried inside the SDK.
+    """
+    backend = os.environ.get("GLM_HTTP_BACKEND", "httpx").lower()
+    if backend == "aiohttp":
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "GLM_HTTP_BACKEND=aiohttp requires the aiohttp transport - "
+                'install with: pip install "openai[aiohttp]"'
+            )
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=DefaultAioHttpClient(),
+            max_retries=0,
+        )
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=_create_httpx_client(),
+        max_retries=0,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding() -> Any:
+    """Get the tiktoken encoding used to estimate GLM token counts, if available."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, estimating token counts: {e}")
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """
+    Count tokens in text.
+    
+    GLM uses its own tokenizer, so this is an estimate either way: tiktoken's
+    o200k_base encoding when installed, otherwise about four characters per token.
+    """
+    encoding = _get_token_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+# Maximum responses kept per client when options.enable_response_cache is set
+RESPONSE_CACHE_SIZE = 64
+
+# Maximum concurrent GLM API requests per event loop, across all clients
+GLM_MAX_CONCURRENCY = int(os.environ.get("GLM_MAX_CONCURRENCY", "10"))
+
+# Per-request API timeout. Prevents indefinite hanging, which matters most for
+# merge operations where the prompt can be very large.
+API_TIMEOUT_SECONDS = 120.0
+
+# Attempts per API request when rate limited or the connection fails
+API_MAX_ATTEMPTS = 3
+
+_API_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _api_semaphore() -> asyncio.Semaphore:
+    """Get the request concurrency limit for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _API_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _API_SEMAPHORES[loop] = asyncio.Semaphore(GLM_MAX_CONCURRENCY)
+    return semaphore
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter before retry number `attempt` (1-based)."""
+    return (2 ** (attempt - 1)) * random.uniform(0.5, 2.0)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limits and connection failures are retried; timeouts are not."""
+    if isinstance(error, openai.APITimeoutError):
+        return False
+    return isinstance(error, (openai.RateLimitError, openai.APIConnectionError))
+
+# Shared AsyncOpenAI clients, per event loop, keyed by (api_key, base_url).
+# Clients are bound to the loop they were created on, so each loop gets its own.
+_CLIENT_POOL: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+_CLIENT_REFCOUNTS: dict[tuple[int, str, str], int] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _acquire_client(api_key: str, base_url: str) -> tuple[tuple, "AsyncOpenAI"]:
+    """
+    Get the pooled client for the running event loop, creating it on first use.
+    
+    Returns:
+        (pool key, client). Pass the key to _release_client() when done.
+    """
+    loop = asyncio.get_running_loop()
+    with _CLIENT_LOCK:
+        loop_clients = _CLIENT_POOL.setdefault(loop, {})
+        client = loop_clients.get((api_key, base_url))
+        if client is None:
+            client = _create_openai_client(api_key, base_url)
+            loop_clients[(api_key, base_url)] = client
+        key = (id(loop), api_key, base_url)
+        _CLIENT_REFCOUNTS[key] = _CLIENT_REFCOUNTS.get(key, 0) + 1
+    return key, client
+
+
+def _release_client(key: tuple) -> None:
+    """Drop one reference to a pooled client. The client stays open for reuse."""
+    with _CLIENT_LOCK:
+        remaining = _CLIENT_REFCOUNTS.get(key, 0) - 1
+        if remaining > 0:
+            _CLIENT_REFCOUNTS[key] = remaining
+        else:
+            _CLIENT_REFCOUNTS.pop(key, None)
+
+
+async def shutdown_clients() -> None:
+    """
+    Close pooled API clients for the running event loop that are not in use.
+    
+    Call at process teardown (before the event loop closes). Clients still
+    referenced by an active GLMAgentClient are left open.
+    """
+    loop = asyncio.get_running_loop()
+    with _CLIENT_LOCK:
+        loop_clients = _CLIENT_POOL.get(loop, {})
+        idle = [
+            (pool_key, client)
+            for pool_key, client in loop_clients.items()
+            if (id(loop), *pool_key) not in _CLIENT_REFCOUNTS
+        ]
+        for pool_key, _ in idle:
+            del loop_clients[pool_key]
+    
+    for _, client in idle:
+        await client.close()
+
+
+async def shutdown_connections() -> None:
+    """
+    Close the shared connection pools of the running event loop.
+    
+    Covers idle API clients (see shutdown_clients()), the WebFetch client and
+    the MCP HTTP client. Call at the end of an agent run, before its event
+    loop closes.
+    """
+    from .glm_mcp import shutdown_shared_http_client
+    
+    await shutdown_clients()
+    await shutdown_web_client()
+    await shutdown_shared_http_client()
+
+
+async def run_then_shutdown(main: Awaitable[T]) -> T:
+    """
+    Await an agent run, then close its event loop's shared connections.
+    
+    Wrap the coroutine passed to asyncio.run() with this, since pooled
+    connections must be closed before their event loop is.
+    
+    Example:
+        >>> asyncio.run(run_then_shutdown(run_autonomous_agent(...)))
+    """
+    try:
+        return await main
+    finally:
+        await shutdown_connections()
+
 
 class GLMAgentClient:
     """
@@ -52,6 +322,11 @@ class GLMAgentClient:
     Implements agentic loop: query -> tool use -> execute -> repeat.
     Supports both core tools and MCP servers.
     
+    No network resources are opened in __init__. The API client is acquired
+    from the per-event-loop pool in __aenter__ (or on the first request when
+    used without `async with`) and released in __aexit__; pooled clients are
+    closed by shutdown_clients().
+    
     Example:
         >>> options = GLMAgentOptions(
         ...     model="glm-4.7",
@@ -85,11 +360,24 @@ class GLMAgentClient:
         
         self.options = options
         self.messages: list[dict] = []
+        # JSON for each entry in self.messages, serialized once on demand
+        self._message_json: list[str] = []
+        # Token count for each entry in self.messages (options.max_context_tokens)
+        self._message_tokens: list[int] = []
+        # Completed responses keyed by request hash (options.enable_response_cache)
+        self._response_cache: OrderedDict[str, Any] = OrderedDict()
+        # Responses persisted across runs (options.response_cache_dir)
+        self._disk_cache = None
+        if options.response_cache_dir:
+            from .glm_response_cache import DiskResponseCache
+            self._disk_cache = DiskResponseCache(options.response_cache_dir)
         self.current_query: str | None = None
         self.turn_count = 0
         self._mcp_manager = None
+        self._tool_semaphore = asyncio.Semaphore(options.max_tool_concurrency)
         
-        # Initialize OpenAI client with GLM endpoint
+        # Resolve GLM endpoint credentials; the OpenAI client is acquired from
+        # the shared pool in __aenter__ so connections are reused across agents
         api_key = os.environ.get("ZHIPUAI_API_KEY")
         if not api_key:
             raise ValueError(
@@ -97,15 +385,13 @@ class GLMAgentClient:
                 "Get your key from: https://open.bigmodel.cn/"
             )
         
-        base_url = os.environ.get(
+        self._api_key = api_key
+        self._base_url = os.environ.get(
             "GLM_BASE_URL",
             "https://api.z.ai/api/coding/paas/v4"
         )
-        
-        self.client = AsyncOpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        self.client: AsyncOpenAI | None = None
+        self._client_key: tuple | None = None
         
         # Add system message if provided
         if options.system_prompt:
@@ -115,9 +401,11 @@ class GLMAgentClient:
             })
         
         # Build tool definitions from registry (core tools)
-        from .glm_tools import get_tool_definitions
         self.tools = get_tool_definitions(options.allowed_tools)
         
+        # Request arguments that stay the same for every turn
+        self._base_kwargs = self._build_base_kwargs()
+        
         # Initialize MCP manager if servers configured
         if options.mcp_servers:
             from .glm_mcp import create_mcp_manager
@@ -135,7 +423,10 @@ class GLMAgentClient:
         )
     
     async def __aenter__(self):
-        """Async context manager entry - starts MCP servers."""
+        """Async context manager entry - acquires the API client and starts MCP servers."""
+        if self.client is None:
+            self._client_key, self.client = _acquire_client(self._api_key, self._base_url)
+        
         if self._mcp_manager:
             await self._mcp_manager.__aenter__()
             await self._mcp_manager.start_all()
@@ -143,14 +434,21 @@ class GLMAgentClient:
             # Add MCP tools to our tool list
             mcp_tools = self._mcp_manager.get_all_tools()
             self.tools.extend(mcp_tools)
+            self._base_kwargs = self._build_base_kwargs()
             logger.info(f"Added {len(mcp_tools)} MCP tools")
         
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit - stops MCP servers."""
+        """Async context manager exit - stops MCP servers and releases the API client."""
         if self._mcp_manager:
             await self._mcp_manager.__aexit__(exc_type, exc_val, exc_tb)
+        
+        # Pooled clients stay open for the next agent; see shutdown_clients()
+        if self._client_key is not None:
+            _release_client(self._client_key)
+            self._client_key = None
+        self.client = None
     
     async def query(self, message: str) -> None:
         """
@@ -166,6 +464,21 @@ class GLMAgentClient:
         })
         logger.debug(f"Query added: {len(message)} chars")
     
+    def reset_conversation(self) -> None:
+        """
+        Start a new conversation, keeping only the system prompt.
+        
+        The API client, MCP servers and response cache are kept, so one
+        client can serve several independent conversations without
+        reconnecting.
+        """
+        keep = 1 if self.messages and self.messages[0]["role"] == "system" else 0
+        del self.messages[keep:]
+        del self._message_json[keep:]
+        del self._message_tokens[keep:]
+        self.current_query = None
+        self.turn_count = 0
+    
     async def receive_response(self) -> AsyncIterator[AssistantMessage | UserMessage]:
         """
         Receive agent response with agentic loop.
@@ -179,6 +492,10 @@ class GLMAgentClient:
            c. Loop back to step 1
         4. Stop when no more tool calls
         
+        With options.streaming, step 2 yields one text-only AssistantMessage
+        per streamed delta, followed by an AssistantMessage holding just the
+        tool calls (if any).
+        
         Yields:
             AssistantMessage or UserMessage objects
         """
@@ -192,13 +509,31 @@ class GLMAgentClient:
             
             # Call GLM API
             logger.debug(f"Turn {self.turn_count}: Calling GLM API...")
-            response = await self._call_glm_api()
-            
-            # Convert to AssistantMessage format
-            assistant_msg = convert_glm_to_assistant_message(response)
-            
-            # Yield the assistant message
-            yield assistant_msg
+            if self.options.streaming:
+                # Yield text as it streams in, then the tool calls on their own
+                response = None
+                async for item in self._stream_glm_api():
+                    if isinstance(item, str):
+                        yield AssistantMessage(content=[TextBlock(text=item)])
+                    else:
+                        response = item
+                
+                tool_calls = parse_tool_calls(response.choices[0].message)
+                tool_blocks = [
+                    ToolUseBlock(name=tc.name, input=tc.arguments, id=tc.id)
+                    for tc in tool_calls
+                ]
+                if tool_blocks:
+                    yield AssistantMessage(content=tool_blocks)
+            else:
+                response = await self._call_glm_api()
+                tool_calls = parse_tool_calls(response.choices[0].message)
+                
+                # Convert to AssistantMessage format
+                assistant_msg = convert_glm_to_assistant_message(response, tool_calls)
+                
+                # Yield the assistant message
+                yield assistant_msg
             
             # Check finish reason
             finish_reason = response.choices[0].finish_reason
@@ -207,7 +542,7 @@ class GLMAgentClient:
             if finish_reason == "tool_calls":
                 # Execute tools and continue loop
                 logger.debug("Tool calls detected, executing...")
-                tool_results = await self._execute_tools(response)
+                tool_results = await self._execute_tools(response, tool_calls)
                 
                 # Yield tool results as UserMessage
                 user_msg = convert_tool_results_to_user_message(tool_results)
@@ -233,16 +568,118 @@ class GLMAgentClient:
         if self.turn_count >= self.options.max_turns:
             logger.warning(f"Max turns ({self.options.max_turns}) reached")
     
-    async def _call_glm_api(self) -> Any:
+    async def run_many(self, prompts: list[str]) -> list[AssistantMessage]:
         """
-        Call GLM API with current message history.
+        Get independent single-turn completions for several prompts concurrently.
+        
+        Each prompt is sent as a new user message after the current history
+        (system prompt included) without modifying it. Requests run together,
+        bounded by GLM_MAX_CONCURRENCY. Tool calls in the responses are
+        returned as ToolUseBlocks but not executed.
+        
+        Args:
+            prompts: User messages to complete
         
         Returns:
-            API response object
+            One AssistantMessage per prompt, in the same order
+        """
+        base_kwargs = self._build_request_kwargs()
+        history = base_kwargs["messages"]
+        
+        responses = await asyncio.gather(*(
+            self._create_completion({
+                **base_kwargs,
+                "messages": [*history, {"role": "user", "content": prompt}],
+            })
+            for prompt in prompts
+        ))
+        return [convert_glm_to_assistant_message(response) for response in responses]
+    
+    def _serialized_history(self) -> list[str]:
+        """
+        Get the JSON serialization of each message in the history.
+        
+        Messages are append-only, so only entries added since the last call are
+        serialized; earlier entries are reused.
+        
+        Returns:
+            List of JSON strings, parallel to self.messages
+        """
+        cache = self._message_json
+        if len(cache) > len(self.messages):
+            # History was replaced or shortened externally
+            cache.clear()
+        for msg in self.messages[len(cache):]:
+            cache.append(glm_json.dumps(msg))
+        return cache
+    
+    def _history_token_counts(self) -> list[int]:
+        """
+        Get the token count of each message in the history.
+        
+        Counts are computed once per message from its cached serialization.
+        
+        Returns:
+            List of token counts, parallel to self.messages
+        """
+        history = self._serialized_history()
+        counts = self._message_tokens
+        if len(counts) > len(history):
+            counts.clear()
+        for message_json in history[len(counts):]:
+            counts.append(_count_tokens(message_json))
+        return counts
+    
+    def _trim_history(self) -> None:
+        """
+        Drop the oldest turns until the history fits options.max_context_tokens.
+        
+        A leading system message is always kept. Messages are removed in whole
+        turns - a user message, or an assistant message together with the tool
+        results that answer it - so tool calls and results stay paired. The
+        most recent turn is never removed.
+        """
+        budget = self.options.max_context_tokens
+        counts = self._history_token_counts()
+        total = sum(counts)
+        if total <= budget:
+            return
+        
+        messages = self.messages
+        start = 1 if messages and messages[0].get("role") == "system" else 0
+        # Turn boundaries: every message that is not a tool result starts a turn
+        turn_starts = [
+            i for i in range(start, len(messages)) if messages[i].get("role") != "tool"
+        ]
+        
+        end = start
+        for next_start in turn_starts[1:]:
+            if total <= budget:
+                break
+            total -= sum(counts[end:next_start])
+            end = next_start
+        
+        if end > start:
+            del messages[start:end]
+            del self._message_json[start:end]
+            del counts[start:end]
+            logger.info(
+                f"Trimmed {end - start} old messages to fit "
+                f"{budget:,} token context budget (now ~{total:,} tokens)"
+            )
+    
+    def _build_base_kwargs(self) -> dict:
+        """
+        Build the chat completion arguments that do not depend on the history.
+        
+        Called once in __init__ and again when MCP tools are added in
+        __aenter__, rather than on every turn.
+        
+        Returns:
+            Keyword arguments for chat.completions.create(), without messages
         """
         kwargs = {
             "model": self.options.get_glm_model(),
-            "messages": self.messages,
             "temperature": self.options.get_temperature(),
             "top_p": self.options.get_top_p(),
         }
@@ -261,43 +698,181 @@ class GLMAgentClient:
             # GLM supports JSON schema similar to OpenAI
             kwargs["response_format"] = self.options.output_format
         
+        return kwargs
+    
+    def _build_request_kwargs(self) -> dict:
+        """
+        Build chat completion arguments for the current message history.
+        
+        Returns:
+            Keyword arguments for chat.completions.create()
+        """
+        if self.options.max_context_tokens:
+            self._trim_history()
+        
+        kwargs = {**self._base_kwargs, "messages": self.messages}
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            history = self._serialized_history()
+            logger.debug(
+                f"Sending {len(history)} messages "
+                f"({sum(len(m) for m in history):,} chars)"
+            )
+        
+        # Support callers that use the client without `async with`
+        if self.client is None:
+            self._client_key, self.client = _acquire_client(self._api_key, self._base_url)
+        
+        return kwargs
+    
+    async def _create_completion(self, kwargs: dict) -> Any:
+        """
+        Issue the chat completion request with a timeout.
+        
+        At most GLM_MAX_CONCURRENCY requests run at once per event loop.
+        Rate limit and connection errors are retried with jittered exponential
+        backoff, up to API_MAX_ATTEMPTS attempts in total. This is the only
+        retry layer (the SDK client has max_retries=0), and backoff sleeps
+        happen outside the semaphore so waiting calls don't hold a slot.
+        
+        Raises:
+            TimeoutError: If the API does not respond in time
+        """
         try:
-            # Add 2-minute timeout to prevent indefinite hanging
-            # This is especially important for merge operations where the prompt can be very large
-            API_TIMEOUT_SECONDS = 120
-            try:
-                response = await asyncio.wait_for(
-                    self.client.chat.completions.create(**kwargs),
-                    timeout=API_TIMEOUT_SECONDS
-                )
-            except asyncio.TimeoutError:
-                error_msg = f"GLM API call timed out after {API_TIMEOUT_SECONDS} seconds. The prompt may be too large or the server may be overloaded."
-                logger.error(error_msg)
-                print(f"[AI-MERGE] ❌ {error_msg}", flush=True)
-                raise TimeoutError(error_msg)
+            for attempt in range(1, API_MAX_ATTEMPTS + 1):
+                try:
+                    async with _api_semaphore():
+                        # The SDK enforces the timeout on the HTTP request itself,
+                        # so the connection is cleaned up rather than cancelled
+                        return await self.client.chat.completions.create(
+                            **kwargs, timeout=API_TIMEOUT_SECONDS
+                        )
+                except Exception as e:
+                    if attempt == API_MAX_ATTEMPTS or not _is_retryable(e):
+                        raise
+                    delay = _retry_delay(attempt)
+                    logger.warning(
+                        f"GLM API request failed ({type(e).__name__}), "
+                        f"retrying in {delay:.1f}s (attempt {attempt}/{API_MAX_ATTEMPTS})"
+                    )
+                    await asyncio.sleep(delay)
+        except openai.APITimeoutError:
+            error_msg = f"GLM API call timed out after {API_TIMEOUT_SECONDS:.0f} seconds. The prompt may be too large or the server may be overloaded."
+            logger.error(error_msg)
+            print(f"[AI-MERGE] ❌ {error_msg}", flush=True)
+            raise TimeoutError(error_msg)
+    
+    def _record_assistant_message(self, message: Any) -> None:
+        """Add an assistant response (text and tool calls) to the history."""
+        msg_dict = {
+            "role": "assistant",
+            "content": message.content or ""
+        }
+        
+        # Add tool calls to message if present
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            msg_dict["tool_calls"] = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments
+                    }
+                }
+                for tc in tool_calls
+            ]
+        
+        self.messages.append(msg_dict)
+    
+    def _response_cache_key(self, kwargs: dict) -> str:
+        """Hash the parts of a request that determine its response."""
+        payload = json.dumps(
+            {
+                "model": kwargs["model"],
+                "temperature": kwargs["temperature"],
+                "top_p": kwargs["top_p"],
+                "tools": kwargs.get("tools"),
+                "response_format": kwargs.get("response_format"),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(payload.encode("utf-8"))
+        for message_json in self._serialized_history():
+            digest.update(b"\n")
+            digest.update(message_json.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Any:
+        """Look up a response in the memory cache, then the disk cache."""
+        if self.options.enable_response_cache:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                logger.debug("GLM response cache hit")
+                return cached
+        
+        if self._disk_cache is not None:
+            cached = self._disk_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("GLM disk response cache hit")
+                if self.options.enable_response_cache:
+                    self._response_cache[cache_key] = cached
+                return cached
+        
+        return None
+    
+    def _cache_response(self, cache_key: str, response: Any) -> None:
+        """Store a response in the enabled response caches."""
+        if self.options.enable_response_cache:
+            self._response_cache[cache_key] = response
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        
+        if self._disk_cache is not None:
+            self._disk_cache.set(cache_key, response)
+    
+    async def _call_glm_api(self) -> Any:
+        """
+        Call GLM API with current message history.
+        
+        With options.enable_response_cache, an identical earlier request
+        (same model, sampling settings, tools and history) returns the stored
+        response without another round trip. With options.response_cache_dir,
+        the same applies to requests made by earlier runs.
+        
+        Returns:
+            API response object
+        """
+        kwargs = self._build_request_kwargs()
+        
+        cache_key = None
+        if self.options.enable_response_cache or self._disk_cache is not None:
+            cache_key = self._response_cache_key(kwargs)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                self._record_assistant_message(cached.choices[0].message)
+                return cached
+        
+        try:
+            response = await self._create_completion(kwargs)
             
-            # Add assistant response to history
-            choice = response.choices[0]
-            msg_dict = {
-                "role": "assistant",
-                "content": choice.message.content or ""
-            }
+            # Report server-side prompt cache usage when the API provides it
+            usage = getattr(response, "usage", None)
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", None)
+            if cached_tokens is not None:
+                logger.debug(
+                    f"Prompt tokens: {usage.prompt_tokens} ({cached_tokens} cached by server)"
+                )
             
-            # Add tool calls to message if present
-            if hasattr(choice.message, 'tool_calls') and choice.message.tool_calls:
-                msg_dict["tool_calls"] = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments
-                        }
-                    }
-                    for tc in choice.message.tool_calls
-                ]
+            if cache_key is not None:
+                self._cache_response(cache_key, response)
             
-            self.messages.append(msg_dict)
+            # Add assistant response to history
+            self._record_assistant_message(response.choices[0].message)
             
             return response
             
@@ -305,58 +880,196 @@ class GLMAgentClient:
             logger.error(f"GLM API call failed: {e}")
             raise
     
-    async def _execute_tools(self, response: Any) -> list[dict]:
+    async def _stream_glm_api(self) -> AsyncIterator[str | Any]:
+        """
+        Call GLM API with streaming enabled.
+        
+        Yields each text delta (str) as it arrives, then a final response
+        object with the same shape as a non-streamed completion
+        (choices[0].message.content/tool_calls and choices[0].finish_reason).
+        """
+        kwargs = self._build_request_kwargs()
+        kwargs["stream"] = True
+        
+        text_parts: list[str] = []
+        tool_calls: dict[int, SimpleNamespace] = {}
+        finish_reason = None
+        
+        try:
+            stream = await self._create_completion(kwargs)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                delta = choice.delta
+                
+                if delta.content:
+                    text_parts.append(delta.content)
+                    yield delta.content
+                
+                # Tool call ids/names arrive once; arguments arrive in fragments
+                for tc_delta in getattr(delta, "tool_calls", None) or ():
+                    tc = tool_calls.get(tc_delta.index)
+                    if tc is None:
+                        tc = SimpleNamespace(
+                            id=None,
+                            type="function",
+                            function=SimpleNamespace(name="", arguments=""),
+                        )
+                        tool_calls[tc_delta.index] = tc
+                    if tc_delta.id:
+                        tc.id = tc_delta.id
+                    if tc_delta.function:
+                        if tc_delta.function.name:
+                            tc.function.name += tc_delta.function.name
+                        if tc_delta.function.arguments:
+                            tc.function.arguments += tc_delta.function.arguments
+                
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+        except Exception as e:
+            logger.error(f"GLM API call failed: {e}")
+            raise
+        
+        message = SimpleNamespace(
+            content="".join(text_parts) or None,
+            tool_calls=[tool_calls[i] for i in sorted(tool_calls)] or None,
+        )
+        self._record_assistant_message(message)
+        
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason=finish_reason)]
+        )
+    
+    async def _execute_tools(
+        self,
+        response: Any,
+        tool_calls: list[ParsedToolCall] | None = None,
+    ) -> list[dict]:
         """
         Execute tool calls from GLM response.
         
+        Consecutive read-only tool calls run concurrently: core tools bounded
+        by options.max_tool_concurrency, read-only MCP tools as one MCP batch.
+        Any other tool acts as a barrier and runs on its own, so side effects
+        are applied in the order requested.
+        
         Args:
             response: GLM API response with tool_calls
+            tool_calls: parse_tool_calls() result for the response, if already
+                        available
         
         Returns:
-            List of tool results with format:
+            List of tool results, in tool_call order, with format:
             [{"tool_call_id": str, "content": str, "is_error": bool}, ...]
         """
         results = []
         
-        choice = response.choices[0]
-        if not hasattr(choice.message, 'tool_calls'):
+        if tool_calls is None:
+            tool_calls = parse_tool_calls(response.choices[0].message)
+        if not tool_calls:
             return results
         
-        for tool_call in choice.message.tool_calls:
-            tool_name = tool_call.function.name
-            tool_id = tool_call.id
-            
-            try:
-                # Parse arguments
-                args = json.loads(tool_call.function.arguments)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse tool arguments: {e}")
-                results.append({
-                    "tool_call_id": tool_id,
-                    "content": f"Error: Invalid JSON arguments - {e}",
-                    "is_error": True
-                })
+        batch = []
+        batch_kind = None
+        for tool_call in tool_calls:
+            kind = self._batch_kind(tool_call)
+            if kind is not None and kind == batch_kind:
+                batch.append(tool_call)
                 continue
-            
-            # Execute tool
-            logger.debug(f"Executing tool: {tool_name}")
-            try:
-                result = await self._execute_single_tool(tool_name, args)
-                results.append({
-                    "tool_call_id": tool_id,
-                    "content": json.dumps(result) if isinstance(result, dict) else str(result),
-                    "is_error": False
-                })
-            except Exception as e:
-                logger.error(f"Tool execution failed: {tool_name} - {e}")
-                results.append({
-                    "tool_call_id": tool_id,
-                    "content": f"Error: {str(e)}",
-                    "is_error": True
-                })
+            if batch:
+                results.extend(await self._run_batch(batch_kind, batch))
+            if kind is not None:
+                batch, batch_kind = [tool_call], kind
+            else:
+                batch, batch_kind = [], None
+                results.append(await self._run_tool_call(tool_call))
+        if batch:
+            results.extend(await self._run_batch(batch_kind, batch))
         
         return results
     
+    def _batch_kind(self, tool_call: ParsedToolCall) -> str | None:
+        """Return "core" or "mcp" for read-only calls that may share a batch."""
+        if tool_call.name in READ_ONLY_TOOLS:
+            return "core"
+        if (
+            tool_call.error is None
+            and self._mcp_manager
+            and tool_call.name.startswith("mcp__")
+            and self._mcp_manager.is_read_only_tool(tool_call.name)
+        ):
+            return "mcp"
+        return None
+    
+    async def _run_batch(self, kind: str, tool_calls: list[ParsedToolCall]) -> list[dict]:
+        """Run a batch of read-only calls collected by _execute_tools()."""
+        if kind == "mcp" and len(tool_calls) > 1:
+            return await self._run_mcp_batch(tool_calls)
+        return await self._run_tool_batch(tool_calls)
+    
+    async def _run_mcp_batch(self, tool_calls: list[ParsedToolCall]) -> list[dict]:
+        """Run read-only MCP tool calls through MCPManager.execute_tools_batch()."""
+        logger.debug(f"Executing {len(tool_calls)} MCP tools as a batch")
+        results = await self._mcp_manager.execute_tools_batch(
+            [(tc.name, tc.arguments) for tc in tool_calls]
+        )
+        return [
+            {"tool_call_id": tc.id, "content": content, "is_error": is_error}
+            for tc, (content, is_error) in zip(tool_calls, results)
+        ]
+    
+    async def _run_tool_batch(self, tool_calls: list) -> list[dict]:
+        """Run independent tool calls concurrently, preserving their order."""
+        if len(tool_calls) == 1:
+            return [await self._run_tool_call(tool_calls[0])]
+        
+        async def run_bounded(tool_call):
+            async with self._tool_semaphore:
+                return await self._run_tool_call(tool_call)
+        
+        return await asyncio.gather(*(run_bounded(tc) for tc in tool_calls))
+    
+    async def _run_tool_call(self, tool_call: ParsedToolCall) -> dict:
+        """
+        Execute a single parsed tool call.
+        
+        Returns:
+            Tool result dict; failures are reported with is_error=True
+        """
+        tool_name = tool_call.name
+        tool_id = tool_call.id
+        
+        if tool_call.error is not None:
+            logger.error(f"Failed to parse tool arguments: {tool_call.error}")
+            return {
+                "tool_call_id": tool_id,
+                "content": f"Error: Invalid JSON arguments - {tool_call.error}",
+                "is_error": True
+            }
+        
+        # Execute tool
+        logger.debug(f"Executing tool: {tool_name}")
+        try:
+            result = await self._execute_single_tool(tool_name, tool_call.arguments)
+            is_error = False
+            if isinstance(result, str) and tool_name.startswith("mcp__") and self._mcp_manager:
+                # MCP failures come back as {"error": ...} payloads, as in batches
+                from .glm_mcp import _is_error_result
+                is_error = _is_error_result(result)
+            return {
+                "tool_call_id": tool_id,
+                "content": glm_json.dumps(result) if isinstance(result, dict) else str(result),
+                "is_error": is_error
+            }
+        except Exception as e:
+            logger.error(f"Tool execution failed: {tool_name} - {e}")
+            return {
+                "tool_call_id": tool_id,
+                "content": f"Error: {str(e)}",
+                "is_error": True
+            }
+    
     async def _execute_single_tool(self, tool_name: str, args: dict) -> Any:
         """
         Execute a single tool (core tool or MCP tool).
@@ -379,25 +1092,23 @@ class GLMAgentClient:
             return result
         
         # Otherwise, use core tool executor
-        from .glm_tools import get_tool_executor
-        
-        # Get tool executor
         executor = get_tool_executor(tool_name)
         if not executor:
             raise ValueError(f"Unknown tool: {tool_name}")
         
-        # Add context arguments
-        kwargs = {}
-        if self.options.cwd:
-            kwargs["cwd"] = Path(self.options.cwd)
-        
         # For Bash, add security profile
+        kwargs = {}
         if tool_name == "Bash" and self.security_profile:
             kwargs["security_profile"] = self.security_profile
         
-        # Execute tool
+        # Execute tool with the session's working directory as the tool_cwd
+        # context, so helpers called without an explicit cwd resolve against it
         logger.debug(f"Executing {tool_name} with args: {args}")
-        result = await executor(args, **kwargs)
+        token = tool_cwd.set(Path(self.options.cwd) if self.options.cwd else None)
+        try:
+            result = await executor(args, **kwargs)
+        finally:
+            tool_cwd.reset(token)
         logger.debug(f"Tool {tool_name} result: {str(result)[:200]}")
         
         return result
@@ -410,7 +1121,6 @@ class GLMAgentClient:
             List of tool definitions in GLM function calling format
         """
         # Tool definitions now handled by registry
-        from .glm_tools import get_tool_definitions
         return get_tool_definitions(self.options.allowed_tools)
     
     def _load_security_profile(self) -> Any:
@@ -423,14 +1133,14 @@ class GLMAgentClient:
         if not self.options.cwd:
             return None
         
+        if not SECURITY_PROFILE_AVAILABLE:
+            logger.warning("Security module not available")
+            return None
+        
         try:
-            from security.profile import get_security_profile
             profile = get_security_profile(Path(self.options.cwd))
             logger.info("Loaded security profile for bash validation")
             return profile
-        except ImportError:
-            logger.warning("Security module not available")
-            return None
         except Exception as e:
             logger.error(f"Failed to load security profile: {e}")
             return None
@@ -4,13 +4,18 @@ GLM Message Format Converters
 
 Converts between GLM API responses and Claude SDK-compatible message formats.
 This allows existing code to work without changes.
+
+Message and block types are slotted, immutable dataclasses; message content is
+stored as a tuple (lists passed to the constructor are converted).
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+from .glm_json import JSONDecodeError, loads
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TextBlock:
     """Text content block in a message."""
     
@@ -20,7 +25,7 @@ class TextBlock:
         return self.text
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolUseBlock:
     """Tool use block in an assistant message."""
     
@@ -32,7 +37,7 @@ class ToolUseBlock:
         return f"Tool: {self.name}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolResultBlock:
     """Tool result block in a user message."""
     
@@ -44,7 +49,23 @@ class ToolResultBlock:
         return self.content
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class ParsedToolCall:
+    """
+    Tool call from a GLM response with its arguments decoded.
+    
+    Arguments are parsed once per response and shared by the converter and
+    the tool executor.
+    """
+    
+    id: str
+    name: str
+    arguments: dict[str, Any]
+    raw_arguments: str
+    error: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
 class AssistantMessage:
     """
     Assistant message containing text and/or tool use blocks.
@@ -52,25 +73,30 @@ class AssistantMessage:
     Matches the format from claude-agent-sdk for compatibility.
     """
     
-    content: list[TextBlock | ToolUseBlock]
+    content: tuple[TextBlock | ToolUseBlock, ...]
+    # Rendered once in __post_init__; content is immutable
+    _text: str = field(init=False, repr=False, compare=False)
+    _str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        if type(self.content) is not tuple:
+            object.__setattr__(self, "content", tuple(self.content))
+        # Block types are never subclassed, so an exact type check is safe
+        object.__setattr__(self, "_text", "\n".join(
+            block.text for block in self.content if type(block) is TextBlock
+        ))
+        object.__setattr__(self, "_str", "\n".join(str(block) for block in self.content))
     
     @property
     def text(self) -> str:
         """Get combined text from all TextBlock content."""
-        text_parts = []
-        for block in self.content:
-            if isinstance(block, TextBlock):
-                text_parts.append(block.text)
-        return "\n".join(text_parts)
+        return self._text
     
     def __str__(self) -> str:
-        parts = []
-        for block in self.content:
-            parts.append(str(block))
-        return "\n".join(parts)
+        return self._str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserMessage:
     """
     User message containing tool results.
@@ -78,54 +104,88 @@ class UserMessage:
     Matches the format from claude-agent-sdk for compatibility.
     """
     
-    content: list[ToolResultBlock]
+    content: tuple[ToolResultBlock, ...]
+    
+    def __post_init__(self) -> None:
+        if type(self.content) is not tuple:
+            object.__setattr__(self, "content", tuple(self.content))
     
     def __str__(self) -> str:
-        parts = []
-        for block in self.content:
-            parts.append(str(block))
-        return "\n".join(parts)
+        return "\n".join(str(block) for block in self.content)
+
+
+def parse_tool_calls(message: Any) -> list[ParsedToolCall]:
+    """
+    Decode the tool calls of a GLM response message.
+    
+    Args:
+        message: choices[0].message of a GLM API response
+    
+    Returns:
+        ParsedToolCall per tool call, in order. Calls whose arguments are not
+        valid JSON get empty arguments and a description in error.
+    """
+    parsed = []
+    for tool_call in getattr(message, "tool_calls", None) or ():
+        raw_arguments = tool_call.function.arguments
+        error = None
+        # Parse arguments - GLM returns JSON string
+        try:
+            arguments = loads(raw_arguments)
+        except (JSONDecodeError, TypeError) as e:
+            arguments = {}
+            error = str(e)
+        
+        parsed.append(ParsedToolCall(
+            id=tool_call.id,
+            name=tool_call.function.name,
+            arguments=arguments,
+            raw_arguments=raw_arguments,
+            error=error,
+        ))
+    return parsed
 
 
-def convert_glm_to_assistant_message(response: Any) -> AssistantMessage:
+def convert_glm_to_assistant_message(
+    response: Any,
+    tool_calls: list[ParsedToolCall] | None = None,
+) -> AssistantMessage:
     """
     Convert GLM API response to Claude-compatible AssistantMessage.
     
     Args:
         response: GLM API response object (openai.ChatCompletion)
+        tool_calls: Result of parse_tool_calls() for this response, if the
+                    caller already has it; parsed here otherwise
     
     Returns:
         AssistantMessage with TextBlock and/or ToolUseBlock content
     """
-    content = []
-    
     if not response.choices:
-        return AssistantMessage(content=[])
+        return AssistantMessage(content=())
     
     choice = response.choices[0]
     message = choice.message
+    if tool_calls is None:
+        tool_calls = parse_tool_calls(message)
+    
+    # Size the block list up front: optional text block, then one per tool call
+    offset = 1 if message.content else 0
+    content = [None] * (offset + len(tool_calls))
     
     # Add text content if present
-    if message.content:
-        content.append(TextBlock(text=message.content))
+    if offset:
+        content[0] = TextBlock(text=message.content)
     
     # Add tool calls if present
-    if hasattr(message, 'tool_calls') and message.tool_calls:
-        import json
-        for tool_call in message.tool_calls:
-            # Parse arguments - GLM returns JSON string
-            try:
-                arguments = json.loads(tool_call.function.arguments)
-            except (json.JSONDecodeError, AttributeError):
-                arguments = {}
-            
-            content.append(ToolUseBlock(
-                name=tool_call.function.name,
-                input=arguments,
-                id=tool_call.id
-            ))
-    
-    return AssistantMessage(content=content)
+    for i, tool_call in enumerate(tool_calls, offset):
+        content[i] = ToolUseBlock(
+            name=tool_call.name,
+            input=tool_call.arguments,
+            id=tool_call.id
+        )
+    
+    return AssistantMessage(content=tuple(content))
 
 
 def convert_tool_results_to_user_message(results: list[dict]) -> UserMessage:
@@ -141,14 +201,14 @@ def convert_tool_results_to_user_message(results: list[dict]) -> UserMessage:
     Returns:
         UserMessage with ToolResultBlock content
     """
-    content = []
-    
-    for result in results:
-        content.append(ToolResultBlock(
+    content = tuple([
+        ToolResultBlock(
             content=result["content"],
             is_error=result.get("is_error", False),
             tool_use_id=result["tool_call_id"]
-        ))
+        )
+        for result in results
+    ])
     
     return UserMessage(content=content)
 
@@ -163,13 +223,11 @@ def format_tool_results_for_glm(results: list[dict]) -> list[dict]:
     Returns:
         List of messages in GLM tool message format
     """
-    messages = []
-    
-    for result in results:
-        messages.append({
+    return [
+        {
             "role": "tool",
             "content": result["content"],
             "tool_call_id": result["tool_call_id"]
-        })
-    
-    return messages
+        }
+        for result in results
+    ]
@@ -0,0 +1,48 @@
+"""
+JSON helpers for the GLM client
+===============================
+
+Message history, tool arguments, tool results and MCP JSON-RPC messages are
+(de)serialized on every agent turn. orjson is used for these when installed,
+with the standard library json module as a fallback. Both produce equivalent
+data; only whitespace in the encoded output differs.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so this catches both
+JSONDecodeError = json.JSONDecodeError
+
+
+if ORJSON_AVAILABLE:
+
+    def dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def dumpb(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string."""
+        return json.dumps(obj, ensure_ascii=False)
+
+    def dumpb(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    loads = json.loads
@@ -6,6 +6,12 @@ Enables GLM to use MCP (Model Context Protocol) servers for external integration
 like Context7, Linear, Electron, and Graphiti.
 
 MCP servers are spawned as subprocesses and communicate via stdio or HTTP.
+Stdio servers run as asyncio subprocesses; a reader task per server routes
+JSON-RPC responses back to the awaiting request by id, so MCP I/O never blocks
+the event loop and concurrent tool calls to one server are pipelined. Stdio
+servers with identical launch configurations are shared between managers
+(see glm_mcp_pool).
+
 This module handles:
 - Spawning MCP server processes
 - Discovering available tools from servers
@@ -17,17 +23,123 @@ import asyncio
 import json
 import logging
 import os
-import subprocess
+import shutil
+import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+from . import glm_json
+from .glm_mcp_pool import config_hash, process_pool
+
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a JSON-RPC response from a stdio MCP server
+MCP_REQUEST_TIMEOUT_SECONDS = 60.0
+
+# MCP protocol version sent in the initialize handshake
+MCP_PROTOCOL_VERSION = "2024-11-05"
+
+# Seconds to wait for a stdio server to answer initialize before carrying on
+MCP_INIT_TIMEOUT_SECONDS = 5.0
+
+# Maximum size of one JSON-RPC message line read from a stdio server
+# (asyncio's default 64 KiB is too small for large tool results such as docs)
+MCP_STDIO_LINE_LIMIT = 16 * 1024 * 1024
+
+# Check if HTTP/2 support is available for httpx (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool settings for the shared HTTP MCP client
+MCP_HTTP_MAX_CONNECTIONS = 64
+MCP_HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Read-only MCP tools: results may be reused for identical arguments, and
+# consecutive calls may run concurrently
+CACHEABLE_MCP_TOOLS = frozenset({
+    "resolve-library-id",
+    "get-library-docs",
+    "query-docs",
+})
+
+# Result cache bounds for CACHEABLE_MCP_TOOLS
+MCP_RESULT_CACHE_SIZE = 512
+MCP_RESULT_CACHE_TTL_SECONDS = 300.0
+
+# Seconds to wait for a stopped server process to exit before killing it
+MCP_STOP_TIMEOUT_SECONDS = 5.0
+
+
+# HTTP client shared by all managers, one per event loop
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for the running event loop, creating it on first use.
+    
+    Keep-alive connections (multiplexed over HTTP/2 when h2 is installed) are
+    reused across tool calls and MCPManager instances.
+    """
+    loop = asyncio.get_running_loop()
+    client = _HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=MCP_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=MCP_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+        _HTTP_CLIENTS[loop] = client
+    return client
+
+
+async def shutdown_shared_http_client() -> None:
+    """
+    Close the shared HTTP client for the running event loop.
+    
+    Call at process teardown (before the event loop closes).
+    """
+    client = _HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _is_error_result(result: str) -> bool:
+    """Whether a tool result is one of the {"error": ...} payloads built here."""
+    return result.startswith('{"error"')
+
+
+@dataclass(slots=True)
+class StdioConnection:
+    """A running stdio MCP server process and its JSON-RPC state."""
+    name: str
+    process: asyncio.subprocess.Process
+    reader_task: asyncio.Task | None = None
+    stderr_task: asyncio.Task | None = None
+    # Last request id and in-flight requests by id
+    next_id: int = 0
+    pending: dict[int, asyncio.Future] = field(default_factory=dict)
+    # Tools reported by the server, shared by every subscriber
+    tools: list[dict] = field(default_factory=list)
+    
+    def is_alive(self) -> bool:
+        return self.process.returncode is None
 
-@dataclass
+
+@dataclass(slots=True)
 class MCPServer:
     """Configuration for an MCP server."""
     name: str
@@ -37,10 +149,20 @@ class MCPServer:
     url: str | None = None
     headers: dict[str, str] = field(default_factory=dict)
     env: dict[str, str] = field(default_factory=dict)
+    no_share: bool = False  # Run a private process instead of the shared one
+    disabled: bool = False  # Skipped by start_all (e.g. command not found)
     
     # Runtime state
-    process: subprocess.Popen | None = None
     tools: list[dict] = field(default_factory=list)
+    connection: StdioConnection | None = None
+    pool_key: str | None = None
+    # Last JSON-RPC request id (HTTP servers)
+    next_id: int = 0
+    
+    @property
+    def process(self) -> asyncio.subprocess.Process | None:
+        """The stdio server process, if running."""
+        return self.connection.process if self.connection else None
 
 
 class MCPManager:
@@ -61,16 +183,20 @@ class MCPManager:
     
     def __init__(self):
         self.servers: dict[str, MCPServer] = {}
-        self._http_client: httpx.AsyncClient | None = None
+        # GLM tool definitions and names, built on first use after servers change
+        self._tools_cache: list[dict] | None = None
+        self._names_cache: list[str] | None = None
+        # GLM tool name -> (server, MCP tool name), built with the tools cache
+        self._tool_index: dict[str, tuple[MCPServer, str]] | None = None
+        # Results of cacheable tool calls: key -> (stored at, result)
+        self._result_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
     
     async def __aenter__(self):
-        self._http_client = httpx.AsyncClient(timeout=30.0)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # The shared HTTP client stays open; see shutdown_shared_http_client()
         await self.stop_all()
-        if self._http_client:
-            await self._http_client.aclose()
     
     def add_server(self, name: str, config: dict) -> None:
         """
@@ -84,6 +210,8 @@ class MCPManager:
                 - args: Command arguments (for stdio)
                 - url: URL for HTTP servers
                 - headers: HTTP headers (for http)
+                - env: Extra environment variables (for stdio)
+                - no_share: Don't share the process with other managers (for stdio)
         """
         server = MCPServer(
             name=name,
@@ -93,152 +221,395 @@ class MCPManager:
             url=config.get("url"),
             headers=config.get("headers", {}),
             env=config.get("env", {}),
+            no_share=config.get("no_share", False),
         )
+        if server.server_type == "stdio" and server.command:
+            # Resolve the executable once, instead of on every spawn
+            resolved = shutil.which(server.command, path=server.env.get("PATH"))
+            if resolved:
+                server.command = resolved
+            else:
+                logger.warning(f"Command not found: {server.command}")
+                logger.warning(f"MCP server {name} will be skipped")
+                server.disabled = True
         self.servers[name] = server
+        self._invalidate_tools()
         logger.info(f"Added MCP server: {name} ({server.server_type})")
     
     async def start_all(self) -> None:
-        """Start all configured MCP servers and discover their tools."""
-        for name, server in self.servers.items():
-            try:
-                if server.server_type == "stdio":
-                    await self._start_stdio_server(server)
-                elif server.server_type == "http":
-                    await self._discover_http_tools(server)
-                logger.info(f"Started MCP server: {name} with {len(server.tools)} tools")
-            except Exception as e:
-                logger.error(f"Failed to start MCP server {name}: {e}")
+        """
+        Start all configured MCP servers and discover their tools.
+        
+        Servers start concurrently, so startup takes as long as the slowest
+        server rather than the sum of all of them. A failing server is logged
+        and skipped without affecting the others; disabled servers are not
+        started at all.
+        """
+        started_at = time.monotonic()
+        await asyncio.gather(
+            *(
+                self._start_server(name, server)
+                for name, server in self.servers.items()
+                if not server.disabled
+            )
+        )
+        self._invalidate_tools()
+        logger.debug(
+            f"Started {len(self.servers)} MCP servers in {time.monotonic() - started_at:.2f}s"
+        )
+    
+    async def _start_server(self, name: str, server: MCPServer) -> None:
+        """Start a single MCP server, logging instead of raising on failure."""
+        started_at = time.monotonic()
+        try:
+            if server.server_type == "stdio":
+                await self._start_stdio_server(server)
+            elif server.server_type == "http":
+                await self._discover_http_tools(server)
+            logger.info(
+                f"Started MCP server: {name} with {len(server.tools)} tools "
+                f"in {time.monotonic() - started_at:.2f}s"
+            )
+        except Exception as e:
+            logger.error(f"Failed to start MCP server {name}: {e}")
     
     async def stop_all(self) -> None:
-        """Stop all running MCP server processes."""
+        """Stop all running MCP server processes (or release shared ones)."""
         for name, server in self.servers.items():
-            if server.process:
+            if server.connection:
                 try:
-                    server.process.terminate()
-                    server.process.wait(timeout=5)
+                    if server.pool_key:
+                        await process_pool.release(
+                            server.pool_key, id(server), self._stop_connection
+                        )
+                    else:
+                        await self._stop_connection(server.connection)
                 except Exception as e:
                     logger.warning(f"Error stopping server {name}: {e}")
                 finally:
-                    server.process = None
+                    server.connection = None
+                    server.pool_key = None
+        self._invalidate_tools()
+    
+    @classmethod
+    async def _stop_connection(cls, connection: StdioConnection) -> None:
+        """Terminate a stdio server process and fail its in-flight requests."""
+        process = connection.process
+        if process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=MCP_STOP_TIMEOUT_SECONDS)
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+        
+        for task in (connection.reader_task, connection.stderr_task):
+            if task:
+                task.cancel()
+        connection.reader_task = None
+        connection.stderr_task = None
+        cls._fail_pending(connection, ConnectionError(f"Server {connection.name} stopped"))
     
     async def _start_stdio_server(self, server: MCPServer) -> None:
-        """Start a stdio-based MCP server."""
+        """Start a stdio-based MCP server, or join a running shared one."""
         if not server.command:
             raise ValueError(f"No command specified for server {server.name}")
         
-        # Build environment
-        env = os.environ.copy()
-        env.update(server.env)
-        
-        # Start process
         try:
-            server.process = subprocess.Popen(
-                [server.command] + server.args,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=env,
-                text=True,
-            )
+            if server.no_share:
+                server.connection = await self._spawn_stdio_server(server)
+            else:
+                pool_key = config_hash(server.command, server.args, server.env)
+                server.connection = await process_pool.acquire(
+                    pool_key,
+                    id(server),
+                    lambda: self._spawn_stdio_server(server),
+                    is_alive=StdioConnection.is_alive,
+                )
+                server.pool_key = pool_key
+            server.tools = list(server.connection.tools)
             
-            # Give server time to initialize
-            await asyncio.sleep(1.0)
-            
-            # Request tool list via JSON-RPC
-            await self._discover_stdio_tools(server)
-            
-        except FileNotFoundError:
-            logger.error(f"Command not found: {server.command}")
-            logger.warning(f"MCP server {server.name} will be skipped")
-            # Don't raise - make MCP servers optional
         except Exception as e:
             logger.error(f"Failed to start MCP server {server.name}: {e}")
             logger.warning(f"MCP server {server.name} will be skipped")
             # Don't raise - make MCP servers optional
     
-    async def _discover_stdio_tools(self, server: MCPServer) -> None:
-        """Discover tools from a stdio MCP server."""
-        if not server.process or not server.process.stdin or not server.process.stdout:
-            return
+    async def _spawn_stdio_server(self, server: MCPServer) -> StdioConnection:
+        """Launch a stdio server process and discover its tools."""
+        # Build environment; without overrides the child simply inherits ours
+        env = {**os.environ, **server.env} if server.env else None
+        
+        # Start process
+        process = await asyncio.create_subprocess_exec(
+            server.command,
+            *server.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            limit=MCP_STDIO_LINE_LIMIT,
+        )
+        connection = StdioConnection(name=server.name, process=process)
+        connection.reader_task = asyncio.create_task(self._read_loop(connection))
+        connection.stderr_task = asyncio.create_task(self._drain_stderr(connection))
         
-        # Send tools/list request
-        request = {
+        try:
+            # Wait until the server is ready instead of sleeping a fixed time
+            await self._initialize(connection)
+            
+            # Request tool list via JSON-RPC
+            await self._discover_stdio_tools(connection)
+        except BaseException:
+            await self._stop_connection(connection)
+            raise
+        return connection
+    
+    @classmethod
+    async def _read_loop(cls, connection: StdioConnection) -> None:
+        """Read JSON-RPC messages from a stdio server and resolve pending requests."""
+        stdout = connection.process.stdout
+        try:
+            while True:
+                line = await stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = glm_json.loads(line)
+                except glm_json.JSONDecodeError:
+                    logger.debug(f"Ignoring non-JSON output from {connection.name}: {line[:200]!r}")
+                    continue
+                
+                if not isinstance(message, dict):
+                    logger.debug(f"Ignoring non-object message from {connection.name}")
+                    continue
+                
+                future = connection.pending.pop(message.get("id"), None)
+                if future is not None:
+                    if not future.done():
+                        future.set_result(message)
+                elif "id" not in message and "method" in message:
+                    # Notification (progress, logging, list changes)
+                    logger.debug(f"MCP {connection.name} notification: {message['method']}")
+                else:
+                    # Requests from the server, or responses that arrived too late
+                    logger.warning(
+                        f"Unexpected message from MCP server {connection.name}: "
+                        f"{str(message)[:200]}"
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Reader for MCP server {connection.name} failed: {e}")
+        
+        cls._fail_pending(connection, ConnectionError(f"Server {connection.name} closed its output"))
+    
+    @staticmethod
+    async def _drain_stderr(connection: StdioConnection) -> None:
+        """
+        Log a stdio server's stderr line by line.
+        
+        Unread stderr piles up in the stream buffer, and once that fills the
+        server blocks writing to it and stops answering requests.
+        """
+        stderr = connection.process.stderr
+        try:
+            while True:
+                line = await stderr.readline()
+                if not line:
+                    break
+                logger.debug(f"MCP {connection.name} stderr: {line.decode('utf-8', 'replace').rstrip()}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Lines over the stream limit end up here; nothing else to drain
+            logger.debug(f"Stopped reading stderr of MCP server {connection.name}: {e}")
+    
+    @staticmethod
+    def _fail_pending(connection: StdioConnection, error: Exception) -> None:
+        """Fail all in-flight requests to a server."""
+        pending, connection.pending = connection.pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+    
+    @staticmethod
+    def _make_request(state: MCPServer | StdioConnection, method: str, params: dict) -> dict:
+        """Build a JSON-RPC request with the next request id of a server or connection."""
+        state.next_id += 1
+        return {
             "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/list",
-            "params": {}
+            "id": state.next_id,
+            "method": method,
+            "params": params,
         }
+    
+    async def _initialize(self, connection: StdioConnection) -> None:
+        """
+        Perform the MCP initialize handshake with a stdio server.
         
+        Returns as soon as the server has answered, so startup costs one round
+        trip. Servers that reject or ignore initialize get a short grace period
+        before discovery instead.
+        """
         try:
-            server.process.stdin.write(json.dumps(request) + "\n")
-            server.process.stdin.flush()
-            
-            # Read response (with timeout)
-            response_line = server.process.stdout.readline()
-            if response_line:
-                response = json.loads(response_line)
-                if "result" in response and "tools" in response["result"]:
-                    server.tools = response["result"]["tools"]
+            response = await self._rpc(
+                connection,
+                "initialize",
+                {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "auto-claude", "version": "1.0"},
+                },
+                timeout=MCP_INIT_TIMEOUT_SECONDS,
+            )
+        except TimeoutError:
+            logger.warning(
+                f"MCP server {connection.name} did not answer initialize "
+                f"within {MCP_INIT_TIMEOUT_SECONDS:.0f}s"
+            )
+            response = {}
+        
+        if "result" in response:
+            await self._notify(connection, "notifications/initialized")
+        else:
+            logger.debug(f"MCP server {connection.name} does not support initialize")
+            await asyncio.sleep(0.1)
+    
+    @staticmethod
+    async def _notify(connection: StdioConnection, method: str, params: dict | None = None) -> None:
+        """Send a JSON-RPC notification (no id, no response) to a stdio server."""
+        message: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        connection.process.stdin.write(glm_json.dumpb(message) + b"\n")
+        await connection.process.stdin.drain()
+    
+    async def _rpc(
+        self,
+        connection: StdioConnection,
+        method: str,
+        params: dict,
+        timeout: float | None = None,
+    ) -> dict:
+        """
+        Send a JSON-RPC request to a stdio server and wait for its response.
+        
+        Each request gets a unique id, so any number of requests can be in
+        flight on one server; the reader task matches responses by id.
+        
+        Args:
+            connection: Running stdio server connection
+            method: JSON-RPC method name
+            params: Method parameters
+            timeout: Seconds to wait (default: MCP_REQUEST_TIMEOUT_SECONDS)
+        
+        Returns:
+            The JSON-RPC response message
+        
+        Raises:
+            asyncio.TimeoutError: If no response arrives in time
+            ConnectionError: If the server exits before responding
+        """
+        request = self._make_request(connection, method, params)
+        future = asyncio.get_running_loop().create_future()
+        connection.pending[request["id"]] = future
+        try:
+            connection.process.stdin.write(glm_json.dumpb(request) + b"\n")
+            await connection.process.stdin.drain()
+            return await asyncio.wait_for(
+                future, timeout=MCP_REQUEST_TIMEOUT_SECONDS if timeout is None else timeout
+            )
+        finally:
+            connection.pending.pop(request["id"], None)
+    
+    async def _discover_stdio_tools(self, connection: StdioConnection) -> None:
+        """Discover tools from a stdio MCP server."""
+        try:
+            response = await self._rpc(connection, "tools/list", {})
+            if "result" in response and "tools" in response["result"]:
+                connection.tools = response["result"]["tools"]
         except Exception as e:
-            logger.warning(f"Could not discover tools for {server.name}: {e}")
+            logger.warning(f"Could not discover tools for {connection.name}: {e}")
             # Use empty tools list - server may not support discovery
-            server.tools = []
+            connection.tools = []
+    
+    @staticmethod
+    async def _post_rpc(server: MCPServer, request: dict) -> httpx.Response:
+        """POST a JSON-RPC request to an HTTP MCP server."""
+        return await _get_http_client().post(
+            server.url,
+            content=glm_json.dumpb(request),
+            headers={"Content-Type": "application/json", **server.headers},
+        )
     
     async def _discover_http_tools(self, server: MCPServer) -> None:
         """Discover tools from an HTTP MCP server."""
-        if not server.url or not self._http_client:
+        if not server.url:
             return
         
         try:
-            response = await self._http_client.post(
-                server.url,
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "tools/list",
-                    "params": {}
-                },
-                headers=server.headers,
+            response = await self._post_rpc(
+                server, self._make_request(server, "tools/list", {})
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = glm_json.loads(response.content)
                 if "result" in data and "tools" in data["result"]:
                     server.tools = data["result"]["tools"]
         except Exception as e:
             logger.warning(f"Could not discover tools for {server.name}: {e}")
             server.tools = []
     
-    def get_all_tools(self) -> list[dict]:
-        """
-        Get all tools from all servers in GLM function format.
-        
-        Returns:
-            List of tool definitions for GLM function calling
-        """
+    def _invalidate_tools(self) -> None:
+        """Drop cached tool definitions after servers or their tools change."""
+        self._tools_cache = None
+        self._names_cache = None
+        self._tool_index = None
+    
+    def _build_tools(self) -> None:
+        """Convert every server's MCP tools to GLM function definitions."""
         tools = []
+        names = []
+        index = {}
         for server_name, server in self.servers.items():
+            prefix = f"mcp__{server_name}__"
             for tool in server.tools:
                 # Convert MCP tool to GLM function format
-                tool_name = f"mcp__{server_name}__{tool.get('name', 'unknown')}"
-                glm_tool = {
+                actual_tool_name = tool.get("name", "unknown")
+                tool_name = prefix + actual_tool_name
+                tools.append({
                     "type": "function",
                     "function": {
                         "name": tool_name,
                         "description": tool.get("description", ""),
                         "parameters": tool.get("inputSchema", {"type": "object", "properties": {}})
                     }
-                }
-                tools.append(glm_tool)
-        return tools
+                })
+                names.append(tool_name)
+                index[tool_name] = (server, actual_tool_name)
+        self._tools_cache = tools
+        self._names_cache = names
+        self._tool_index = index
+    
+    def get_all_tools(self) -> list[dict]:
+        """
+        Get all tools from all servers in GLM function format.
+        
+        Definitions are built once and reused until servers are added,
+        started or stopped.
+        
+        Returns:
+            List of tool definitions for GLM function calling
+        """
+        if self._tools_cache is None:
+            self._build_tools()
+        return list(self._tools_cache)
     
     def get_tool_names(self) -> list[str]:
         """Get list of all available MCP tool names."""
-        names = []
-        for server_name, server in self.servers.items():
-            for tool in server.tools:
-                names.append(f"mcp__{server_name}__{tool.get('name', 'unknown')}")
-        return names
+        if self._names_cache is None:
+            self._build_tools()
+        return list(self._names_cache)
     
     async def execute_tool(self, tool_name: str, arguments: dict) -> str:
         """
@@ -251,7 +622,86 @@ class MCPManager:
         Returns:
             Tool execution result as string
         """
-        # Parse tool name to find server
+        if self._tool_index is None:
+            self._build_tools()
+        entry = self._tool_index.get(tool_name)
+        if entry is not None:
+            server, actual_tool_name = entry
+        else:
+            server, actual_tool_name = self._resolve_tool_name(tool_name)
+        
+        # Reuse recent results of read-only tools called with the same arguments
+        cache_key = None
+        if actual_tool_name in CACHEABLE_MCP_TOOLS:
+            cache_key = tool_name + "|" + json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                stored_at, result = cached
+                if time.monotonic() - stored_at < MCP_RESULT_CACHE_TTL_SECONDS:
+                    self._result_cache.move_to_end(cache_key)
+                    logger.debug(f"MCP result cache hit: {tool_name}")
+                    return result
+                del self._result_cache[cache_key]
+        
+        if server.server_type == "stdio":
+            result = await self._execute_stdio_tool(server, actual_tool_name, arguments)
+        elif server.server_type == "http":
+            result = await self._execute_http_tool(server, actual_tool_name, arguments)
+        else:
+            raise ValueError(f"Unknown server type: {server.server_type}")
+        
+        if cache_key is not None and not _is_error_result(result):
+            self._result_cache[cache_key] = (time.monotonic(), result)
+            if len(self._result_cache) > MCP_RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return result
+    
+    def is_read_only_tool(self, tool_name: str) -> bool:
+        """Whether a discovered MCP tool is known to have no side effects."""
+        if self._tool_index is None:
+            self._build_tools()
+        entry = self._tool_index.get(tool_name)
+        return entry is not None and entry[1] in CACHEABLE_MCP_TOOLS
+    
+    async def execute_tools_batch(self, calls: list[tuple[str, dict]]) -> list[tuple[str, bool]]:
+        """
+        Execute several MCP tools concurrently.
+        
+        All calls are issued at once and collected as they complete. Stdio
+        servers pipeline them over one connection; HTTP calls share the pooled
+        client, multiplexed over one connection when HTTP/2 is available. A failing call yields an
+        error result without affecting the others.
+        
+        Args:
+            calls: (full tool name, arguments) pairs
+        
+        Returns:
+            (result string, is_error) pairs in the order of calls; is_error is
+            set when the call raised or returned an error payload
+        """
+        tasks = {
+            asyncio.ensure_future(self.execute_tool(tool_name, arguments)): i
+            for i, (tool_name, arguments) in enumerate(calls)
+        }
+        results: list[tuple[str, bool]] = [("", False)] * len(calls)
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error:
+                        results[tasks[task]] = (glm_json.dumps({"error": str(error)}), True)
+                    else:
+                        result = task.result()
+                        results[tasks[task]] = (result, _is_error_result(result))
+        finally:
+            for task in pending:
+                task.cancel()
+        return results
+    
+    def _resolve_tool_name(self, tool_name: str) -> tuple[MCPServer, str]:
+        """Parse a tool name that is not in the tool index (e.g. undiscovered)."""
         parts = tool_name.split("__")
         if len(parts) < 3 or parts[0] != "mcp":
             raise ValueError(f"Invalid MCP tool name: {tool_name}")
@@ -262,79 +712,55 @@ class MCPManager:
         server = self.servers.get(server_name)
         if not server:
             raise ValueError(f"MCP server not found: {server_name}")
-        
-        if server.server_type == "stdio":
-            return await self._execute_stdio_tool(server, actual_tool_name, arguments)
-        elif server.server_type == "http":
-            return await self._execute_http_tool(server, actual_tool_name, arguments)
-        else:
-            raise ValueError(f"Unknown server type: {server.server_type}")
+        return server, actual_tool_name
     
     async def _execute_stdio_tool(self, server: MCPServer, tool_name: str, arguments: dict) -> str:
         """Execute a tool on a stdio MCP server."""
-        if not server.process or not server.process.stdin or not server.process.stdout:
-            return json.dumps({"error": f"Server {server.name} not running"})
-        
-        request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
+        if not server.connection or not server.connection.is_alive():
+            return glm_json.dumps({"error": f"Server {server.name} not running"})
         
         try:
-            server.process.stdin.write(json.dumps(request) + "\n")
-            server.process.stdin.flush()
-            
-            response_line = server.process.stdout.readline()
-            if response_line:
-                response = json.loads(response_line)
-                if "result" in response:
-                    content = response["result"].get("content", [])
-                    if content and isinstance(content, list):
-                        return content[0].get("text", json.dumps(content))
-                    return json.dumps(response["result"])
-                elif "error" in response:
-                    return json.dumps({"error": response["error"]})
-            return json.dumps({"error": "No response from server"})
+            response = await self._rpc(
+                server.connection, "tools/call", {"name": tool_name, "arguments": arguments}
+            )
+            if "result" in response:
+                content = response["result"].get("content", [])
+                if content and isinstance(content, list):
+                    return content[0].get("text", glm_json.dumps(content))
+                return glm_json.dumps(response["result"])
+            elif "error" in response:
+                return glm_json.dumps({"error": response["error"]})
+            return glm_json.dumps({"error": "No response from server"})
+        except TimeoutError:
+            return glm_json.dumps({"error": f"No response from server within {MCP_REQUEST_TIMEOUT_SECONDS:.0f}s"})
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return glm_json.dumps({"error": str(e)})
     
     async def _execute_http_tool(self, server: MCPServer, tool_name: str, arguments: dict) -> str:
         """Execute a tool on an HTTP MCP server."""
-        if not server.url or not self._http_client:
-            return json.dumps({"error": f"Server {server.name} not configured"})
+        if not server.url:
+            return glm_json.dumps({"error": f"Server {server.name} not configured"})
         
         try:
-            response = await self._http_client.post(
-                server.url,
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/call",
-                    "params": {
-                        "name": tool_name,
-                        "arguments": arguments
-                    }
-                },
-                headers=server.headers,
+            response = await self._post_rpc(
+                server,
+                self._make_request(
+                    server, "tools/call", {"name": tool_name, "arguments": arguments}
+                ),
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = glm_json.loads(response.content)
                 if "result" in data:
                     content = data["result"].get("content", [])
                     if content and isinstance(content, list):
-                        return content[0].get("text", json.dumps(content))
-                    return json.dumps(data["result"])
+                        return content[0].get("text", glm_json.dumps(content))
+                    return glm_json.dumps(data["result"])
                 elif "error" in data:
-                    return json.dumps({"error": data["error"]})
-            return json.dumps({"error": f"HTTP {response.status_code}"})
+                    return glm_json.dumps({"error": data["error"]})
+            return glm_json.dumps({"error": f"HTTP {response.status_code}"})
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return glm_json.dumps({"error": str(e)})
 
 
 def create_mcp_manager(mcp_servers: dict) -> MCPManager:
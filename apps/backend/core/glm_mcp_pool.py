@@ -0,0 +1,191 @@
+"""
+Shared MCP Server Processes
+===========================
+
+Lets MCPManager instances share stdio MCP server processes. Servers launched
+with the same command, arguments and environment map to one pooled entry; the
+process is started by the first subscriber and stopped when the last one
+releases it.
+
+Entries are kept per event loop, since asyncio subprocesses are bound to the
+loop that created them.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def config_hash(command: str, args: list[str], env: dict[str, str]) -> str:
+    """
+    Hash an MCP server launch configuration.
+
+    Argument order is significant; environment order is not.
+
+    Args:
+        command: Executable to run
+        args: Command arguments
+        env: Extra environment variables
+
+    Returns:
+        Hex digest identifying the configuration
+    """
+    canonical = json.dumps(
+        {"command": command, "args": list(args), "env": sorted(env.items())},
+        separators=(",", ":"),
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class _PoolEntry:
+    """A pooled value (created by a task) and the subscribers using it."""
+    task: asyncio.Future
+    subscribers: set[int] = field(default_factory=set)
+
+
+class MCPProcessPool:
+    """
+    Reference-counted pool of shared MCP server connections.
+
+    Example:
+        >>> conn = await pool.acquire(key, id(server), spawn)
+        >>> ...
+        >>> await pool.release(key, id(server), stop)
+    """
+
+    def __init__(self):
+        self._entries: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, _PoolEntry]
+        ] = weakref.WeakKeyDictionary()
+        # Entries replaced after their value died, kept until their remaining
+        # subscribers release them so the dead value still gets closed
+        self._retired: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, list[_PoolEntry]]
+        ] = weakref.WeakKeyDictionary()
+
+    def _loop_entries(self) -> dict[str, _PoolEntry]:
+        return self._entries.setdefault(asyncio.get_running_loop(), {})
+
+    def _loop_retired(self) -> dict[str, list[_PoolEntry]]:
+        return self._retired.setdefault(asyncio.get_running_loop(), {})
+
+    async def acquire(
+        self,
+        key: str,
+        subscriber: int,
+        factory: Callable[[], Awaitable[Any]],
+        is_alive: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """
+        Get the shared value for key, creating it with factory if needed.
+
+        Concurrent acquirers of a key that is still being created wait for the
+        same creation instead of starting their own.
+
+        Args:
+            key: Configuration hash (see config_hash())
+            subscriber: Identifier of the acquirer, passed again to release()
+            factory: Coroutine function creating the value
+            is_alive: Optional check; a dead pooled value is replaced
+
+        Returns:
+            The shared value
+
+        Raises:
+            Exception: Whatever factory raised; failed entries are not kept
+        """
+        entries = self._loop_entries()
+        entry = entries.get(key)
+        if (
+            entry is not None
+            and is_alive is not None
+            and entry.task.done()
+            and not entry.task.cancelled()
+            and entry.task.exception() is None
+            and not is_alive(entry.task.result())
+        ):
+            # Existing subscribers keep their reference; new ones get a fresh
+            # value. The last existing subscriber to release closes the old one.
+            logger.info(f"Pooled MCP server {key[:8]} is no longer running, restarting")
+            self._loop_retired().setdefault(key, []).append(entry)
+            entry = None
+
+        if entry is None:
+            entry = _PoolEntry(task=asyncio.ensure_future(factory()))
+            entries[key] = entry
+        entry.subscribers.add(subscriber)
+
+        try:
+            return await asyncio.shield(entry.task)
+        except BaseException:
+            entry.subscribers.discard(subscriber)
+            if entries.get(key) is entry and entry.task.done():
+                del entries[key]
+            raise
+
+    async def release(
+        self,
+        key: str,
+        subscriber: int,
+        closer: Callable[[Any], Awaitable[None]],
+    ) -> None:
+        """
+        Drop a subscriber; close the value when no subscribers remain.
+
+        Args:
+            key: Key passed to acquire()
+            subscriber: Identifier passed to acquire()
+            closer: Coroutine function that shuts the value down
+        """
+        entries = self._loop_entries()
+        entry = entries.get(key)
+        if entry is None or subscriber not in entry.subscribers:
+            entry = self._release_retired(key, subscriber)
+            if entry is None:
+                return
+        else:
+            entry.subscribers.discard(subscriber)
+            if entry.subscribers:
+                return
+            del entries[key]
+
+        if not entry.task.done():
+            entry.task.cancel()
+        elif not entry.task.cancelled() and entry.task.exception() is None:
+            await closer(entry.task.result())
+
+    def _release_retired(self, key: str, subscriber: int) -> _PoolEntry | None:
+        """
+        Drop a subscriber from a replaced entry.
+
+        Returns:
+            The entry if this was its last subscriber, otherwise None
+        """
+        retired = self._loop_retired()
+        for entry in retired.get(key, ()):
+            if subscriber in entry.subscribers:
+                entry.subscribers.discard(subscriber)
+                if entry.subscribers:
+                    return None
+                retired[key].remove(entry)
+                if not retired[key]:
+                    del retired[key]
+                return entry
+        return None
+
+    def subscriber_count(self, key: str) -> int:
+        """Number of subscribers currently sharing key on the running loop."""
+        entry = self._loop_entries().get(key)
+        return len(entry.subscribers) if entry else 0
+
+
+# Process pool shared by all MCPManager instances
+process_pool = MCPProcessPool()
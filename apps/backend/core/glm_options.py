@@ -9,6 +9,15 @@ import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
+# (minimum max_thinking_tokens, temperature), highest threshold first.
+# More thinking tokens suggests more careful reasoning, so lower temperature.
+_TEMPERATURE_THRESHOLDS = (
+    (10000, 0.3),  # High thinking = more precise
+    (5000, 0.5),  # Medium thinking
+    (0, 0.7),  # Low thinking = more creative
+)
+DEFAULT_TEMPERATURE = 0.7  # Default balanced temperature
+
 
 @dataclass
 class GLMAgentOptions:
@@ -29,6 +38,13 @@ class GLMAgentOptions:
         env: Environment variables to pass to tools
         max_thinking_tokens: Extended thinking budget (mapped to reasoning parameters)
         output_format: Structured output format for JSON responses
+        max_tool_concurrency: Maximum read-only tool calls executed concurrently per turn
+        streaming: Stream responses and yield text as it is generated
+        enable_response_cache: Reuse responses for identical requests (skips sampling)
+        response_cache_dir: Directory persisting responses for identical requests
+                            across runs (see glm_response_cache; None = off)
+        max_context_tokens: Token budget for the message history; the oldest turns
+                            are dropped before a request that would exceed it (None = unlimited)
     """
     
     model: str = os.environ.get("GLM_MODEL", "glm-4.7")
@@ -42,6 +58,11 @@ class GLMAgentOptions:
     env: dict[str, str] = field(default_factory=dict)
     max_thinking_tokens: int | None = None
     output_format: dict | None = None
+    max_tool_concurrency: int = 8
+    streaming: bool = False
+    enable_response_cache: bool = False
+    response_cache_dir: str | None = None
+    max_context_tokens: int | None = None
     
     def get_glm_model(self) -> str:
         """
@@ -58,19 +79,17 @@ class GLMAgentOptions:
         Calculate temperature from max_thinking_tokens.
         
         More thinking tokens suggests more careful reasoning,
-        so we use slightly lower temperature.
+        so we use slightly lower temperature (see _TEMPERATURE_THRESHOLDS).
         
         Returns:
             Temperature value between 0.1 and 0.95
         """
         if self.max_thinking_tokens is None:
-            return 0.7  # Default balanced temperature
-        elif self.max_thinking_tokens >= 10000:
-            return 0.3  # High thinking = more precise
-        elif self.max_thinking_tokens >= 5000:
-            return 0.5  # Medium thinking
-        else:
-            return 0.7  # Low thinking = more creative
+            return DEFAULT_TEMPERATURE
+        for threshold, temperature in _TEMPERATURE_THRESHOLDS:
+            if self.max_thinking_tokens >= threshold:
+                return temperature
+        return DEFAULT_TEMPERATURE
     
     def get_top_p(self) -> float:
         """
@@ -0,0 +1,85 @@
+"""
+On-Disk GLM Response Cache
+==========================
+
+Stores completed (non-streamed) chat completions by request hash, so a run
+that repeats an earlier conversation exactly - same model, sampling settings,
+tools and history - reads the responses from disk instead of calling the API.
+Meant for deterministic prompt sets such as the GLM API test scripts.
+
+Enable with GLMAgentOptions.response_cache_dir; the GLM test scripts set it
+from the GLM_RESPONSE_CACHE_DIR environment variable. Each response is one
+JSON file, written atomically, so several processes can share a directory.
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from openai.types.chat import ChatCompletion
+
+logger = logging.getLogger(__name__)
+
+
+class DiskResponseCache:
+    """
+    Directory of chat completions keyed by request hash.
+
+    Example:
+        >>> cache = DiskResponseCache("/tmp/glm_test_cache")
+        >>> response = cache.get(key) or await create(...)
+        >>> cache.set(key, response)
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> ChatCompletion | None:
+        """
+        Load the response stored for key.
+
+        Returns:
+            The response, or None if missing or unreadable
+        """
+        try:
+            data = self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read cached GLM response {key[:8]}: {e}")
+            return None
+
+        try:
+            return ChatCompletion.model_validate_json(data)
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid cached GLM response {key[:8]}: {e}")
+            return None
+
+    def set(self, key: str, response: Any) -> None:
+        """
+        Store a response for key. Failures are logged, not raised.
+
+        Args:
+            key: Request hash
+            response: ChatCompletion returned by the API
+        """
+        if not isinstance(response, ChatCompletion):
+            return
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(response.model_dump_json())
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not cache GLM response {key[:8]}: {e}")
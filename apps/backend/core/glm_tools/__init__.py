@@ -18,9 +18,16 @@ structured results.
 """
 
 from .bash import execute_bash
-from .filesystem import execute_edit, execute_glob, execute_grep, execute_read, execute_write
+from .filesystem import (
+    execute_edit,
+    execute_glob,
+    execute_grep,
+    execute_read,
+    execute_write,
+    tool_cwd,
+)
 from .registry import get_tool_definitions, get_tool_executor
-from .web import execute_web_fetch, execute_web_search
+from .web import execute_web_fetch, execute_web_search, shutdown_web_client
 
 __all__ = [
     # Filesystem
@@ -29,11 +36,13 @@ __all__ = [
     "execute_edit",
     "execute_glob",
     "execute_grep",
+    "tool_cwd",
     # Bash
     "execute_bash",
     # Web
     "execute_web_fetch",
     "execute_web_search",
+    "shutdown_web_client",
     # Registry
     "get_tool_definitions",
     "get_tool_executor",
@@ -11,11 +11,121 @@ commands against allowlists before execution.
 import asyncio
 import logging
 import os
+import re
+import shlex
+import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from .filesystem import default_cwd
+
 logger = logging.getLogger(__name__)
 
+# Import security validation from the existing system
+try:
+    from security import is_command_allowed
+    from security.parser import extract_commands
+    SECURITY_AVAILABLE = True
+except ImportError:
+    SECURITY_AVAILABLE = False
+
+# Simple translations of common Unix commands to Windows equivalents
+_WINDOWS_TRANSLATIONS = (
+    (re.compile(r'^ls\s+-la\b'), 'dir'),
+    (re.compile(r'^ls\s+-l\b'), 'dir'),
+    (re.compile(r'^ls\b'), 'dir'),
+    (re.compile(r'\bgrep\b'), 'findstr'),
+    (re.compile(r'\bcat\b'), 'type'),
+)
+
+# Characters that need a shell to interpret: pipes, redirects, command lists,
+# substitutions, globs, home expansion, comments, escapes and history
+_SHELL_SYNTAX = re.compile(r'[|&;<>$`(){}\[\]*?~#!\\\n]')
+# Leading VAR=value assignments also need a shell
+_ENV_ASSIGNMENT = re.compile(r'^\s*[A-Za-z_][A-Za-z0-9_]*=')
+# Shell builtins that must run in the shell even if a same-named executable
+# exists on PATH (other builtins are caught by the shutil.which() check)
+_SHELL_BUILTINS = frozenset({
+    ".", ":", "alias", "cd", "command", "eval", "exec", "exit", "export", "hash",
+    "read", "set", "shift", "source", "trap", "type", "ulimit", "umask",
+    "unalias", "unset", "wait",
+})
+
+# Bytes of stdout/stderr kept per command: the start and the end of the output.
+# Anything in between is counted and dropped.
+OUTPUT_HEAD_BYTES = 1024 * 1024
+OUTPUT_TAIL_BYTES = 256 * 1024
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_capped(
+    stream: asyncio.StreamReader,
+    head_limit: int,
+    tail_limit: int,
+) -> tuple[bytearray, bytearray, int]:
+    """
+    Read a stream to EOF, keeping its first and last bytes.
+    
+    Returns:
+        (first head_limit bytes, last tail_limit bytes after those, number of
+        bytes dropped in between)
+    """
+    head = bytearray()
+    tail = bytearray()
+    dropped = 0
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        room = head_limit - len(head)
+        if room > 0:
+            head += chunk[:room]
+            chunk = chunk[room:]
+        if not chunk:
+            continue
+        tail += chunk
+        excess = len(tail) - tail_limit
+        if excess > 0:
+            del tail[:excess]
+            dropped += excess
+    return head, tail, dropped
+
+
+def _split_simple_command(command: str) -> list[str] | None:
+    """
+    Split a command that can run without a shell into argv.
+    
+    Returns:
+        argv for a plain program invocation, or None if the command uses shell
+        syntax, a builtin, or a program not found on PATH and must go through
+        the shell
+    """
+    if os.name == 'nt' or _SHELL_SYNTAX.search(command) or _ENV_ASSIGNMENT.match(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or argv[0] in _SHELL_BUILTINS:
+        return None
+    # Relative paths like ./run.sh resolve against the command's cwd, which
+    # which() can't see; anything else not found may be a builtin only the
+    # shell knows
+    program = argv[0]
+    if os.sep in program and not os.path.isabs(program):
+        return None
+    if shutil.which(program) is None:
+        return None
+    return argv
+
+
+def _decode_output(head: bytearray, tail: bytearray, dropped: int) -> str:
+    """Decode captured output, marking where bytes were dropped."""
+    text = head.decode('utf-8', errors='replace')
+    if dropped:
+        text += f"\n... [output truncated: {dropped} bytes omitted] ...\n"
+    if tail:
+        text += tail.decode('utf-8', errors='replace')
+    return text
+
 
 async def execute_bash(
     args: dict[str, Any],
@@ -46,7 +156,7 @@ async def execute_bash(
             return {"error": "Missing required parameter: command"}
         
         if cwd is None:
-            cwd = Path.cwd()
+            cwd = default_cwd()
         
         # Validate command using security system
         if security_profile:
@@ -66,27 +176,49 @@ async def execute_bash(
         
         # On Windows, translate common Unix commands to Windows equivalents
         if os.name == 'nt':
-            import re
-            # Simple translations for common commands
-            command = re.sub(r'^ls\s+-la\b', 'dir', command)
-            command = re.sub(r'^ls\s+-l\b', 'dir', command)
-            command = re.sub(r'^ls\b', 'dir', command)
-            command = re.sub(r'\bgrep\b', 'findstr', command)
-            command = re.sub(r'\bcat\b', 'type', command)
+            for pattern, replacement in _WINDOWS_TRANSLATIONS:
+                command = pattern.sub(replacement, command)
         
         try:
-            # Run command with timeout
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(cwd.resolve()),
-                env=os.environ.copy()
-            )
+            # Run command with timeout. Plain program invocations are exec'd
+            # directly, skipping the intermediate shell process.
+            argv = _split_simple_command(command)
+            if argv is not None:
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *argv,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        cwd=str(cwd.resolve()),
+                        # No env: the child inherits os.environ without a per-call copy
+                    )
+                except FileNotFoundError:
+                    # The program vanished after the PATH lookup; report it
+                    # the way the shell would
+                    return {
+                        "stdout": "",
+                        "stderr": f"{argv[0]}: command not found",
+                        "exit_code": 127,
+                        "command": command,
+                        "success": False
+                    }
+            else:
+                process = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=str(cwd.resolve()),
+                )
             
+            # Read both streams concurrently with bounded buffers, so large
+            # outputs neither fill the pipes nor grow memory without limit
             try:
-                stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                    process.communicate(),
+                stdout_parts, stderr_parts, _ = await asyncio.wait_for(
+                    asyncio.gather(
+                        _read_capped(process.stdout, OUTPUT_HEAD_BYTES, OUTPUT_TAIL_BYTES),
+                        _read_capped(process.stderr, OUTPUT_HEAD_BYTES, OUTPUT_TAIL_BYTES),
+                        process.wait(),
+                    ),
                     timeout=timeout
                 )
             except asyncio.TimeoutError:
@@ -98,8 +230,9 @@ async def execute_bash(
                     "timeout": True
                 }
             
-            stdout = stdout_bytes.decode('utf-8', errors='replace')
-            stderr = stderr_bytes.decode('utf-8', errors='replace')
+            # Only the kept head and tail are decoded, never the full output
+            stdout = _decode_output(*stdout_parts)
+            stderr = _decode_output(*stderr_parts)
             exit_code = process.returncode
             
             logger.info(f"Command completed with exit code: {exit_code}")
@@ -124,10 +257,53 @@ async def execute_bash(
         return {"error": str(e)}
 
 
+class _ProfileKey:
+    """
+    Hashable handle for a security profile, compared by identity.
+    
+    Holding the profile keeps it alive while cached results refer to it, so its
+    id() can't be reused by a different profile.
+    """
+    
+    __slots__ = ("profile",)
+    
+    def __init__(self, profile: Any):
+        self.profile = profile
+    
+    def __hash__(self) -> int:
+        return id(self.profile)
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ProfileKey) and other.profile is self.profile
+
+
+@lru_cache(maxsize=1024)
+def _validate_cached(command: str, profile_key: _ProfileKey) -> tuple[bool, str]:
+    """Validate a command line against a profile; results are memoized."""
+    # Extract base command names from the full command line
+    # e.g., "git status" -> ["git"]
+    commands = extract_commands(command)
+    
+    if not commands:
+        return False, "No valid commands found"
+    
+    # Validate each command
+    for cmd in commands:
+        is_allowed, reason = is_command_allowed(cmd, profile_key.profile)
+        if not is_allowed:
+            return False, reason
+    
+    return True, ""
+
+
 def validate_command_with_profile(command: str, security_profile: Any) -> tuple[bool, str]:
     """
     Validate command against security profile.
     
+    Agents repeat the same commands often, so results are cached per command
+    and profile object. get_security_profile() returns a new profile object
+    whenever the profile file changes, which naturally invalidates old entries.
+    
     Args:
         command: Full command line to validate
         security_profile: SecurityProfile instance from security/
@@ -135,29 +311,12 @@ def validate_command_with_profile(command: str, security_profile: Any) -> tuple[
     Returns:
         (is_allowed: bool, reason: str)
     """
-    try:
-        # Import security validation from existing system
-        from security import is_command_allowed
-        from security.parser import extract_commands
-        
-        # Extract base command names from the full command line
-        # e.g., "git status" -> ["git"]
-        commands = extract_commands(command)
-        
-        if not commands:
-            return False, "No valid commands found"
-        
-        # Validate each command
-        for cmd in commands:
-            is_allowed, reason = is_command_allowed(cmd, security_profile)
-            if not is_allowed:
-                return False, reason
-        
-        return True, ""
-        
-    except ImportError:
+    if not SECURITY_AVAILABLE:
         logger.warning("Security module not available - allowing command")
         return True, "Security validation unavailable"
+    
+    try:
+        return _validate_cached(command, _ProfileKey(security_profile))
     except Exception as e:
         logger.error(f"Security validation error: {e}")
         return False, f"Validation error: {str(e)}"
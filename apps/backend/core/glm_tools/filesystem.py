@@ -8,14 +8,139 @@ All tools validate paths are within the allowed working directory
 and handle errors gracefully.
 """
 
+import asyncio
+import base64
 import glob as glob_module
+import io
 import logging
+import mmap
+import os
 import re
+import shutil
+import stat
+from contextvars import ContextVar
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from ..glm_json import JSONDecodeError, loads
+
+try:
+    from re import _parser as _sre_parser  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parser
+
 logger = logging.getLogger(__name__)
 
+# Working directory for tool calls made without an explicit cwd. Context-local,
+# so concurrent agent sessions can each set their own; unset means the
+# process working directory.
+tool_cwd: ContextVar[Path | None] = ContextVar("tool_cwd", default=None)
+
+
+# Read buffer for files scanned by execute_grep
+_GREP_BUFFER_SIZE = 1024 * 1024
+
+# Files at least this large are memory-mapped and searched by literal (see
+# _grep_mapped) instead of being decoded line by line
+GREP_MMAP_THRESHOLD = 256 * 1024
+
+# Leading bytes checked for NUL to detect binary files, as grep does
+_BINARY_PROBE_SIZE = 512
+
+# Files searched concurrently (in worker threads) by execute_grep
+GREP_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+
+# ripgrep executable; execute_grep delegates to it when installed
+RG_PATH = shutil.which("rg")
+
+# Python regex features ripgrep's engine lacks: lookaround, backreferences,
+# conditionals, comments and \Z. Such patterns are searched in Python.
+_RG_UNSUPPORTED = re.compile(r"\(\?(?:<?[=!]|P=|\(|#)|\\[1-9]|\\Z")
+
+# Directories whose contents Glob and Grep skip unless the pattern names them
+GLOB_EXCLUDE_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", ".venv", "venv",
+    "dist", "build", ".tox", ".mypy_cache",
+})
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int) -> re.Pattern:
+    """Compile a grep pattern, reusing the result for repeated searches."""
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=256)
+def _required_literal(pattern: str, flags: int) -> tuple[str, bool] | None:
+    """
+    Find a literal substring that every match of pattern must contain.
+    
+    Only plain characters in the top-level sequence are used; anything inside
+    groups, alternations, classes or repeats breaks the run. Lines without the
+    literal can be skipped without running the regex.
+    
+    Returns:
+        (literal, ignore_case) for the longest run of 3+ characters, or None
+    """
+    try:
+        parsed = _sre_parser.parse(pattern, flags)
+        ignore_case = bool(parsed.state.flags & re.IGNORECASE)
+    except Exception:
+        return None
+    
+    best = ""
+    run = []
+    for op, value in list(parsed) + [(None, None)]:
+        if op == _sre_parser.LITERAL:
+            run.append(chr(value))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+    
+    if len(best) < 3:
+        return None
+    return (best.casefold() if ignore_case else best), ignore_case
+
+
+@lru_cache(maxsize=64)
+def _resolve_absolute(path: Path) -> Path:
+    return path.resolve()
+
+
+def _resolve_cwd(cwd: Path) -> Path:
+    """
+    Resolve a working directory, caching the result for absolute paths.
+    
+    Agents issue many file operations against the same cwd, and each
+    resolve() walks every path component with a stat call. Relative paths
+    depend on the process cwd, so they are resolved every time.
+    """
+    if cwd.is_absolute():
+        return _resolve_absolute(cwd)
+    return cwd.resolve()
+
+
+def _containment_prefix(directory: Path) -> str:
+    """Prefix that every path string inside directory starts with (see _is_within)."""
+    return os.path.normcase(str(directory)).rstrip(os.sep) + os.sep
+
+
+def _is_within(path: Path, prefix: str) -> bool:
+    """
+    Check that a resolved path is directory itself or inside it.
+    
+    A string prefix test against _containment_prefix(directory); unlike
+    Path.relative_to() it builds no parts list and raises no exception.
+    """
+    return (os.path.normcase(str(path)) + os.sep).startswith(prefix)
+
+
+def default_cwd() -> Path:
+    """Working directory for a tool call that didn't pass one (see tool_cwd)."""
+    return tool_cwd.get() or Path.cwd()
+
 
 def validate_path(file_path: str, cwd: Path | None = None) -> Path:
     """
@@ -23,7 +148,7 @@ def validate_path(file_path: str, cwd: Path | None = None) -> Path:
     
     Args:
         file_path: File path (can be relative or absolute)
-        cwd: Working directory (if None, current directory)
+        cwd: Working directory (if None, see default_cwd())
     
     Returns:
         Resolved Path object
@@ -32,7 +157,7 @@ def validate_path(file_path: str, cwd: Path | None = None) -> Path:
         ValueError: If path escapes working directory
     """
     if cwd is None:
-        cwd = Path.cwd()
+        cwd = default_cwd()
     
     # Resolve path
     if Path(file_path).is_absolute():
@@ -41,12 +166,11 @@ def validate_path(file_path: str, cwd: Path | None = None) -> Path:
         resolved = (cwd / file_path).resolve()
     
     # Check if within cwd
-    try:
-        resolved.relative_to(cwd.resolve())
-    except ValueError:
+    cwd_resolved = _resolve_cwd(cwd)
+    if not _is_within(resolved, _containment_prefix(cwd_resolved)):
         raise ValueError(
             f"Path escapes working directory: {file_path}\n"
-            f"Working directory: {cwd.resolve()}"
+            f"Working directory: {cwd_resolved}"
         )
     
     return resolved
@@ -76,19 +200,18 @@ async def execute_read(args: dict[str, Any], cwd: Path | None = None) -> dict:
         if not path.is_file():
             return {"error": f"Not a file: {file_path}"}
         
-        # Read with multiple encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252']
-        content = None
+        # Read once, then decode: UTF-8, falling back to latin-1 (which
+        # accepts any byte sequence) without reading the file again
+        data = path.read_bytes()
+        try:
+            content = data.decode('utf-8')
+        except UnicodeDecodeError:
+            content = data.decode('latin-1')
+        del data
         
-        for encoding in encodings:
-            try:
-                content = path.read_text(encoding=encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-        
-        if content is None:
-            return {"error": f"Unable to decode file: {file_path}"}
+        # Universal newlines, as read_text() would give
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         
         logger.info(f"Read file: {path.relative_to(cwd) if cwd else path}")
         return {"content": content, "file_path": str(path)}
@@ -123,10 +246,15 @@ async def execute_write(args: dict[str, Any], cwd: Path | None = None) -> dict:
         # Create parent directories if needed
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write file
-        path.write_text(content, encoding='utf-8')
+        # Write file, encoding once (write_text() plus a separate encode
+        # for the byte count would encode the content twice)
+        if os.linesep != '\n':
+            # Same newline translation as text mode
+            content = content.replace('\n', os.linesep)
+        data = content.encode('utf-8')
+        path.write_bytes(data)
         
-        bytes_written = len(content.encode('utf-8'))
+        bytes_written = len(data)
         logger.info(f"Wrote {bytes_written} bytes to: {path.relative_to(cwd) if cwd else path}")
         
         return {
@@ -140,6 +268,21 @@ async def execute_write(args: dict[str, Any], cwd: Path | None = None) -> dict:
         return {"error": str(e)}
 
 
+def _patch_in_place(path: Path, old_bytes: bytes, new_bytes: bytes) -> None:
+    """
+    Overwrite the single occurrence of old_bytes with new_bytes of equal length.
+    
+    The file is memory-mapped, so only the pages holding the change are
+    written back rather than the whole file.
+    """
+    with open(path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+        index = mm.find(old_bytes)
+        if index == -1:
+            raise ValueError(f"String not found in file: {path}")
+        mm[index:index + len(old_bytes)] = new_bytes
+        mm.flush()
+
+
 async def execute_edit(args: dict[str, Any], cwd: Path | None = None) -> dict:
     """
     Edit a file by replacing old_string with new_string.
@@ -164,6 +307,8 @@ async def execute_edit(args: dict[str, Any], cwd: Path | None = None) -> dict:
             return {"error": "Missing required parameter: file_path"}
         if old_string is None:
             return {"error": "Missing required parameter: old_string"}
+        if old_string == "":
+            return {"error": "old_string must not be empty"}
         if new_string is None:
             return {"error": "Missing required parameter: new_string"}
         
@@ -173,24 +318,47 @@ async def execute_edit(args: dict[str, Any], cwd: Path | None = None) -> dict:
             return {"error": f"File not found: {file_path}"}
         
         # Read current content
+        data = path.read_bytes()
+        is_utf8 = True
         try:
-            content = path.read_text(encoding='utf-8')
+            content = data.decode('utf-8')
         except UnicodeDecodeError:
-            content = path.read_text(encoding='latin-1')
-        
-        # Count occurrences
-        count = content.count(old_string)
+            content = data.decode('latin-1')
+            is_utf8 = False
+        
+        # Universal newlines, as read_text() would give
+        has_cr = b'\r' in data
+        del data
+        if has_cr:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # Split once: gives the occurrence count and the replacement pieces
+        # in one pass over the content
+        parts = content.split(old_string)
+        count = len(parts) - 1
         if count == 0:
             return {
                 "error": f"String not found in file: {old_string[:100]}...",
                 "searched_file": str(path)
             }
         
-        # Replace
-        new_content = content.replace(old_string, new_string)
-        
-        # Write back
-        path.write_text(new_content, encoding='utf-8')
+        old_bytes = old_string.encode('utf-8')
+        new_bytes = new_string.encode('utf-8')
+        if (
+            count == 1
+            and is_utf8
+            and len(old_bytes) == len(new_bytes)
+            and not has_cr
+        ):
+            # Same-size single replacement in a file whose bytes match its
+            # text exactly: patch the bytes in place instead of rewriting
+            _patch_in_place(path, old_bytes, new_bytes)
+        else:
+            # Replace
+            new_content = new_string.join(parts)
+            
+            # Write back
+            path.write_text(new_content, encoding='utf-8')
         
         logger.info(
             f"Edited {path.relative_to(cwd) if cwd else path}: "
@@ -208,10 +376,82 @@ async def execute_edit(args: dict[str, Any], cwd: Path | None = None) -> dict:
         return {"error": str(e)}
 
 
+def _glob_entries(
+    pattern: str,
+    cwd: Path,
+    exclude_dirs: frozenset[str] = GLOB_EXCLUDE_DIRS,
+) -> list[tuple[str, int | None]]:
+    """
+    Find paths matching a glob pattern inside cwd.
+    
+    The file type and size come from the stat already needed for the
+    containment check, so callers can skip non-files without another one.
+    
+    Args:
+        pattern: Glob pattern relative to cwd
+        cwd: Directory to search
+        exclude_dirs: Directory names to skip; names spelled out in the
+            pattern itself (e.g. "build/**/*.js") are still searched
+    
+    Returns:
+        Sorted (path relative to cwd, size for regular files else None) pairs
+    """
+    # Matches come back relative to cwd, without joining cwd to each
+    matches = glob_module.glob(pattern, root_dir=cwd, recursive=True)
+    
+    # Drop noise directories before any resolve() or stat work
+    exclude_dirs = exclude_dirs.difference(Path(pattern).parts)
+    if exclude_dirs:
+        matches = [
+            match for match in matches
+            if exclude_dirs.isdisjoint(match.split(os.sep))
+        ]
+    
+    # Filter to only files within cwd. Matches can only leave cwd through
+    # symlinks or "..", so directories are resolved once each and files
+    # only when they are symlinks themselves.
+    cwd_prefix = _containment_prefix(_resolve_cwd(cwd))
+    check_all = ".." in Path(pattern).parts
+    resolved_dirs: dict[str, Path] = {}
+    entries = []
+    for match in matches:
+        try:
+            st = None
+            if check_all:
+                match_path = (cwd / match).resolve()
+            else:
+                parent, name = os.path.split(match)
+                parent_path = resolved_dirs.get(parent)
+                if parent_path is None:
+                    parent_path = resolved_dirs[parent] = (cwd / parent).resolve()
+                match_path = parent_path / name
+                st = os.lstat(match_path)
+                if stat.S_ISLNK(st.st_mode):
+                    match_path = match_path.resolve()
+                    st = None
+            if not _is_within(match_path, cwd_prefix):
+                # Path outside cwd, skip
+                continue
+            # Make relative to cwd for display
+            rel_path = str(match_path)[len(cwd_prefix):] or "."
+            if st is None:
+                st = os.stat(match_path)
+        except OSError:
+            # Removed since globbing, or a dangling symlink
+            continue
+        entries.append((rel_path, st.st_size if stat.S_ISREG(st.st_mode) else None))
+    
+    entries.sort()
+    return entries
+
+
 async def execute_glob(args: dict[str, Any], cwd: Path | None = None) -> dict:
     """
     Find files matching a glob pattern.
     
+    Paths under GLOB_EXCLUDE_DIRS (.git, node_modules, ...) are left out
+    unless the pattern names the directory.
+    
     Args:
         args: {"pattern": str}
         cwd: Working directory
@@ -225,32 +465,19 @@ async def execute_glob(args: dict[str, Any], cwd: Path | None = None) -> dict:
             return {"error": "Missing required parameter: pattern"}
         
         if cwd is None:
-            cwd = Path.cwd()
+            cwd = default_cwd()
         
         # Use glob to find matching files
         # Ensure pattern doesn't escape cwd
         if pattern.startswith('/') or pattern.startswith('..'):
             return {"error": "Pattern must not start with / or .."}
         
-        matches = glob_module.glob(str(cwd / pattern), recursive=True)
-        
-        # Filter to only files within cwd
-        filtered = []
-        for match in matches:
-            try:
-                match_path = Path(match).resolve()
-                match_path.relative_to(cwd.resolve())
-                # Make relative to cwd for display
-                rel_path = match_path.relative_to(cwd.resolve())
-                filtered.append(str(rel_path))
-            except ValueError:
-                # Path outside cwd, skip
-                continue
+        filtered = [rel_path for rel_path, _ in _glob_entries(pattern, cwd)]
         
         logger.info(f"Glob pattern '{pattern}' matched {len(filtered)} files")
         
         return {
-            "files": sorted(filtered),
+            "files": filtered,
             "count": len(filtered),
             "pattern": pattern
         }
@@ -260,10 +487,200 @@ async def execute_glob(args: dict[str, Any], cwd: Path | None = None) -> dict:
         return {"error": str(e)}
 
 
+def _grep_mapped(
+    full_path: Path,
+    file_str: str,
+    regex: re.Pattern,
+    needle: bytes,
+    max_matches: int,
+) -> list[dict]:
+    """
+    Search a large file by memory-mapping it and jumping between occurrences
+    of a literal every match must contain.
+    
+    Only lines containing the literal are decoded and checked with regex, so
+    files without it are scanned at memchr speed and never decoded.
+    
+    Lines end at \n, \r\n or a lone \r, matching the universal newlines
+    the streaming path in _grep_file() reads with.
+    """
+    matches = []
+    with open(full_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if b'\x00' in mm[:_BINARY_PROBE_SIZE]:
+            return matches
+        size = len(mm)
+        line_num = 1
+        counted_to = 0
+        pos = mm.find(needle)
+        while pos != -1:
+            # counted_to is a line start, so no search needs to look before it
+            start = max(mm.rfind(b'\n', counted_to, pos), mm.rfind(b'\r', counted_to, pos)) + 1
+            if start == 0:
+                start = counted_to
+            end = mm.find(b'\n', pos)
+            if end == -1:
+                end = size
+            cr = mm.find(b'\r', pos, end)
+            if cr != -1:
+                end = cr
+            
+            counted = mm[counted_to:start]
+            line_num += counted.count(b'\n') + counted.count(b'\r') - counted.count(b'\r\n')
+            counted_to = start
+            
+            # Same line text the streaming path searches (no terminator)
+            line = mm[start:end].decode('utf-8', errors='ignore')
+            if regex.search(line):
+                matches.append({
+                    "file": file_str,
+                    "line": line_num,
+                    "content": line.strip()
+                })
+                if len(matches) >= max_matches:
+                    break
+            pos = mm.find(needle, end)
+    return matches
+
+
+def _grep_file(
+    full_path: Path,
+    file_str: str,
+    file_size: int,
+    regex: re.Pattern,
+    literal: tuple[str, bool] | None,
+    max_matches: int = 10,
+) -> list[dict]:
+    """
+    Search one regular file for regex, returning at most max_matches matches.
+    
+    Files with a NUL byte near the start are treated as binary and skipped.
+    Lines are streamed, so only one is held in memory and the rest of the
+    file is never read once the limit is reached. Runs in a worker thread.
+    """
+    matches = []
+    if (
+        literal is not None
+        and not literal[1]
+        and file_size >= GREP_MMAP_THRESHOLD
+    ):
+        return _grep_mapped(full_path, file_str, regex, literal[0].encode('utf-8'), max_matches)
+    
+    with open(full_path, 'rb', buffering=_GREP_BUFFER_SIZE) as raw:
+        # Skip binary files; peek() fills the read buffer the text layer then uses
+        if b'\x00' in raw.peek(_BINARY_PROBE_SIZE)[:_BINARY_PROBE_SIZE]:
+            return matches
+        
+        f = io.TextIOWrapper(raw, encoding='utf-8', errors='ignore')
+        # Find matches with line numbers
+        for line_num, line in enumerate(f, 1):
+            # Search the line text alone, so $, \Z and [^...] see its real end
+            if line.endswith('\n'):
+                line = line[:-1]
+            if literal is not None:
+                text, ignore_case = literal
+                if text not in (line.casefold() if ignore_case else line):
+                    continue
+            if regex.search(line):
+                matches.append({
+                    "file": file_str,
+                    "line": line_num,
+                    "content": line.strip()
+                })
+                if len(matches) >= max_matches:
+                    break
+        f.detach()
+    return matches
+
+
+def _parse_rg_json(output: bytes) -> tuple[list[dict], int]:
+    """
+    Convert ripgrep --json output to execute_grep matches.
+    
+    Returns:
+        (matches sorted by file and line, number of files searched)
+    """
+    def text(data: dict) -> str:
+        if "text" in data:
+            return data["text"]
+        # Not valid UTF-8; decoded like the Python search does
+        return base64.b64decode(data["bytes"]).decode('utf-8', errors='ignore')
+    
+    matches = []
+    files_searched = 0
+    for line in output.splitlines():
+        message = loads(line)
+        data = message["data"]
+        if message["type"] == "match":
+            matches.append({
+                "file": text(data["path"]),
+                "line": data["line_number"],
+                "content": text(data["lines"]).strip()
+            })
+        elif message["type"] == "summary":
+            files_searched = data["stats"]["searches"]
+    
+    # ripgrep searches files in parallel, so output order varies between runs
+    matches.sort(key=lambda m: (m["file"], m["line"]))
+    return matches, files_searched
+
+
+async def _grep_with_rg(
+    pattern: str,
+    file_pattern: str,
+    case_sensitive: bool,
+    cwd: Path,
+    max_matches: int = 10,
+) -> tuple[list[dict], int] | None:
+    """
+    Search with ripgrep, selecting files the way _glob_entries does.
+    
+    Returns:
+        Result of _parse_rg_json(), or None if ripgrep failed (e.g. rejected
+        the pattern) and the caller should search in Python instead
+    """
+    pattern_parts = Path(file_pattern).parts
+    args = [
+        RG_PATH, "--json", "--no-config", "--no-ignore",
+        f"--max-count={max_matches}",
+        # Globs without a slash match at any depth in ripgrep; anchor them to
+        # cwd like glob() does
+        "-g", file_pattern if "/" in file_pattern else f"/{file_pattern}",
+    ]
+    if any(part.startswith(".") for part in pattern_parts):
+        args.append("--hidden")
+    for name in sorted(GLOB_EXCLUDE_DIRS.difference(pattern_parts)):
+        args += ["-g", f"!{name}/"]
+    if not case_sensitive:
+        args.append("-i")
+    args += ["-e", pattern]
+    
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        cwd=str(cwd),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    output, _ = await process.communicate()
+    
+    # 0: matches, 1: no matches, 2: error (bad pattern, unreadable files)
+    if process.returncode not in (0, 1):
+        logger.debug(f"ripgrep exited with {process.returncode}, searching in Python")
+        return None
+    try:
+        return _parse_rg_json(output)
+    except (JSONDecodeError, KeyError, ValueError) as e:
+        logger.debug(f"Unexpected ripgrep output ({e}), searching in Python")
+        return None
+
+
 async def execute_grep(args: dict[str, Any], cwd: Path | None = None) -> dict:
     """
     Search for pattern in files.
     
+    Uses ripgrep when it is installed, unless the pattern relies on Python
+    regex features it lacks; otherwise files are searched in Python.
+    
     Args:
         args: {
             "pattern": str (regex pattern),
@@ -284,48 +701,55 @@ async def execute_grep(args: dict[str, Any], cwd: Path | None = None) -> dict:
             return {"error": "Missing required parameter: pattern"}
         
         if cwd is None:
-            cwd = Path.cwd()
+            cwd = default_cwd()
         
         # Compile regex
         flags = 0 if case_sensitive else re.IGNORECASE
         try:
-            regex = re.compile(pattern, flags)
+            regex = _compile(pattern, flags)
         except re.error as e:
             return {"error": f"Invalid regex pattern: {e}"}
         
+        # Literal every matching line must contain, checked before the regex
+        literal = _required_literal(pattern, flags)
+        
         # Get files to search
-        glob_result = await execute_glob({"pattern": file_pattern}, cwd)
-        if "error" in glob_result:
-            return glob_result
-        
-        files = glob_result.get("files", [])
-        
-        # Search each file
-        matches = []
-        for file_path in files[:100]:  # Limit to 100 files
-            try:
-                full_path = cwd / file_path
-                if not full_path.is_file():
-                    continue
-                
-                content = full_path.read_text(encoding='utf-8', errors='ignore')
-                
-                # Find matches with line numbers
-                for line_num, line in enumerate(content.splitlines(), 1):
-                    if regex.search(line):
-                        matches.append({
-                            "file": str(file_path),
-                            "line": line_num,
-                            "content": line.strip()
-                        })
-                        
-                        # Limit matches per file
-                        if len([m for m in matches if m["file"] == str(file_path)]) >= 10:
-                            break
-                
-            except Exception as e:
-                logger.debug(f"Skipping {file_path}: {e}")
-                continue
+        if file_pattern.startswith('/') or file_pattern.startswith('..'):
+            return {"error": "Pattern must not start with / or .."}
+        
+        # Delegate to ripgrep when installed and the pattern means the same there
+        rg_result = None
+        if RG_PATH and not _RG_UNSUPPORTED.search(pattern):
+            rg_result = await _grep_with_rg(pattern, file_pattern, case_sensitive, cwd)
+        
+        if rg_result is not None:
+            matches, files_searched = rg_result
+        else:
+            files = _glob_entries(file_pattern, cwd)
+            files_searched = len(files)
+            
+            # Search files concurrently in worker threads, so file I/O doesn't
+            # block the event loop; results keep the glob order
+            semaphore = asyncio.Semaphore(GREP_CONCURRENCY)
+            
+            async def search(file_path: str, file_size: int | None) -> list[dict]:
+                if file_size is None:
+                    # Not a regular file (known from globbing, no extra stat)
+                    return []
+                async with semaphore:
+                    try:
+                        return await asyncio.to_thread(
+                            _grep_file, cwd / file_path, file_path, file_size, regex, literal
+                        )
+                    except Exception as e:
+                        logger.debug(f"Skipping {file_path}: {e}")
+                        return []
+            
+            matches = []
+            for file_matches in await asyncio.gather(
+                *(search(*entry) for entry in files[:100])  # Limit to 100 files
+            ):
+                matches.extend(file_matches)
         
         logger.info(
             f"Grep pattern '{pattern}' found {len(matches)} matches "
@@ -336,7 +760,7 @@ async def execute_grep(args: dict[str, Any], cwd: Path | None = None) -> dict:
             "matches": matches[:100],  # Limit total matches
             "total_matches": len(matches),
             "pattern": pattern,
-            "files_searched": len(files)
+            "files_searched": files_searched
         }
         
     except Exception as e:
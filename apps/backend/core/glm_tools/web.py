@@ -5,11 +5,74 @@ Web Tools for GLM Agent
 Implements web access: WebFetch and WebSearch.
 """
 
+import asyncio
 import logging
+import weakref
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from itertools import islice
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Check if httpx is available
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Check if HTTP/2 support is available for httpx (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool settings for the shared WebFetch client
+WEB_FETCH_MAX_CONNECTIONS = 100
+WEB_FETCH_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# WebFetch client shared by all calls, one per event loop
+_FETCH_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_fetch_client() -> "httpx.AsyncClient":
+    """
+    Get the shared WebFetch client for the running event loop, creating it on first use.
+    
+    Keep-alive connections are reused across fetches, so repeated requests to
+    a host skip the TCP and TLS handshakes. Cookies are never stored, so no
+    state carries over between fetches or agent sessions.
+    """
+    loop = asyncio.get_running_loop()
+    client = _FETCH_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=WEB_FETCH_MAX_CONNECTIONS,
+                max_keepalive_connections=WEB_FETCH_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=30.0,
+            # A policy allowing no domains rejects every Set-Cookie
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+        _FETCH_CLIENTS[loop] = client
+    return client
+
+
+async def shutdown_web_client() -> None:
+    """
+    Close the shared WebFetch client for the running event loop.
+    
+    Call at process teardown (before the event loop closes).
+    """
+    client = _FETCH_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
 
 async def execute_web_fetch(args: dict[str, Any]) -> dict:
     """
@@ -26,10 +89,7 @@ async def execute_web_fetch(args: dict[str, Any]) -> dict:
         if not url:
             return {"error": "Missing required parameter: url"}
         
-        # Check if httpx is available
-        try:
-            import httpx
-        except ImportError:
+        if not HTTPX_AVAILABLE:
             return {
                 "error": "httpx not installed. Install with: pip install httpx",
                 "url": url
@@ -38,19 +98,18 @@ async def execute_web_fetch(args: dict[str, Any]) -> dict:
         # Fetch URL
         logger.info(f"Fetching URL: {url}")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            
-            content = response.text
-            logger.info(f"Fetched {len(content)} bytes from {url}")
-            
-            return {
-                "content": content,
-                "url": url,
-                "status_code": response.status_code,
-                "content_type": response.headers.get("content-type", "")
-            }
+        response = await _get_fetch_client().get(url)
+        response.raise_for_status()
+        
+        content = response.text
+        logger.info(f"Fetched {len(content)} bytes from {url}")
+        
+        return {
+            "content": content,
+            "url": url,
+            "status_code": response.status_code,
+            "content_type": response.headers.get("content-type", "")
+        }
         
     except Exception as e:
         logger.error(f"WebFetch failed: {e}")
@@ -93,15 +152,17 @@ async def execute_web_search(args: dict[str, Any]) -> dict:
         
         logger.info(f"Searching: {query}")
         
-        # Perform search
+        # Perform search; stop consuming results once max_results are in, so
+        # no further result pages are requested
         with DDGS() as ddgs:
-            results = []
-            for result in ddgs.text(query, max_results=max_results):
-                results.append({
+            results = [
+                {
                     "title": result.get("title", ""),
                     "url": result.get("href", ""),
                     "snippet": result.get("body", "")
-                })
+                }
+                for result in islice(ddgs.text(query, max_results=max_results), max_results)
+            ]
         
         logger.info(f"Found {len(results)} results for: {query}")
         
@@ -21,38 +21,56 @@ async def test_api():
     
     models = ["glm-4.7", "glm-4.5-air", "glm-4"]
     
-    for base_url in base_urls:
-        print(f"\nTesting base_url: {base_url}")
-        client = AsyncOpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
-        
-        for model in models:
-            try:
-                print(f"  Model: {model}...", end=" ")
-                response = await client.chat.completions.create(
-                    model=model,
-                    messages=[{"role": "user", "content": "Say 'test'"}],
-                    max_tokens=10
-                )
+    clients = {
+        base_url: AsyncOpenAI(api_key=api_key, base_url=base_url)
+        for base_url in base_urls
+    }
+    
+    async def try_one(base_url, model):
+        """Send a tiny request; returns (base_url, model, response or error)."""
+        try:
+            response = await clients[base_url].chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": "Say 'test'"}],
+                max_tokens=10
+            )
+            return base_url, model, response
+        except Exception as e:
+            return base_url, model, e
+    
+    # Probe every combination at once instead of one round trip after another
+    tasks = [
+        asyncio.create_task(try_one(base_url, model))
+        for base_url in base_urls
+        for model in models
+    ]
+    
+    try:
+        for future in asyncio.as_completed(tasks):
+            base_url, model, result = await future
+            print(f"  {base_url} | Model: {model}...", end=" ")
+            if not isinstance(result, Exception):
                 print(f"✅ SUCCESS")
-                print(f"    Response: {response.choices[0].message.content}")
-                print(f"    Tokens: {response.usage.total_tokens}")
-                await client.close()
+                print(f"    Response: {result.choices[0].message.content}")
+                print(f"    Tokens: {result.usage.total_tokens}")
                 return  # Success, exit
-            except Exception as e:
-                error_msg = str(e)
-                if "1113" in error_msg:
-                    print(f"❌ No balance/quota")
-                elif "1211" in error_msg:
-                    print(f"❌ Model not found")
-                elif "401" in error_msg or "Unauthorized" in error_msg:
-                    print(f"❌ Auth failed")
-                else:
-                    print(f"❌ Error: {error_msg[:80]}")
-        
-        await client.close()
+            
+            error_msg = str(result)
+            if "1113" in error_msg:
+                print(f"❌ No balance/quota")
+            elif "1211" in error_msg:
+                print(f"❌ Model not found")
+            elif "401" in error_msg or "Unauthorized" in error_msg:
+                print(f"❌ Auth failed")
+            else:
+                print(f"❌ Error: {error_msg[:80]}")
+    finally:
+        # Stop the probes still in flight once one has succeeded
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for client in clients.values():
+            await client.close()
     
     print("\n" + "=" * 60)
     print("All tests failed. Possible issues:")
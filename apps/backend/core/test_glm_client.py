@@ -15,11 +15,16 @@ Run:
 
 Environment required:
     ZHIPUAI_API_KEY=your_api_key
+
+Optional:
+    GLM_RESPONSE_CACHE_DIR=/tmp/glm_test_cache  (reuse responses across runs)
 """
 
 import asyncio
 import os
 import sys
+import tempfile
+import traceback
 from pathlib import Path
 
 # Add backend to path
@@ -27,21 +32,35 @@ backend_path = Path(__file__).parent.parent
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
+from core.glm_client import GLMAgentClient
+from core.glm_converters import (
+    AssistantMessage,
+    TextBlock,
+    ToolUseBlock,
+    convert_tool_results_to_user_message,
+)
+from core.glm_options import GLMAgentOptions
+
+
+# Separator line for test output
+BANNER = "=" * 70
+
+# Reuse API responses across runs when GLM_RESPONSE_CACHE_DIR is set
+RESPONSE_CACHE_DIR = os.environ.get("GLM_RESPONSE_CACHE_DIR") or None
+
 
 async def test_basic_query():
     """Test basic query without tools."""
-    print("=" * 70)
+    print(BANNER)
     print("TEST 1: Basic Query (No Tools)")
-    print("=" * 70)
-    
-    from core.glm_client import GLMAgentClient
-    from core.glm_options import GLMAgentOptions
+    print(BANNER)
     
     options = GLMAgentOptions(
         model="glm-4-flash",  # Use fast model for testing
         system_prompt="You are a helpful assistant. Be concise.",
         allowed_tools=[],  # No tools for this test
-        max_turns=5
+        max_turns=5,
+        response_cache_dir=RESPONSE_CACHE_DIR,
     )
     
     print(f"\nModel: {options.model}")
@@ -68,20 +87,15 @@ async def test_basic_query():
         
     except Exception as e:
         print(f"✗ Test failed: {e}\n")
-        import traceback
         traceback.print_exc()
         return False
 
 
 async def test_with_tools():
     """Test query with tool definitions and execution."""
-    print("=" * 70)
+    print(BANNER)
     print("TEST 2: Query with Tools (With Execution)")
-    print("=" * 70)
-    
-    import tempfile
-    from core.glm_client import GLMAgentClient
-    from core.glm_options import GLMAgentOptions
+    print(BANNER)
     
     with tempfile.TemporaryDirectory() as tmpdir:
         print(f"\nWorking directory: {tmpdir}\n")
@@ -95,7 +109,8 @@ async def test_with_tools():
             system_prompt="You are a helpful file assistant.",
             allowed_tools=["Read"],
             cwd=tmpdir,
-            max_turns=5
+            max_turns=5,
+            response_cache_dir=RESPONSE_CACHE_DIR,
         )
         
         print(f"Model: {options.model}")
@@ -128,25 +143,15 @@ async def test_with_tools():
             
         except Exception as e:
             print(f"✗ Test failed: {e}\n")
-            import traceback
             traceback.print_exc()
             return False
 
 
 async def test_message_converters():
     """Test message format conversion utilities."""
-    print("=" * 70)
+    print(BANNER)
     print("TEST 3: Message Format Converters")
-    print("=" * 70)
-    
-    from core.glm_converters import (
-        TextBlock,
-        ToolUseBlock,
-        AssistantMessage,
-        ToolResultBlock,
-        UserMessage,
-        convert_tool_results_to_user_message,
-    )
+    print(BANNER)
     
     # Test creating messages
     print("\n1. Creating AssistantMessage with TextBlock...")
@@ -179,9 +184,9 @@ async def test_message_converters():
 async def main():
     """Run all tests."""
     print("\n")
-    print("=" * 70)
+    print(BANNER)
     print("GLM CLIENT IMPLEMENTATION TEST SUITE")
-    print("=" * 70)
+    print(BANNER)
     print()
     
     # Check API key
@@ -195,20 +200,20 @@ async def main():
     print("API Key: ✓ Found")
     print()
     
-    # Run tests
-    results = []
-    
-    # Test 3 doesn't need API
-    results.append(await test_message_converters())
-    
-    # Tests 1 and 2 need API
-    results.append(await test_basic_query())
-    results.append(await test_with_tools())
+    # Run tests concurrently so the API round trips of tests 1 and 2 overlap
+    # (test 3 doesn't need the API); their output interleaves
+    outcomes = await asyncio.gather(
+        test_message_converters(),
+        test_basic_query(),
+        test_with_tools(),
+        return_exceptions=True,
+    )
+    results = [outcome is True for outcome in outcomes]
     
     # Summary
-    print("=" * 70)
+    print(BANNER)
     print("TEST SUMMARY")
-    print("=" * 70)
+    print(BANNER)
     passed = sum(results)
     total = len(results)
     print(f"\nPassed: {passed}/{total}")
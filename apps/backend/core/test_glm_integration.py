@@ -11,53 +11,136 @@ Run with:
 
 Note: These tests make real API calls and will consume API credits.
 Set SKIP_API_TESTS=1 to skip tests requiring API key.
+Set GLM_RESPONSE_CACHE_DIR (e.g. /tmp/glm_test_cache) to store responses on
+disk and reuse them in later runs instead of calling the API again.
 """
 
 import asyncio
+import atexit
+import functools
 import os
+import shutil
 import sys
 import tempfile
+import traceback
 from pathlib import Path
+
 import pytest
+import pytest_asyncio
 
 # Add backend to path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
+from core.client import create_client
+from core.glm_client import GLMAgentClient, shutdown_clients
+from core.glm_converters import AssistantMessage
+from core.glm_options import GLMAgentOptions
+from core.simple_client import create_simple_client
 
-def check_api_key():
-    """Check if ZHIPUAI_API_KEY is set."""
-    api_key = os.environ.get("ZHIPUAI_API_KEY")
-    if not api_key:
-        print("⚠ ZHIPUAI_API_KEY not set - skipping API tests")
-        print("  Get your key from: https://open.bigmodel.cn/")
-        return False
-    return True
+# Separator line for test output
+BANNER = "=" * 60
+
+# Reuse API responses across runs when GLM_RESPONSE_CACHE_DIR is set
+RESPONSE_CACHE_DIR = os.environ.get("GLM_RESPONSE_CACHE_DIR") or None
+
+# Maximum API tests running at once when run as a script (GLM rate limits)
+MAX_CONCURRENT_API_TESTS = 4
+
+# Tools every GLM agent client must offer
+CORE_TOOLS = frozenset({"Read", "Write", "Edit", "Glob", "Grep", "Bash", "WebFetch", "WebSearch"})
+
+# Stand-in key for tests that build clients without calling the API
+PLACEHOLDER_API_KEY = "test_key"
+
+
+def set_test_environment():
+    """
+    Set the process environment the tests rely on.
+    
+    Done once before any test runs, so tests running concurrently don't
+    modify shared process state.
+    """
+    os.environ["AI_PROVIDER"] = "glm"
+    os.environ.setdefault("ZHIPUAI_API_KEY", PLACEHOLDER_API_KEY)
+
+
+# Checked once at import; set_test_environment() later adds a placeholder key
+HAS_API_KEY = os.environ.get("ZHIPUAI_API_KEY", PLACEHOLDER_API_KEY) != PLACEHOLDER_API_KEY
+SKIP_API_TESTS = os.environ.get("SKIP_API_TESTS") == "1"
+
+requires_api = pytest.mark.skipif(
+    not HAS_API_KEY or SKIP_API_TESTS,
+    reason="needs ZHIPUAI_API_KEY (and SKIP_API_TESTS unset)",
+)
+
+
+@functools.cache
+def coder_client() -> GLMAgentClient:
+    """
+    Create the coder agent client once for the tests that only inspect it.
+    
+    create_client() loads agent, MCP and security configuration for the
+    project; the provider and tool filtering tests check the same client.
+    It runs against a throwaway project, since it writes a generated
+    security profile into the project directory.
+    """
+    project_dir = Path(tempfile.mkdtemp(prefix="glm_test_project_"))
+    atexit.register(shutil.rmtree, project_dir, ignore_errors=True)
+    return create_client(
+        project_dir=project_dir,
+        spec_dir=project_dir / "spec",
+        model="glm-4.7",
+        agent_type="coder",
+    )
 
 
-def check_skip_api_tests():
-    """Check if API tests should be skipped."""
-    return os.environ.get("SKIP_API_TESTS") == "1"
+async def collect_text(stream) -> str:
+    """Join the text of the assistant messages in a response stream."""
+    
+    # Only AssistantMessage has text (tool results come as UserMessage);
+    # an exact type check avoids hasattr()'s AttributeError on the others
+    return "".join([
+        message.text async for message in stream if type(message) is AssistantMessage
+    ])
 
 
-@pytest.mark.asyncio
+@pytest.fixture(scope="module", autouse=True)
+def provider_environment():
+    """The environment of set_test_environment(), restored after the module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AI_PROVIDER", "glm")
+        if not os.environ.get("ZHIPUAI_API_KEY"):
+            mp.setenv("ZHIPUAI_API_KEY", PLACEHOLDER_API_KEY)
+        yield
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module", autouse=True)
+async def shared_api_client():
+    """
+    Run the module's tests on one event loop so they share the pooled API client.
+    
+    GLMAgentClient pools its HTTP client per event loop; with a loop per test,
+    every test would open new connections to the GLM endpoint.
+    """
+    yield
+    await shutdown_clients()
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@requires_api
 async def test_glm_client_basic_query():
     """Test basic query with GLM client."""
-    if not check_api_key() or check_skip_api_tests():
-        return False
-    
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test 1: Basic Query")
-    print("=" * 60)
-    
-    from core.glm_client import GLMAgentClient
-    from core.glm_options import GLMAgentOptions
+    print(BANNER)
     
     options = GLMAgentOptions(
         model="glm-4.7",  # Use standard model
         system_prompt="You are a helpful assistant. Be concise.",
         allowed_tools=[],  # No tools for this test
         max_turns=1,
+        response_cache_dir=RESPONSE_CACHE_DIR,
     )
     
     try:
@@ -66,11 +149,7 @@ async def test_glm_client_basic_query():
             print("Querying: What is 2 + 2?")
             await client.query("What is 2 + 2? Answer with just the number.")
             
-            # Collect response
-            response_text = ""
-            async for message in client.receive_response():
-                if hasattr(message, 'text'):
-                    response_text += message.text
+            response_text = await collect_text(client.receive_response())
             
             print(f"Response: {response_text}")
             
@@ -83,28 +162,22 @@ async def test_glm_client_basic_query():
                 return False
     except Exception as e:
         print(f"[FAIL] Basic query failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
+@requires_api
 async def test_glm_client_with_read_tool():
     """Test GLM client with Read tool."""
-    if not check_api_key() or check_skip_api_tests():
-        return False
-    
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test 2: Read Tool")
-    print("=" * 60)
+    print(BANNER)
     
-    from core.glm_client import GLMAgentClient
-    from core.glm_options import GLMAgentOptions
-    
-    # Create a test file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-        f.write("Hello from GLM test!")
-        test_file = Path(f.name)
+    # Create a test file, off the event loop so concurrent tests keep running
+    test_dir = Path(await asyncio.to_thread(tempfile.mkdtemp))
+    test_file = test_dir / "greeting.txt"
+    await asyncio.to_thread(test_file.write_text, "Hello from GLM test!")
     
     try:
         options = GLMAgentOptions(
@@ -113,6 +186,7 @@ async def test_glm_client_with_read_tool():
             allowed_tools=["Read"],
             max_turns=3,
             cwd=str(test_file.parent),
+            response_cache_dir=RESPONSE_CACHE_DIR,
         )
         
         client = GLMAgentClient(options=options)
@@ -121,11 +195,7 @@ async def test_glm_client_with_read_tool():
             print(f"Querying: {query}")
             await client.query(query)
             
-            # Collect response
-            response_text = ""
-            async for message in client.receive_response():
-                if hasattr(message, 'text'):
-                    response_text += message.text
+            response_text = await collect_text(client.receive_response())
             
             print(f"Response: {response_text}")
             
@@ -138,91 +208,81 @@ async def test_glm_client_with_read_tool():
                 return False
     except Exception as e:
         print(f"[FAIL] Read tool test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
     finally:
-        test_file.unlink(missing_ok=True)
+        await asyncio.to_thread(shutil.rmtree, test_dir, ignore_errors=True)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
+@requires_api
 async def test_glm_client_with_write_tool():
     """Test GLM client with Write tool."""
-    if not check_api_key() or check_skip_api_tests():
-        return False
-    
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test 3: Write Tool")
-    print("=" * 60)
+    print(BANNER)
     
-    from core.glm_client import GLMAgentClient
-    from core.glm_options import GLMAgentOptions
+    # Temp directory made and removed off the event loop
+    test_dir = Path(await asyncio.to_thread(tempfile.mkdtemp))
+    test_file = test_dir / "test_output.txt"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_dir = Path(tmpdir)
-        test_file = test_dir / "test_output.txt"
+    try:
+        options = GLMAgentOptions(
+            model="glm-4.5-air",
+            system_prompt="You are a helpful file assistant.",
+            allowed_tools=["Write"],
+            max_turns=3,
+            cwd=str(test_dir),
+            response_cache_dir=RESPONSE_CACHE_DIR,
+        )
         
-        try:
-            options = GLMAgentOptions(
-                model="glm-4.5-air",
-                system_prompt="You are a helpful file assistant.",
-                allowed_tools=["Write"],
-                max_turns=3,
-                cwd=str(test_dir),
-            )
+        client = GLMAgentClient(options=options)
+        async with client:
+            query = f"Write 'GLM integration test successful!' to the file {test_file.name}"
+            print(f"Querying: {query}")
+            await client.query(query)
             
-            client = GLMAgentClient(options=options)
-            async with client:
-                query = f"Write 'GLM integration test successful!' to the file {test_file.name}"
-                print(f"Querying: {query}")
-                await client.query(query)
-                
-                # Collect response
-                response_text = ""
-                async for message in client.receive_response():
-                    if hasattr(message, 'text'):
-                        response_text += message.text
-                
-                print(f"Response: {response_text}")
-                
-                # Check if file was created
-                if test_file.exists():
-                    content = test_file.read_text()
-                    print(f"File content: {content}")
-                    if "GLM integration test successful" in content:
-                        print("[PASS] Write tool works")
-                        return True
-                    else:
-                        print(f"⚠ File created but wrong content: {content}")
-                        return False
+            response_text = await collect_text(client.receive_response())
+            
+            print(f"Response: {response_text}")
+            
+            # Check if file was created
+            if test_file.exists():
+                # Search the raw bytes; only the printed preview is decoded
+                content = await asyncio.to_thread(test_file.read_bytes)
+                preview = content[:500].decode("utf-8", errors="replace")
+                print(f"File content: {preview}")
+                if b"GLM integration test successful" in content:
+                    print("[PASS] Write tool works")
+                    return True
                 else:
-                    print("[FAIL] File was not created")
+                    print(f"⚠ File created but wrong content: {preview}")
                     return False
-        except Exception as e:
-            print(f"[FAIL] Write tool test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+            else:
+                print("[FAIL] File was not created")
+                return False
+    except Exception as e:
+        print(f"[FAIL] Write tool test failed: {e}")
+        traceback.print_exc()
+        return False
+    finally:
+        await asyncio.to_thread(shutil.rmtree, test_dir, ignore_errors=True)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
+@requires_api
 async def test_glm_client_multi_turn():
     """Test multi-turn conversation with GLM client."""
-    if not check_api_key() or check_skip_api_tests():
-        return False
-    
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test 4: Multi-Turn Conversation")
-    print("=" * 60)
-    
-    from core.glm_client import GLMAgentClient
-    from core.glm_options import GLMAgentOptions
+    print(BANNER)
     
     options = GLMAgentOptions(
         model="glm-4.7",
         system_prompt="You are a helpful assistant. Remember context from previous messages.",
         allowed_tools=[],
         max_turns=3,
+        response_cache_dir=RESPONSE_CACHE_DIR,
     )
     
     try:
@@ -231,19 +291,13 @@ async def test_glm_client_multi_turn():
             # Turn 1
             print("Turn 1: My name is Alice")
             await client.query("My name is Alice. Remember this.")
-            response1 = ""
-            async for message in client.receive_response():
-                if hasattr(message, 'text'):
-                    response1 += message.text
+            response1 = await collect_text(client.receive_response())
             print(f"Response 1: {response1}")
             
             # Turn 2
             print("Turn 2: What is my name?")
             await client.query("What is my name?")
-            response2 = ""
-            async for message in client.receive_response():
-                if hasattr(message, 'text'):
-                    response2 += message.text
+            response2 = await collect_text(client.receive_response())
             print(f"Response 2: {response2}")
             
             # Check if it remembers
@@ -255,33 +309,20 @@ async def test_glm_client_multi_turn():
                 return False
     except Exception as e:
         print(f"[FAIL] Multi-turn test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_provider_switching():
     """Test that GLM is now the only provider (no switching needed)."""
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test 5: GLM-Only Provider")
-    print("=" * 60)
-    
-    from core.client import create_client
-    from core.glm_client import GLMAgentClient
-    
-    # Ensure API key is set
-    if not os.environ.get("ZHIPUAI_API_KEY"):
-        os.environ["ZHIPUAI_API_KEY"] = "test_key"
+    print(BANNER)
     
     try:
         # Test that create_client returns GLM client
-        client = create_client(
-            project_dir=Path.cwd(),
-            spec_dir=Path.cwd() / "spec",
-            model="glm-4.7",
-            agent_type="coder",
-        )
+        client = coder_client()
         
         if not isinstance(client, GLMAgentClient):
             print(f"[FAIL] Expected GLMAgentClient, got {type(client)}")
@@ -301,19 +342,13 @@ async def test_provider_switching():
         return False
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
+@requires_api
 async def test_simple_client_glm():
     """Test simple client with GLM provider."""
-    if not check_api_key() or check_skip_api_tests():
-        return False
-    
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test 6: Simple Client with GLM")
-    print("=" * 60)
-    
-    from core.simple_client import create_simple_client
-    
-    os.environ["AI_PROVIDER"] = "glm"
+    print(BANNER)
     
     try:
         client = create_simple_client(
@@ -324,11 +359,7 @@ async def test_simple_client_glm():
         async with client:
             await client.query("What is 3 + 3? Answer with just the number.")
             
-            # Collect response
-            response_text = ""
-            async for message in client.receive_response():
-                if hasattr(message, 'text'):
-                    response_text += message.text
+            response_text = await collect_text(client.receive_response())
             
             print(f"Response: {response_text}")
             
@@ -340,46 +371,32 @@ async def test_simple_client_glm():
                 return False
     except Exception as e:
         print(f"[FAIL] Simple client test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_tool_filtering():
     """Test that GLM clients get core tools plus MCP tools when configured."""
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test 7: Tool Filtering")
-    print("=" * 60)
-    
-    from core.client import create_client
-    
-    if not os.environ.get("ZHIPUAI_API_KEY"):
-        os.environ["ZHIPUAI_API_KEY"] = "test_key"
+    print(BANNER)
     
     try:
-        client = create_client(
-            project_dir=Path.cwd(),
-            spec_dir=Path.cwd() / "spec",
-            model="glm-4.7",
-            agent_type="coder",  # coder has many tools
-            max_thinking_tokens=None,
-            output_format=None,
-        )
+        client = coder_client()  # coder has many tools
         
-        core_tools = ["Read", "Write", "Edit", "Glob", "Grep", "Bash", "WebFetch", "WebSearch"]
         tools = client.options.allowed_tools
         
         # Check core tools are present
-        for ct in core_tools:
-            if ct not in tools:
-                print(f"[FAIL] Missing core tool: {ct}")
-                return False
+        missing = CORE_TOOLS.difference(tools)
+        if missing:
+            print(f"[FAIL] Missing core tools: {sorted(missing)}")
+            return False
         
         print(f"[PASS] Tool filtering works - {len(tools)} tools available")
-        print(f"  Core Tools: {[t for t in tools if t in core_tools]}")
+        print(f"  Core Tools: {[t for t in tools if t in CORE_TOOLS]}")
         # Show MCP tools if any
-        mcp_tools = [t for t in tools if t not in core_tools]
+        mcp_tools = [t for t in tools if t not in CORE_TOOLS]
         if mcp_tools:
             print(f"  MCP Tools: {mcp_tools[:5]}...")  # Show first 5
         return True
@@ -390,36 +407,54 @@ async def test_tool_filtering():
 
 async def main():
     """Run all integration tests."""
-    print("=" * 60)
+    print(BANNER)
     print("GLM Integration Tests")
-    print("=" * 60)
+    print(BANNER)
     
-    if check_skip_api_tests():
+    if SKIP_API_TESTS:
         print("\n⚠ SKIP_API_TESTS=1 - Skipping API tests")
-    
-    if not check_api_key() and not check_skip_api_tests():
+    elif not HAS_API_KEY:
         print("\n⚠ No API key found - limited testing only")
         print("  Set ZHIPUAI_API_KEY to run full test suite")
+        print("  Get your key from: https://open.bigmodel.cn/")
     
-    # Run tests
-    results = []
+    set_test_environment()
     
     # Always run these (no API needed)
-    results.append(("Provider Switching", await test_provider_switching()))
-    results.append(("Tool Filtering", await test_tool_filtering()))
+    tests = [
+        ("Provider Switching", test_provider_switching),
+        ("Tool Filtering", test_tool_filtering),
+    ]
     
     # API tests
-    if check_api_key() and not check_skip_api_tests():
-        results.append(("Basic Query", await test_glm_client_basic_query()))
-        results.append(("Read Tool", await test_glm_client_with_read_tool()))
-        results.append(("Write Tool", await test_glm_client_with_write_tool()))
-        results.append(("Multi-Turn", await test_glm_client_multi_turn()))
-        results.append(("Simple Client", await test_simple_client_glm()))
+    if HAS_API_KEY and not SKIP_API_TESTS:
+        tests += [
+            ("Basic Query", test_glm_client_basic_query),
+            ("Read Tool", test_glm_client_with_read_tool),
+            ("Write Tool", test_glm_client_with_write_tool),
+            ("Multi-Turn", test_glm_client_multi_turn),
+            ("Simple Client", test_simple_client_glm),
+        ]
+    
+    # Run tests concurrently so API round trips overlap; output interleaves
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_API_TESTS)
+    
+    async def run(test):
+        async with semaphore:
+            return await test()
+    
+    outcomes = await asyncio.gather(
+        *(run(test) for _, test in tests), return_exceptions=True
+    )
+    results = [
+        (name, outcome is True)
+        for (name, _), outcome in zip(tests, outcomes)
+    ]
     
     # Summary
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print("Test Summary")
-    print("=" * 60)
+    print(BANNER)
     
     passed = sum(1 for _, result in results if result)
     total = len(results)
@@ -428,9 +463,11 @@ async def main():
         status = "[PASS] PASS" if result else "[FAIL] FAIL"
         print(f"{status}: {name}")
     
-    print("\n" + "=" * 60)
+    print("\n" + BANNER)
     print(f"Results: {passed}/{total} tests passed")
-    print("=" * 60)
+    print(BANNER)
+    
+    await shutdown_clients()
     
     return passed == total
 
@@ -91,6 +91,7 @@ if env_file.exists():
 elif dev_env_file.exists():
     load_dotenv(dev_env_file)
 
+from core.glm_client import run_then_shutdown
 from debug import debug, debug_error, debug_section, debug_success
 from phase_config import resolve_model_id
 from review import ReviewState
@@ -267,9 +268,11 @@ Examples:
     try:
         debug("spec_runner", "Starting spec orchestrator run...")
         success = asyncio.run(
-            orchestrator.run(
-                interactive=args.interactive or not task_description,
-                auto_approve=args.auto_approve,
+            run_then_shutdown(
+                orchestrator.run(
+                    interactive=args.interactive or not task_description,
+                    auto_approve=args.auto_approve,
+                )
             )
         )
 
@@ -0,0 +1,96 @@
+"""
+Tests for core.client helpers.
+
+Covers the cached project-state and CLAUDE.md loading used by create_client(),
+and the environment flags it reads.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent / "apps" / "backend"
+sys.path.insert(0, str(backend_path))
+
+from core.client import (
+    get_project_state,
+    is_electron_mcp_enabled,
+    load_claude_md,
+    should_use_claude_md,
+)
+
+
+def _write_index(project_dir: Path, index: dict) -> None:
+    index_dir = project_dir / ".auto-claude"
+    index_dir.mkdir(exist_ok=True)
+    (index_dir / "project_index.json").write_text(json.dumps(index))
+
+
+class TestGetProjectState:
+    """Tests for get_project_state() caching."""
+
+    def test_missing_index_returns_empty(self, temp_dir: Path):
+        """Projects without an index get an empty index."""
+        project_index, capabilities = get_project_state(temp_dir)
+
+        assert project_index == {}
+        assert isinstance(capabilities, dict)
+
+    def test_repeated_calls_are_cached(self, temp_dir: Path):
+        """Unchanged index files are only parsed once."""
+        _write_index(temp_dir, {"services": {}})
+
+        first = get_project_state(temp_dir)
+        second = get_project_state(temp_dir)
+
+        assert first is second
+
+    def test_changed_index_is_reloaded(self, temp_dir: Path):
+        """A modified project_index.json invalidates the cached state."""
+        _write_index(temp_dir, {"services": {}})
+        first_index, _ = get_project_state(temp_dir)
+
+        _write_index(temp_dir, {"services": {"api": {"language": "python"}}})
+        index_file = temp_dir / ".auto-claude" / "project_index.json"
+        st = index_file.stat()
+        os.utime(index_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        second_index, _ = get_project_state(temp_dir)
+
+        assert first_index == {"services": {}}
+        assert "api" in second_index["services"]
+
+
+class TestLoadClaudeMd:
+    """Tests for load_claude_md() caching."""
+
+    def test_missing_file_returns_none(self, temp_dir: Path):
+        """No CLAUDE.md means no project instructions."""
+        assert load_claude_md(temp_dir) is None
+
+    def test_reloads_when_file_changes(self, temp_dir: Path):
+        """Edits to CLAUDE.md are picked up on the next call."""
+        claude_md = temp_dir / "CLAUDE.md"
+        claude_md.write_text("first", encoding="utf-8")
+        assert load_claude_md(temp_dir) == "first"
+
+        claude_md.write_text("second version", encoding="utf-8")
+        assert load_claude_md(temp_dir) == "second version"
+
+
+class TestEnvironmentFlags:
+    """Tests for the environment predicates."""
+
+    def test_flags_follow_environment_changes(self, monkeypatch):
+        """Flags reflect the environment at call time, not the first call."""
+        monkeypatch.setenv("USE_CLAUDE_MD", "false")
+        monkeypatch.setenv("ELECTRON_MCP_ENABLED", "false")
+        assert not should_use_claude_md()
+        assert not is_electron_mcp_enabled()
+
+        monkeypatch.setenv("USE_CLAUDE_MD", "true")
+        monkeypatch.setenv("ELECTRON_MCP_ENABLED", "true")
+        assert should_use_claude_md()
+        assert is_electron_mcp_enabled()
@@ -0,0 +1,874 @@
+"""
+Tests for the GLM agent client.
+
+The OpenAI-compatible API is never called; responses are built from
+SimpleNamespace objects shaped like openai ChatCompletion results.
+"""
+
+import asyncio
+import json
+import sys
+import weakref
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent / "apps" / "backend"
+sys.path.insert(0, str(backend_path))
+
+pytest.importorskip("openai")
+
+from core.glm_client import GLMAgentClient
+from core.glm_converters import convert_glm_to_assistant_message, parse_tool_calls
+from core.glm_options import GLMAgentOptions
+
+
+def make_tool_call(call_id: str, name: str, args: dict | str) -> SimpleNamespace:
+    arguments = args if isinstance(args, str) else json.dumps(args)
+    return SimpleNamespace(
+        id=call_id,
+        type="function",
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+def make_response(
+    content: str | None = None,
+    tool_calls: list | None = None,
+    finish_reason: str = "stop",
+) -> SimpleNamespace:
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=message, finish_reason=finish_reason)]
+    )
+
+
+@pytest.fixture
+def glm_client(monkeypatch, temp_dir: Path) -> GLMAgentClient:
+    """A GLM client with a dummy API key rooted at a temp directory."""
+    monkeypatch.setenv("ZHIPUAI_API_KEY", "test-key")
+    options = GLMAgentOptions(
+        model="glm-4.7",
+        allowed_tools=["Read", "Write"],
+        cwd=str(temp_dir),
+    )
+    return GLMAgentClient(options=options)
+
+
+class TestExecuteTools:
+    """Tests for GLMAgentClient._execute_tools()."""
+
+    async def test_read_only_tools_run_concurrently(self, glm_client, monkeypatch):
+        """Consecutive read-only tool calls overlap instead of running serially."""
+        running = 0
+        peak = 0
+
+        async def fake_execute(tool_name, args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return f"{tool_name}:{args['file_path']}"
+
+        monkeypatch.setattr(glm_client, "_execute_single_tool", fake_execute)
+        response = make_response(
+            tool_calls=[
+                make_tool_call(f"call_{i}", "Read", {"file_path": f"f{i}.txt"})
+                for i in range(3)
+            ],
+            finish_reason="tool_calls",
+        )
+
+        results = await glm_client._execute_tools(response)
+
+        assert peak == 3
+        assert [r["tool_call_id"] for r in results] == ["call_0", "call_1", "call_2"]
+        assert results[2]["content"] == "Read:f2.txt"
+
+    async def test_write_is_a_barrier(self, glm_client, monkeypatch):
+        """A Write completes before later reads in the same turn start."""
+        order = []
+
+        async def fake_execute(tool_name, args):
+            order.append(f"start:{tool_name}")
+            await asyncio.sleep(0.01)
+            order.append(f"end:{tool_name}")
+            return "ok"
+
+        monkeypatch.setattr(glm_client, "_execute_single_tool", fake_execute)
+        response = make_response(
+            tool_calls=[
+                make_tool_call("w", "Write", {"file_path": "a", "content": "x"}),
+                make_tool_call("r", "Read", {"file_path": "a"}),
+            ],
+            finish_reason="tool_calls",
+        )
+
+        await glm_client._execute_tools(response)
+
+        assert order == ["start:Write", "end:Write", "start:Read", "end:Read"]
+
+    async def test_read_only_mcp_tools_batched(self, glm_client):
+        """Consecutive read-only MCP calls go to the manager as one batch."""
+        batches = []
+
+        class FakeManager:
+            def is_read_only_tool(self, tool_name):
+                return tool_name.endswith("get-library-docs")
+
+            async def execute_tools_batch(self, calls):
+                batches.append([name for name, _ in calls])
+                return [
+                    ('{"error": "not found"}', True) if args["id"] == "/b"
+                    else (f"docs {args['id']}", False)
+                    for _, args in calls
+                ]
+
+            async def execute_tool(self, tool_name, arguments):
+                batches.append([tool_name])
+                return "done"
+
+        glm_client._mcp_manager = FakeManager()
+        docs = "mcp__context7__get-library-docs"
+        response = make_response(
+            tool_calls=[
+                make_tool_call("a", docs, {"id": "/a"}),
+                make_tool_call("b", docs, {"id": "/b"}),
+                make_tool_call("c", "mcp__linear__create-issue", {"title": "x"}),
+            ],
+            finish_reason="tool_calls",
+        )
+
+        results = await glm_client._execute_tools(response)
+
+        assert batches == [[docs, docs], ["mcp__linear__create-issue"]]
+        assert [r["content"] for r in results] == ["docs /a", '{"error": "not found"}', "done"]
+        assert [r["is_error"] for r in results] == [False, True, False]
+
+    async def test_single_mcp_error_payload_reported_as_error(self, glm_client):
+        """An MCP error payload is flagged the same outside a batch."""
+
+        class FakeManager:
+            def is_read_only_tool(self, tool_name):
+                return False
+
+            async def execute_tool(self, tool_name, arguments):
+                return '{"error": "issue not found"}' if arguments["id"] == "x" else "done"
+
+        glm_client._mcp_manager = FakeManager()
+        update = "mcp__linear__update-issue"
+        response = make_response(
+            tool_calls=[
+                make_tool_call("a", update, {"id": "x"}),
+                make_tool_call("b", update, {"id": "y"}),
+            ],
+            finish_reason="tool_calls",
+        )
+
+        results = await glm_client._execute_tools(response)
+
+        assert [r["is_error"] for r in results] == [True, False]
+
+    async def test_session_cwd_set_for_tool_call(self, glm_client, monkeypatch, temp_dir):
+        """Core tools run with the session cwd as tool_cwd, reset afterwards."""
+        import core.glm_client as glm_client_module
+        from core.glm_tools import tool_cwd
+
+        seen = []
+
+        async def fake_executor(args, **kwargs):
+            seen.append((tool_cwd.get(), kwargs))
+            return "ok"
+
+        monkeypatch.setattr(glm_client_module, "get_tool_executor", lambda name: fake_executor)
+
+        await glm_client._execute_single_tool("Read", {"file_path": "a"})
+
+        assert seen == [(temp_dir, {})]
+        assert tool_cwd.get() is None
+
+    async def test_invalid_arguments_reported_as_error(self, glm_client):
+        """Malformed JSON arguments produce an error result, not an exception."""
+        response = make_response(
+            tool_calls=[make_tool_call("bad", "Read", "{not json")],
+            finish_reason="tool_calls",
+        )
+
+        results = await glm_client._execute_tools(response)
+
+        assert results[0]["is_error"] is True
+        assert "Invalid JSON" in results[0]["content"]
+
+
+class TestParseToolCalls:
+    """Tests for parse_tool_calls() and its reuse by the converter."""
+
+    def test_arguments_parsed_once_and_shared(self):
+        """Converter blocks reuse the already-parsed argument dicts."""
+        response = make_response(
+            content="reading",
+            tool_calls=[make_tool_call("c1", "Read", {"file_path": "a"})],
+            finish_reason="tool_calls",
+        )
+
+        parsed = parse_tool_calls(response.choices[0].message)
+        message = convert_glm_to_assistant_message(response, parsed)
+
+        assert parsed[0].arguments == {"file_path": "a"}
+        assert message.content[1].input is parsed[0].arguments
+
+    def test_invalid_json_recorded_as_error(self):
+        """Unparseable arguments become empty input with an error set."""
+        response = make_response(
+            tool_calls=[make_tool_call("c1", "Read", "{oops")],
+            finish_reason="tool_calls",
+        )
+
+        parsed = parse_tool_calls(response.choices[0].message)
+
+        assert parsed[0].arguments == {}
+        assert parsed[0].error
+        assert convert_glm_to_assistant_message(response).content[0].input == {}
+
+
+class TestMessageTypes:
+    """Tests for the converter message dataclasses."""
+
+    def test_content_stored_as_tuple(self):
+        """Lists passed as content are converted to tuples."""
+        from core.glm_converters import AssistantMessage, TextBlock, ToolUseBlock
+
+        message = AssistantMessage(
+            content=[
+                TextBlock(text="one"),
+                ToolUseBlock(name="Read", input={}, id="c1"),
+                TextBlock(text="two"),
+            ]
+        )
+
+        assert isinstance(message.content, tuple)
+        assert message.text == "one\ntwo"
+        assert str(message) == "one\nTool: Read\ntwo"
+
+    def test_messages_are_immutable(self):
+        """Blocks are frozen and have no per-instance __dict__."""
+        import dataclasses
+
+        from core.glm_converters import TextBlock
+
+        block = TextBlock(text="hi")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            block.text = "changed"
+        assert not hasattr(block, "__dict__")
+
+
+class TestGLMJson:
+    """Tests for the core.glm_json helpers."""
+
+    def test_round_trip(self):
+        """dumps() returns str and loads() restores the original data."""
+        from core import glm_json
+
+        data = {"path": "ü/файл.txt", "lines": [1, 2], "ok": True, "none": None}
+        encoded = glm_json.dumps(data)
+
+        assert isinstance(encoded, str)
+        assert glm_json.loads(encoded) == data
+
+    def test_decode_error_type(self):
+        """Invalid input raises the exported JSONDecodeError."""
+        from core import glm_json
+
+        with pytest.raises(glm_json.JSONDecodeError):
+            glm_json.loads("{bad")
+
+
+class FakeOpenAI:
+    """Stand-in for AsyncOpenAI that records close() calls."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class TestClientLifecycle:
+    """Tests for API client creation and shutdown."""
+
+    def test_no_client_created_on_init(self, monkeypatch, temp_dir):
+        """Constructing an agent client opens no API client."""
+        import core.glm_client as glm_client_module
+
+        def fail_create(*args):
+            raise AssertionError("API client created in __init__")
+
+        monkeypatch.setattr(glm_client_module, "_create_openai_client", fail_create)
+        monkeypatch.setenv("ZHIPUAI_API_KEY", "test-key")
+
+        client = GLMAgentClient(options=GLMAgentOptions(cwd=str(temp_dir)))
+
+        assert client.client is None
+
+    async def test_client_pooled_across_sessions(self, glm_client, monkeypatch):
+        """Sessions on the same loop share one API client until shutdown."""
+        import core.glm_client as glm_client_module
+
+        created = []
+
+        def fake_create(*args):
+            created.append(FakeOpenAI())
+            return created[-1]
+
+        monkeypatch.setattr(glm_client_module, "_create_openai_client", fake_create)
+        monkeypatch.setattr(
+            glm_client_module, "_CLIENT_POOL", weakref.WeakKeyDictionary()
+        )
+
+        assert glm_client.client is None
+        async with glm_client:
+            first = glm_client.client
+        assert glm_client.client is None
+
+        async with glm_client:
+            assert glm_client.client is first
+            # Clients in use are not closed by shutdown
+            await glm_client_module.shutdown_clients()
+            assert not first.closed
+
+        await glm_client_module.shutdown_clients()
+
+        assert len(created) == 1
+        assert first.closed
+
+    async def test_run_then_shutdown_closes_shared_connections(self, monkeypatch):
+        """Every shared pool is closed after the run, even when it fails."""
+        import core.glm_client as glm_client_module
+        import core.glm_mcp as glm_mcp_module
+
+        closed = []
+
+        async def record(name):
+            closed.append(name)
+
+        monkeypatch.setattr(glm_client_module, "shutdown_clients", lambda: record("api"))
+        monkeypatch.setattr(glm_client_module, "shutdown_web_client", lambda: record("web"))
+        monkeypatch.setattr(
+            glm_mcp_module, "shutdown_shared_http_client", lambda: record("mcp")
+        )
+
+        async def failing_run():
+            raise RuntimeError("agent failed")
+
+        with pytest.raises(RuntimeError):
+            await glm_client_module.run_then_shutdown(failing_run())
+
+        assert closed == ["api", "web", "mcp"]
+
+    def test_reset_conversation_keeps_system_prompt(self, monkeypatch, temp_dir):
+        """Resetting drops the exchange but keeps the system prompt."""
+        monkeypatch.setenv("ZHIPUAI_API_KEY", "test-key")
+        client = GLMAgentClient(
+            options=GLMAgentOptions(system_prompt="Be brief.", cwd=str(temp_dir))
+        )
+        client.messages.append({"role": "user", "content": "hi"})
+        client._serialized_history()
+        client.current_query = "hi"
+        client.turn_count = 2
+
+        client.reset_conversation()
+
+        assert client.messages == [{"role": "system", "content": "Be brief."}]
+        assert [json.loads(m) for m in client._serialized_history()] == client.messages
+        assert client.current_query is None
+        assert client.turn_count == 0
+
+
+class TestHttpTransport:
+    """Tests for the HTTP client handed to the OpenAI SDK."""
+
+    async def test_plain_httpx_client_on_older_sdk(self, monkeypatch):
+        """Without DefaultAsyncHttpxClient, a plain httpx client is used."""
+        import core.glm_client as glm_client_module
+        import httpx
+        import openai
+
+        monkeypatch.delattr(openai, "DefaultAsyncHttpxClient")
+
+        client = glm_client_module._create_httpx_client()
+        try:
+            assert type(client) is httpx.AsyncClient
+            assert client.follow_redirects
+        finally:
+            await client.aclose()
+
+    def test_aiohttp_backend_requires_extra(self, monkeypatch):
+        """Selecting aiohttp without the extra installed fails clearly."""
+        import core.glm_client as glm_client_module
+
+        monkeypatch.setattr(glm_client_module, "AIOHTTP_AVAILABLE", False)
+        monkeypatch.setenv("GLM_HTTP_BACKEND", "aiohttp")
+
+        with pytest.raises(ImportError, match=r"openai\[aiohttp\]"):
+            glm_client_module._create_openai_client("key", "https://example.invalid")
+
+
+class TestRequestKwargs:
+    """Tests for per-client request argument construction."""
+
+    @pytest.mark.parametrize(
+        "thinking_tokens, temperature",
+        [(None, 0.7), (0, 0.7), (4999, 0.7), (5000, 0.5), (10000, 0.3), (64000, 0.3)],
+    )
+    def test_temperature_from_thinking_budget(self, thinking_tokens, temperature):
+        """Larger thinking budgets map to lower temperatures."""
+        options = GLMAgentOptions(max_thinking_tokens=thinking_tokens)
+
+        assert options.get_temperature() == temperature
+
+    async def test_mcp_tools_included_after_enter(self, glm_client, monkeypatch):
+        """Tools added by MCP servers in __aenter__ are sent with requests."""
+        import core.glm_client as glm_client_module
+
+        mcp_tool = {"type": "function", "function": {"name": "mcp__srv__lookup"}}
+
+        class FakeMCPManager:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                pass
+
+            async def start_all(self):
+                pass
+
+            def get_all_tools(self):
+                return [mcp_tool]
+
+        monkeypatch.setattr(glm_client_module, "_create_openai_client", lambda *a: FakeOpenAI())
+        glm_client._mcp_manager = FakeMCPManager()
+        core_tool_count = len(glm_client._build_request_kwargs()["tools"])
+
+        async with glm_client:
+            tools = glm_client._build_request_kwargs()["tools"]
+
+        assert len(tools) == core_tool_count + 1
+        assert tools[-1] is mcp_tool
+
+    def test_history_not_copied_into_base_kwargs(self, glm_client):
+        """Each request sees the current history, not a snapshot."""
+        glm_client.client = SimpleNamespace()
+        glm_client.messages.append({"role": "user", "content": "hi"})
+
+        assert glm_client._build_request_kwargs()["messages"] is glm_client.messages
+        assert "messages" not in glm_client._base_kwargs
+
+
+class TestSerializedHistory:
+    """Tests for GLMAgentClient._serialized_history()."""
+
+    def test_serializes_each_message_once(self, glm_client):
+        """Existing entries are reused; only new messages are serialized."""
+        glm_client.messages.append({"role": "user", "content": "hi"})
+        first = glm_client._serialized_history()
+        cached_entry = first[0]
+
+        glm_client.messages.append({"role": "assistant", "content": "hello"})
+        second = glm_client._serialized_history()
+
+        assert second[0] is cached_entry
+        assert [json.loads(m) for m in second] == glm_client.messages
+
+    def test_resets_when_history_replaced(self, glm_client):
+        """Replacing the message list does not leave stale entries behind."""
+        glm_client.messages.extend(
+            [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+        )
+        glm_client._serialized_history()
+
+        glm_client.messages = [{"role": "user", "content": "c"}]
+
+        assert [json.loads(m) for m in glm_client._serialized_history()] == [
+            {"role": "user", "content": "c"}
+        ]
+
+
+class TestTrimHistory:
+    """Tests for trimming history to options.max_context_tokens."""
+
+    @pytest.fixture(autouse=True)
+    def fixed_token_counts(self, monkeypatch):
+        """Count every message as 10 tokens."""
+        import core.glm_client as glm_client_module
+
+        monkeypatch.setattr(glm_client_module, "_count_tokens", lambda text: 10)
+
+    def make_history(self):
+        return [
+            {"role": "system", "content": "sys"},
+            {"role": "user", "content": "task"},
+            {"role": "assistant", "content": "", "tool_calls": [{"id": "a"}]},
+            {"role": "tool", "content": "r1", "tool_call_id": "a"},
+            {"role": "assistant", "content": "", "tool_calls": [{"id": "b"}]},
+            {"role": "tool", "content": "r2", "tool_call_id": "b"},
+            {"role": "tool", "content": "r3", "tool_call_id": "b"},
+        ]
+
+    def test_under_budget_untouched(self, glm_client):
+        """History within the budget is left alone."""
+        glm_client.options.max_context_tokens = 1000
+        glm_client.messages = self.make_history()
+
+        glm_client._trim_history()
+
+        assert glm_client.messages == self.make_history()
+
+    def test_drops_whole_turns_and_keeps_system(self, glm_client):
+        """Oldest turns go first and tool results stay with their tool call."""
+        glm_client.options.max_context_tokens = 45
+        glm_client.messages = self.make_history()
+
+        glm_client._trim_history()
+
+        assert [m["content"] for m in glm_client.messages] == ["sys", "", "r2", "r3"]
+        # Cached serializations stay aligned with the trimmed history
+        assert [json.loads(m) for m in glm_client._serialized_history()] == glm_client.messages
+        assert glm_client._history_token_counts() == [10, 10, 10, 10]
+
+    def test_latest_turn_always_kept(self, glm_client):
+        """A budget smaller than the latest turn keeps that turn anyway."""
+        glm_client.options.max_context_tokens = 5
+        glm_client.messages = self.make_history()
+
+        glm_client._trim_history()
+
+        assert [m["content"] for m in glm_client.messages] == ["sys", "", "r2", "r3"]
+
+
+def make_chunk(content=None, tool_calls=None, finish_reason=None) -> SimpleNamespace:
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)]
+    )
+
+
+def make_tool_delta(index, call_id=None, name=None, arguments=None) -> SimpleNamespace:
+    return SimpleNamespace(
+        index=index,
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+class FakeCompletions:
+    """Returns queued results from chat.completions.create()."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.results.pop(0)
+
+
+def install_fake_api(client, results) -> FakeCompletions:
+    completions = FakeCompletions(results)
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return completions
+
+
+class TestStreaming:
+    """Tests for streamed responses."""
+
+    async def test_stream_yields_deltas_then_tool_calls(self, glm_client):
+        """Text deltas are yielded as they arrive and tool calls are reassembled."""
+
+        async def chunks():
+            yield make_chunk(content="Hel")
+            yield make_chunk(content="lo")
+            yield make_chunk(tool_calls=[make_tool_delta(0, "call_1", "Read", '{"file_')])
+            yield make_chunk(tool_calls=[make_tool_delta(0, arguments='path": "a"}')])
+            yield make_chunk(finish_reason="tool_calls")
+
+        completions = install_fake_api(glm_client, [chunks()])
+
+        items = [item async for item in glm_client._stream_glm_api()]
+
+        assert items[:2] == ["Hel", "lo"]
+        response = items[-1]
+        assert response.choices[0].finish_reason == "tool_calls"
+        tool_call = response.choices[0].message.tool_calls[0]
+        assert tool_call.id == "call_1"
+        assert json.loads(tool_call.function.arguments) == {"file_path": "a"}
+        assert completions.calls[0]["stream"] is True
+        assert glm_client.messages[-1]["content"] == "Hello"
+        assert glm_client.messages[-1]["tool_calls"][0]["function"]["name"] == "Read"
+
+
+class TestResponseCache:
+    """Tests for the opt-in response cache."""
+
+    async def test_identical_request_served_from_cache(self, glm_client):
+        """A repeated request with the same history skips the API."""
+        glm_client.options.enable_response_cache = True
+        completions = install_fake_api(glm_client, [make_response(content="answer")])
+        base_history = [{"role": "user", "content": "question"}]
+
+        glm_client.messages = list(base_history)
+        first = await glm_client._call_glm_api()
+
+        glm_client.messages = list(base_history)
+        second = await glm_client._call_glm_api()
+
+        assert second is first
+        assert len(completions.calls) == 1
+        assert glm_client.messages[-1] == {"role": "assistant", "content": "answer"}
+
+    async def test_cache_disabled_by_default(self, glm_client):
+        """Without the option every call reaches the API."""
+        completions = install_fake_api(
+            glm_client, [make_response(content="a"), make_response(content="b")]
+        )
+
+        for _ in range(2):
+            glm_client.messages = [{"role": "user", "content": "question"}]
+            await glm_client._call_glm_api()
+
+        assert len(completions.calls) == 2
+
+
+def make_completion(content: str):
+    from openai.types.chat import ChatCompletion
+
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "glm-4.7",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+    })
+
+
+class TestDiskResponseCache:
+    """Tests for options.response_cache_dir."""
+
+    async def test_response_reused_by_later_client(self, monkeypatch, temp_dir):
+        """A response stored by one client is served to another from disk."""
+        monkeypatch.setenv("ZHIPUAI_API_KEY", "test-key")
+        options = GLMAgentOptions(
+            system_prompt="Be brief.",
+            cwd=str(temp_dir),
+            response_cache_dir=str(temp_dir / "cache"),
+        )
+
+        first_client = GLMAgentClient(options=options)
+        first_calls = install_fake_api(first_client, [make_completion("4")])
+        await first_client.query("What is 2+2?")
+        first = await first_client._call_glm_api()
+
+        second_client = GLMAgentClient(options=options)
+        second_calls = install_fake_api(second_client, [])
+        await second_client.query("What is 2+2?")
+        second = await second_client._call_glm_api()
+
+        assert len(first_calls.calls) == 1
+        assert second_calls.calls == []
+        assert second.choices[0].message.content == "4"
+        assert second_client.messages[-1] == {"role": "assistant", "content": "4"}
+        assert first.choices[0].message.content == "4"
+
+    def test_environment_does_not_enable_cache(self, monkeypatch, temp_dir):
+        """GLM_RESPONSE_CACHE_DIR alone leaves production options uncached."""
+        monkeypatch.setenv("GLM_RESPONSE_CACHE_DIR", str(temp_dir / "cache"))
+
+        assert GLMAgentOptions().response_cache_dir is None
+
+    def test_unreadable_entry_ignored(self, temp_dir):
+        """A corrupt cache file counts as a miss."""
+        from core.glm_response_cache import DiskResponseCache
+
+        cache = DiskResponseCache(temp_dir)
+        cache.set("good", make_completion("ok"))
+        (temp_dir / "bad.json").write_text("{not json")
+
+        assert cache.get("good").choices[0].message.content == "ok"
+        assert cache.get("bad") is None
+        assert cache.get("missing") is None
+
+
+class TestRunMany:
+    """Tests for GLMAgentClient.run_many()."""
+
+    async def test_prompts_completed_in_order_without_touching_history(self, glm_client):
+        """Each prompt gets its own request; results keep prompt order."""
+
+        class EchoCompletions(FakeCompletions):
+            async def create(self, **kwargs):
+                self.calls.append(kwargs)
+                prompt = kwargs["messages"][-1]["content"]
+                await asyncio.sleep(0.01 if prompt == "first" else 0)
+                return make_response(content=f"re: {prompt}")
+
+        completions = EchoCompletions([])
+        glm_client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        glm_client.messages = [{"role": "system", "content": "sys"}]
+
+        results = await glm_client.run_many(["first", "second"])
+
+        assert [r.text for r in results] == ["re: first", "re: second"]
+        assert len(completions.calls) == 2
+        assert completions.calls[0]["messages"][0] == {"role": "system", "content": "sys"}
+        assert glm_client.messages == [{"role": "system", "content": "sys"}]
+
+
+class FlakyCompletions(FakeCompletions):
+    """Raises queued exceptions before returning results."""
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def connection_error():
+    import httpx
+    import openai
+
+    return openai.APIConnectionError(
+        request=httpx.Request("POST", "https://example.invalid")
+    )
+
+
+class TestRetries:
+    """Tests for retrying failed API requests."""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        import core.glm_client as glm_client_module
+
+        monkeypatch.setattr(glm_client_module, "_retry_delay", lambda attempt: 0)
+
+    async def test_connection_error_retried(self, glm_client):
+        """A transient connection failure is retried and then succeeds."""
+        completions = FlakyCompletions([connection_error(), make_response(content="ok")])
+        glm_client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        glm_client.messages = [{"role": "user", "content": "hi"}]
+
+        response = await glm_client._call_glm_api()
+
+        assert response.choices[0].message.content == "ok"
+        assert len(completions.calls) == 2
+
+    async def test_gives_up_after_max_attempts(self, glm_client):
+        """Persistent failures are raised once the attempts are used up."""
+        import core.glm_client as glm_client_module
+        import openai
+
+        errors = [connection_error() for _ in range(glm_client_module.API_MAX_ATTEMPTS)]
+        completions = FlakyCompletions(errors)
+        glm_client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        glm_client.messages = [{"role": "user", "content": "hi"}]
+
+        with pytest.raises(openai.APIConnectionError):
+            await glm_client._call_glm_api()
+        assert len(completions.calls) == glm_client_module.API_MAX_ATTEMPTS
+
+    async def test_timeout_not_retried(self, glm_client):
+        """SDK timeouts surface as TimeoutError without retrying."""
+        import httpx
+        import openai
+
+        completions = FlakyCompletions(
+            [openai.APITimeoutError(request=httpx.Request("POST", "https://example.invalid"))]
+        )
+        glm_client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        glm_client.messages = [{"role": "user", "content": "hi"}]
+
+        with pytest.raises(TimeoutError):
+            await glm_client._call_glm_api()
+        assert len(completions.calls) == 1
+        assert completions.calls[0]["timeout"] == 120.0
+
+    async def test_other_errors_not_retried(self, glm_client):
+        """Errors other than rate limits and connection failures fail fast."""
+        completions = FlakyCompletions([ValueError("bad request")])
+        glm_client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        glm_client.messages = [{"role": "user", "content": "hi"}]
+
+        with pytest.raises(ValueError):
+            await glm_client._call_glm_api()
+        assert len(completions.calls) == 1
+
+    @pytest.fixture
+    def sdk_client(self, monkeypatch):
+        """A GLM client on a real AsyncOpenAI whose HTTP requests go to a handler."""
+        import core.glm_client as glm_client_module
+        import httpx
+
+        def make(handler):
+            monkeypatch.setattr(
+                glm_client_module,
+                "_create_httpx_client",
+                lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+            monkeypatch.delenv("GLM_HTTP_BACKEND", raising=False)
+            monkeypatch.setenv("ZHIPUAI_API_KEY", "test-key")
+            client = GLMAgentClient(options=GLMAgentOptions(model="glm-4.7"))
+            client.client = glm_client_module._create_openai_client(
+                "test-key", "https://example.invalid/v4"
+            )
+            client.messages = [{"role": "user", "content": "hi"}]
+            return client
+
+        return make
+
+    async def test_timeout_surfaces_after_one_request(self, sdk_client):
+        """The SDK does not retry a timed-out request on its own."""
+        import httpx
+
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        client = sdk_client(handler)
+        try:
+            with pytest.raises(TimeoutError):
+                await client._call_glm_api()
+        finally:
+            await client.client.close()
+
+        assert len(attempts) == 1
+
+    async def test_one_request_per_attempt(self, sdk_client):
+        """Only the client's retry loop retries; the SDK adds no attempts."""
+        import core.glm_client as glm_client_module
+        import httpx
+        import openai
+
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            raise httpx.ConnectError("refused", request=request)
+
+        client = sdk_client(handler)
+        try:
+            with pytest.raises(openai.APIConnectionError):
+                await client._call_glm_api()
+        finally:
+            await client.client.close()
+
+        assert len(attempts) == glm_client_module.API_MAX_ATTEMPTS
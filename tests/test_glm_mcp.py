@@ -0,0 +1,507 @@
+"""
+Tests for the GLM MCP server manager.
+
+Stdio tests run a small Python script as the MCP server; other tests replace
+server start-up and discovery methods with fakes.
+"""
+
+import asyncio
+import json
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent / "apps" / "backend"
+sys.path.insert(0, str(backend_path))
+
+pytest.importorskip("httpx")
+
+from core.glm_mcp import MCPManager
+
+# Minimal stdio MCP server: answers tools/list and echoes tools/call text.
+# A call with "hold": true is answered only after the next request's response.
+# The unlisted "methods" tool returns every method received so far; "noisy"
+# writes to stderr and sends a notification before answering.
+FAKE_SERVER = textwrap.dedent(
+    """
+    import json
+    import sys
+
+    held = []
+    methods = []
+    for line in sys.stdin:
+        request = json.loads(line)
+        methods.append(request["method"])
+        if "id" not in request:
+            continue
+        method = request["method"]
+        params = request.get("params", {})
+        arguments = params.get("arguments", {})
+        if method == "initialize":
+            result = {"protocolVersion": params["protocolVersion"], "capabilities": {}}
+        elif method == "tools/list":
+            result = {"tools": [{"name": "echo", "description": "Echo text"}]}
+        elif method == "tools/call" and params["name"] == "methods":
+            result = {"content": [{"type": "text", "text": ",".join(methods)}]}
+        elif method == "tools/call" and params["name"] == "noisy":
+            for _ in range(20):
+                sys.stderr.write("log line " + "x" * 100 + "\\n")
+            sys.stderr.flush()
+            note = {"jsonrpc": "2.0", "method": "notifications/progress", "params": {}}
+            sys.stdout.write(json.dumps(note) + "\\n")
+            result = {"content": [{"type": "text", "text": "done"}]}
+        elif method == "tools/call":
+            result = {"content": [{"type": "text", "text": arguments["text"]}]}
+        else:
+            result = {}
+        response = {"jsonrpc": "2.0", "id": request["id"], "result": result}
+        if arguments.get("hold"):
+            held.append(response)
+            continue
+        for message in [response] + held:
+            sys.stdout.write(json.dumps(message) + "\\n")
+        held.clear()
+        sys.stdout.flush()
+    """
+)
+
+
+@pytest.fixture
+def fake_server_config(temp_dir: Path) -> dict:
+    """Config for a stdio MCP server running FAKE_SERVER."""
+    script = temp_dir / "fake_mcp_server.py"
+    script.write_text(FAKE_SERVER)
+    return {"command": sys.executable, "args": [str(script)]}
+
+
+@pytest.fixture
+def manager() -> MCPManager:
+    """An MCP manager with three stdio servers configured."""
+    mgr = MCPManager()
+    for name in ("one", "two", "three"):
+        mgr.add_server(name, {"command": "true", "args": []})
+    return mgr
+
+
+class TestStartAll:
+    """Tests for MCPManager.start_all()."""
+
+    async def test_servers_start_concurrently(self, manager, monkeypatch):
+        """All servers start together instead of one after another."""
+        running = 0
+        peak = 0
+
+        async def fake_start(server):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            server.tools = [{"name": "tool"}]
+            running -= 1
+
+        monkeypatch.setattr(manager, "_start_stdio_server", fake_start)
+
+        await manager.start_all()
+
+        assert peak == 3
+        assert len(manager.get_all_tools()) == 3
+
+    async def test_failing_server_does_not_stop_others(self, manager, monkeypatch):
+        """One server raising leaves the remaining servers started."""
+
+        async def fake_start(server):
+            if server.name == "two":
+                raise RuntimeError("boom")
+            server.tools = [{"name": "tool"}]
+
+        monkeypatch.setattr(manager, "_start_stdio_server", fake_start)
+
+        await manager.start_all()
+
+        assert manager.get_tool_names() == ["mcp__one__tool", "mcp__three__tool"]
+
+    async def test_missing_command_disables_server(self, manager, monkeypatch):
+        """Commands are resolved on add; unknown ones are never spawned."""
+        started = []
+
+        async def fake_start(server):
+            started.append(server.name)
+
+        monkeypatch.setattr(manager, "_start_stdio_server", fake_start)
+        manager.add_server("broken", {"command": "no-such-mcp-server-xyz"})
+
+        await manager.start_all()
+
+        assert manager.servers["broken"].disabled
+        assert Path(manager.servers["one"].command).is_absolute()
+        assert sorted(started) == ["one", "three", "two"]
+
+
+class TestStdioServer:
+    """Tests against a real stdio MCP server subprocess."""
+
+    async def test_discover_and_call(self, fake_server_config):
+        """Tools are discovered and calls return the server's text result."""
+        async with MCPManager() as mgr:
+            mgr.add_server("fake", fake_server_config)
+            await mgr.start_all()
+
+            assert mgr.get_tool_names() == ["mcp__fake__echo"]
+            result = await mgr.execute_tool("mcp__fake__echo", {"text": "hello"})
+
+        assert result == "hello"
+        assert mgr.servers["fake"].process is None
+
+    async def test_initialize_handshake(self, fake_server_config):
+        """The server is initialized before tools are listed."""
+        async with MCPManager() as mgr:
+            mgr.add_server("fake", fake_server_config)
+            await mgr.start_all()
+
+            result = await mgr.execute_tool("mcp__fake__methods", {})
+
+        assert result.split(",")[:3] == ["initialize", "notifications/initialized", "tools/list"]
+
+    async def test_stderr_and_notifications_are_logged(self, fake_server_config, caplog):
+        """Server stderr and notifications are logged, not mistaken for responses."""
+        caplog.set_level("DEBUG", logger="core.glm_mcp")
+        async with MCPManager() as mgr:
+            mgr.add_server("fake", fake_server_config)
+            await mgr.start_all()
+
+            result = await mgr.execute_tool("mcp__fake__noisy", {})
+            echoed = await mgr.execute_tool("mcp__fake__echo", {"text": "after"})
+            await asyncio.sleep(0.05)
+
+        assert (result, echoed) == ("done", "after")
+        assert "MCP fake notification: notifications/progress" in caplog.text
+        assert "MCP fake stderr: log line" in caplog.text
+
+    async def test_large_result(self, fake_server_config):
+        """Results larger than asyncio's default line limit are read intact."""
+        big = "x" * 200_000
+        async with MCPManager() as mgr:
+            mgr.add_server("fake", fake_server_config)
+            await mgr.start_all()
+
+            result = await mgr.execute_tool("mcp__fake__echo", {"text": big})
+
+        assert result == big
+
+    async def test_concurrent_calls_matched_by_id(self, fake_server_config):
+        """Out-of-order responses are routed to the request that sent them."""
+        async with MCPManager() as mgr:
+            mgr.add_server("fake", fake_server_config)
+            await mgr.start_all()
+
+            held_call = asyncio.create_task(
+                mgr.execute_tool("mcp__fake__echo", {"text": "first", "hold": True})
+            )
+            await asyncio.sleep(0.05)
+            second = await mgr.execute_tool("mcp__fake__echo", {"text": "second"})
+            first = await held_call
+
+        assert (first, second) == ("first", "second")
+
+
+class TestProcessPool:
+    """Tests for sharing stdio server processes between managers."""
+
+    async def test_identical_configs_share_one_process(self, fake_server_config):
+        """Two managers with the same server config use one process."""
+        async with MCPManager() as first, MCPManager() as second:
+            first.add_server("fake", fake_server_config)
+            second.add_server("other_name", fake_server_config)
+            await asyncio.gather(first.start_all(), second.start_all())
+
+            process = first.servers["fake"].process
+            assert second.servers["other_name"].process is process
+            assert second.get_tool_names() == ["mcp__other_name__echo"]
+
+            await first.stop_all()
+            # Still in use by the second manager
+            assert process.returncode is None
+            assert await second.execute_tool("mcp__other_name__echo", {"text": "hi"}) == "hi"
+
+        assert process.returncode is not None
+
+    async def test_no_share_gets_private_process(self, fake_server_config):
+        """no_share servers never join the shared process."""
+        async with MCPManager() as first, MCPManager() as second:
+            first.add_server("fake", fake_server_config)
+            second.add_server("fake", {**fake_server_config, "no_share": True})
+            await first.start_all()
+            await second.start_all()
+
+            assert first.servers["fake"].process is not second.servers["fake"].process
+
+    async def test_dead_value_closed_by_last_old_subscriber(self):
+        """A replaced dead value is closed once its old subscribers release it."""
+        from core.glm_mcp_pool import MCPProcessPool
+
+        pool = MCPProcessPool()
+        values = iter([{"alive": True}, {"alive": True}])
+        closed = []
+
+        async def factory():
+            return next(values)
+
+        async def closer(value):
+            closed.append(value)
+
+        def is_alive(value):
+            return value["alive"]
+
+        old = await pool.acquire("key", 1, factory, is_alive)
+        await pool.acquire("key", 2, factory, is_alive)
+        old["alive"] = False
+
+        new = await pool.acquire("key", 3, factory, is_alive)
+        assert new is not old
+        assert pool.subscriber_count("key") == 1
+
+        await pool.release("key", 1, closer)
+        assert closed == []
+        await pool.release("key", 2, closer)
+        assert closed == [old]
+
+        await pool.release("key", 3, closer)
+        assert closed == [old, new]
+
+    def test_config_hash_ignores_env_order(self):
+        """Environment order does not matter; argument order does."""
+        from core.glm_mcp_pool import config_hash
+
+        assert config_hash("npx", ["a", "b"], {"X": "1", "Y": "2"}) == config_hash(
+            "npx", ["a", "b"], {"Y": "2", "X": "1"}
+        )
+        assert config_hash("npx", ["a", "b"], {}) != config_hash("npx", ["b", "a"], {})
+
+
+class TestToolCache:
+    """Tests for cached GLM tool definitions."""
+
+    def test_definitions_reused_until_servers_change(self, manager):
+        """Repeated calls reuse definitions; add_server rebuilds them."""
+        manager.servers["one"].tools = [{"name": "lookup", "description": "Find"}]
+        manager._invalidate_tools()
+
+        first = manager.get_all_tools()
+        second = manager.get_all_tools()
+
+        assert first == second
+        assert first[0] is second[0]
+        assert first[0]["function"]["name"] == "mcp__one__lookup"
+
+        manager.add_server("four", {"command": "true"})
+        assert manager.get_all_tools()[0] is not first[0]
+
+    def test_returned_list_is_a_copy(self, manager):
+        """Mutating the returned list does not affect later calls."""
+        manager.servers["one"].tools = [{"name": "lookup"}]
+        manager._invalidate_tools()
+
+        manager.get_all_tools().clear()
+
+        assert manager.get_tool_names() == ["mcp__one__lookup"]
+        assert len(manager.get_all_tools()) == 1
+
+    async def test_execute_uses_tool_index(self, manager, monkeypatch):
+        """Discovered tools dispatch through the index, including '__' names."""
+        calls = []
+
+        async def fake_execute(server, tool_name, arguments):
+            calls.append((server.name, tool_name))
+            return "ok"
+
+        monkeypatch.setattr(manager, "_execute_stdio_tool", fake_execute)
+        manager.servers["two"].tools = [{"name": "find__all"}]
+        manager._invalidate_tools()
+
+        await manager.execute_tool("mcp__two__find__all", {})
+
+        assert manager._tool_index["mcp__two__find__all"] == (manager.servers["two"], "find__all")
+        assert calls == [("two", "find__all")]
+        with pytest.raises(ValueError):
+            await manager.execute_tool("mcp__missing__tool", {})
+
+
+class TestExecuteBatch:
+    """Tests for MCPManager.execute_tools_batch()."""
+
+    async def test_results_in_call_order(self, fake_server_config):
+        """Calls are pipelined on one server and returned in request order."""
+        async with MCPManager() as mgr:
+            mgr.add_server("fake", fake_server_config)
+            await mgr.start_all()
+
+            results = await mgr.execute_tools_batch([
+                ("mcp__fake__echo", {"text": "first", "hold": True}),
+                ("mcp__fake__echo", {"text": "second"}),
+                ("mcp__missing__echo", {"text": "third"}),
+            ])
+
+        assert results[:2] == [("first", False), ("second", False)]
+        assert "MCP server not found" in results[2][0]
+        assert results[2][1] is True
+
+    def test_read_only_tools(self, manager):
+        """Only discovered allowlisted tools count as read-only."""
+        manager.servers["one"].tools = [{"name": "get-library-docs"}, {"name": "create-issue"}]
+        manager._invalidate_tools()
+
+        assert manager.is_read_only_tool("mcp__one__get-library-docs")
+        assert not manager.is_read_only_tool("mcp__one__create-issue")
+        assert not manager.is_read_only_tool("mcp__two__get-library-docs")
+
+
+class TestHttpServer:
+    """Tests for HTTP MCP servers over the shared HTTP client."""
+
+    @pytest.fixture
+    def mock_http(self, monkeypatch):
+        """Route the shared HTTP client to an in-process JSON-RPC handler."""
+        import json
+        import weakref
+
+        import core.glm_mcp as glm_mcp_module
+        import httpx
+
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            requests.append(body)
+            if body["method"] == "tools/list":
+                result = {"tools": [{"name": "search"}]}
+            else:
+                query = body["params"]["arguments"]["q"]
+                result = {"content": [{"type": "text", "text": f"found {query}"}]}
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+        real_client = httpx.AsyncClient
+
+        def make_client(**kwargs):
+            return real_client(transport=httpx.MockTransport(handler))
+
+        monkeypatch.setattr(httpx, "AsyncClient", make_client)
+        monkeypatch.setattr(glm_mcp_module, "_HTTP_CLIENTS", weakref.WeakKeyDictionary())
+        return requests
+
+    async def test_managers_share_http_client(self, mock_http):
+        """Every manager on a loop posts through the same client."""
+        from core.glm_mcp import _get_http_client, shutdown_shared_http_client
+
+        config = {"type": "http", "url": "https://mcp.example/rpc"}
+        async with MCPManager() as first:
+            first.add_server("remote", config)
+            await first.start_all()
+            client = _get_http_client()
+
+        async with MCPManager() as second:
+            second.add_server("remote", config)
+            await second.start_all()
+            result = await second.execute_tool("mcp__remote__search", {"q": "docs"})
+            assert _get_http_client() is client
+
+        assert result == "found docs"
+        assert not client.is_closed
+        await shutdown_shared_http_client()
+        assert client.is_closed
+
+
+    async def test_batch_calls_overlap(self, monkeypatch):
+        """Batched calls to an HTTP server are in flight at the same time."""
+        import weakref
+
+        import core.glm_mcp as glm_mcp_module
+        import httpx
+        from core.glm_mcp import shutdown_shared_http_client
+
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            body = json.loads(request.content)
+            if body["method"] == "tools/list":
+                result = {"tools": [{"name": "search"}]}
+            else:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                query = body["params"]["arguments"]["q"]
+                result = {"content": [{"type": "text", "text": f"found {query}"}]}
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx, "AsyncClient", lambda **kwargs: real_client(transport=httpx.MockTransport(handler))
+        )
+        monkeypatch.setattr(glm_mcp_module, "_HTTP_CLIENTS", weakref.WeakKeyDictionary())
+
+        async with MCPManager() as mgr:
+            mgr.add_server("remote", {"type": "http", "url": "https://mcp.example/rpc"})
+            await mgr.start_all()
+            results = await mgr.execute_tools_batch(
+                [("mcp__remote__search", {"q": str(i)}) for i in range(4)]
+            )
+        await shutdown_shared_http_client()
+
+        assert results == [(f"found {i}", False) for i in range(4)]
+        assert peak == 4
+
+
+class TestResultCache:
+    """Tests for caching results of read-only MCP tools."""
+
+    @pytest.fixture
+    def counting_manager(self, manager, monkeypatch):
+        calls = []
+
+        async def fake_execute(server, tool_name, arguments):
+            calls.append((tool_name, arguments))
+            if arguments.get("fail"):
+                return '{"error": "boom"}'
+            return f"result {len(calls)}"
+
+        monkeypatch.setattr(manager, "_execute_stdio_tool", fake_execute)
+        return manager, calls
+
+    async def test_cacheable_tool_reused(self, counting_manager):
+        """Identical calls to an allowlisted tool hit the server once."""
+        manager, calls = counting_manager
+
+        first = await manager.execute_tool("mcp__one__get-library-docs", {"id": "/a", "n": 1})
+        second = await manager.execute_tool("mcp__one__get-library-docs", {"n": 1, "id": "/a"})
+
+        assert first == second == "result 1"
+        assert len(calls) == 1
+
+    async def test_other_tools_and_errors_not_cached(self, counting_manager):
+        """Tools outside the allowlist and error results always re-run."""
+        manager, calls = counting_manager
+
+        await manager.execute_tool("mcp__one__create-issue", {"title": "x"})
+        await manager.execute_tool("mcp__one__create-issue", {"title": "x"})
+        await manager.execute_tool("mcp__one__get-library-docs", {"fail": True})
+        await manager.execute_tool("mcp__one__get-library-docs", {"fail": True})
+
+        assert len(calls) == 4
+
+    async def test_expired_entries_refetched(self, counting_manager, monkeypatch):
+        """Results older than the TTL are fetched again."""
+        import core.glm_mcp as glm_mcp_module
+
+        manager, calls = counting_manager
+        await manager.execute_tool("mcp__one__get-library-docs", {"id": "/a"})
+
+        monkeypatch.setattr(glm_mcp_module, "MCP_RESULT_CACHE_TTL_SECONDS", 0.0)
+        await manager.execute_tool("mcp__one__get-library-docs", {"id": "/a"})
+
+        assert len(calls) == 2
+
@@ -0,0 +1,604 @@
+"""
+Tests for the GLM core tool registry and executors (core.glm_tools).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent / "apps" / "backend"
+sys.path.insert(0, str(backend_path))
+
+from core.glm_tools.bash import execute_bash
+from core.glm_tools.filesystem import execute_grep
+from core.glm_tools.registry import get_tool_definitions, get_tool_executor
+
+
+class TestToolRegistry:
+    """Tests for tool definitions and executor lookup."""
+
+    def test_definitions_follow_allowed_order(self):
+        """Only allowed tools are returned, in the requested order."""
+        tools = get_tool_definitions(["Bash", "Read", "NotATool"])
+
+        assert [t["function"]["name"] for t in tools] == ["Bash", "Read"]
+
+    def test_repeated_names_included_once(self):
+        """A tool listed twice is only defined once."""
+        tools = get_tool_definitions(["Read", "Bash", "Read"])
+
+        assert [t["function"]["name"] for t in tools] == ["Read", "Bash"]
+
+    def test_definitions_cached_but_list_is_fresh(self):
+        """Repeated lookups share definitions but return independent lists."""
+        first = get_tool_definitions(["Read", "Write"])
+        second = get_tool_definitions(("Read", "Write"))
+
+        assert first is not second
+        assert first[0] is second[0]
+
+        first.append({"type": "function"})
+        assert len(get_tool_definitions(["Read", "Write"])) == 2
+
+    def test_definitions_shared_across_combinations(self):
+        """Different tool combinations reuse the same module-level definitions."""
+        from core.glm_tools.registry import ALL_TOOLS
+
+        assert get_tool_definitions(["Read"])[0] is ALL_TOOLS["Read"]
+        assert get_tool_definitions(["Bash", "Read"])[1] is ALL_TOOLS["Read"]
+
+    def test_unknown_executor_is_none(self):
+        """Unknown tool names have no executor."""
+        assert get_tool_executor("Read") is not None
+        assert get_tool_executor("NotATool") is None
+
+
+class TestValidatePath:
+    """Tests for validate_path()."""
+
+    def test_paths_inside_cwd_allowed(self, temp_dir: Path):
+        """Relative and absolute paths inside cwd resolve normally."""
+        from core.glm_tools.filesystem import validate_path
+
+        assert validate_path("a/b.txt", temp_dir) == temp_dir.resolve() / "a" / "b.txt"
+        assert validate_path(str(temp_dir / "c.txt"), temp_dir) == temp_dir.resolve() / "c.txt"
+
+    def test_sibling_with_common_prefix_rejected(self, temp_dir: Path):
+        """A sibling directory whose name extends cwd's is outside it."""
+        from core.glm_tools.filesystem import validate_path
+
+        cwd = temp_dir / "proj"
+        cwd.mkdir()
+
+        assert validate_path(".", cwd) == cwd.resolve()
+        with pytest.raises(ValueError):
+            validate_path(str(temp_dir / "project2" / "x.py"), cwd)
+
+    def test_escape_rejected(self, temp_dir: Path):
+        """Paths leaving cwd raise ValueError, also on repeated calls."""
+        from core.glm_tools.filesystem import validate_path
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="escapes working directory"):
+                validate_path("../outside.txt", temp_dir)
+
+    async def test_context_cwd_used_by_default(self, temp_dir: Path):
+        """Without an explicit cwd, tools use the context's tool_cwd."""
+        from core.glm_tools.filesystem import execute_glob, tool_cwd, validate_path
+
+        (temp_dir / "a.py").write_text("")
+        token = tool_cwd.set(temp_dir)
+        try:
+            assert validate_path("a.py") == temp_dir.resolve() / "a.py"
+            assert (await execute_glob({"pattern": "*.py"}))["files"] == ["a.py"]
+            assert (await execute_grep({"pattern": "x"}))["matches"] == []
+        finally:
+            tool_cwd.reset(token)
+
+
+class TestReadTool:
+    """Tests for execute_read()."""
+
+    async def test_utf8_with_newline_translation(self, temp_dir: Path):
+        """UTF-8 files are decoded with universal newlines."""
+        from core.glm_tools.filesystem import execute_read
+
+        (temp_dir / "a.txt").write_bytes(b"h\xc3\xa9llo\r\nworld\rend\n")
+
+        result = await execute_read({"file_path": "a.txt"}, temp_dir)
+
+        assert result["content"] == "héllo\nworld\nend\n"
+
+    async def test_non_utf8_falls_back_to_latin1(self, temp_dir: Path):
+        """Bytes that aren't valid UTF-8 are decoded as latin-1."""
+        from core.glm_tools.filesystem import execute_read
+
+        (temp_dir / "b.txt").write_bytes(b"caf\xe9\n")
+
+        result = await execute_read({"file_path": "b.txt"}, temp_dir)
+
+        assert result["content"] == "café\n"
+
+
+class TestWriteTool:
+    """Tests for execute_write()."""
+
+    async def test_writes_utf8_and_counts_bytes(self, temp_dir: Path):
+        """Content is written as UTF-8 and its encoded size reported."""
+        from core.glm_tools.filesystem import execute_write
+
+        result = await execute_write(
+            {"file_path": "new/dir/f.txt", "content": "héllo\n"}, temp_dir
+        )
+
+        assert result["bytes_written"] == 7
+        assert (temp_dir / "new" / "dir" / "f.txt").read_text(encoding="utf-8") == "héllo\n"
+
+
+class TestEditTool:
+    """Tests for execute_edit()."""
+
+    @pytest.mark.parametrize(
+        "original, old, new, expected",
+        [
+            (b"x = old_name\ny = 2\n", "old_name", "new_name", b"x = new_name\ny = 2\n"),
+            (b"a a\n", "a", "b", b"b b\n"),
+            (b"short\n", "short", "much longer", b"much longer\n"),
+            (b"crlf\r\nline\r\n", "line", "LINE", b"crlf\nLINE\n"),
+            (b"caf\xe9 cafe\n", "cafe", "CAFE", b"caf\xc3\xa9 CAFE\n"),
+        ],
+    )
+    async def test_replacements(self, temp_dir: Path, original, old, new, expected):
+        """In-place and rewritten edits leave the same bytes on disk."""
+        from core.glm_tools.filesystem import execute_edit
+
+        (temp_dir / "f.txt").write_bytes(original)
+
+        result = await execute_edit(
+            {"file_path": "f.txt", "old_string": old, "new_string": new}, temp_dir
+        )
+
+        assert result["success"] is True
+        assert (temp_dir / "f.txt").read_bytes() == expected
+
+    @pytest.mark.parametrize("old, error", [("missing", "String not found"), ("", "must not be empty")])
+    async def test_unmatched_old_string_leaves_file(self, temp_dir: Path, old, error):
+        """A missing or empty old_string is an error and the file is untouched."""
+        from core.glm_tools.filesystem import execute_edit
+
+        (temp_dir / "f.txt").write_bytes(b"abc\n")
+
+        result = await execute_edit(
+            {"file_path": "f.txt", "old_string": old, "new_string": "x"}, temp_dir
+        )
+
+        assert error in result["error"]
+        assert (temp_dir / "f.txt").read_bytes() == b"abc\n"
+
+
+class TestGlobTool:
+    """Tests for execute_glob()."""
+
+    async def test_relative_sorted_matches(self, temp_dir: Path):
+        """Matches are relative to cwd and sorted; hidden files are skipped."""
+        from core.glm_tools.filesystem import execute_glob
+
+        (temp_dir / "pkg" / "sub").mkdir(parents=True)
+        (temp_dir / ".hidden").mkdir()
+        for name in ("pkg/b.py", "pkg/sub/a.py", "top.py", ".hidden/x.py", "notes.txt"):
+            (temp_dir / name).write_text("")
+
+        result = await execute_glob({"pattern": "**/*.py"}, temp_dir)
+
+        assert result["files"] == ["pkg/b.py", "pkg/sub/a.py", "top.py"]
+
+    async def test_symlinks_outside_cwd_skipped(self, temp_dir: Path):
+        """Symlinked files and directories pointing outside cwd are dropped."""
+        from core.glm_tools.filesystem import execute_glob
+
+        cwd = temp_dir / "project"
+        outside = temp_dir / "outside"
+        cwd.mkdir()
+        outside.mkdir()
+        (outside / "secret.py").write_text("")
+        (cwd / "real.py").write_text("")
+        (cwd / "leak.py").symlink_to(outside / "secret.py")
+        (cwd / "linked_dir").symlink_to(outside, target_is_directory=True)
+
+        result = await execute_glob({"pattern": "**/*.py"}, cwd)
+
+        assert result["files"] == ["real.py"]
+
+    async def test_noise_directories_excluded(self, temp_dir: Path):
+        """Dependency and build directories are skipped unless named in the pattern."""
+        from core.glm_tools.filesystem import execute_glob
+
+        for name in ("src/app.js", "node_modules/dep/index.js", "build/app.js"):
+            (temp_dir / name).parent.mkdir(parents=True, exist_ok=True)
+            (temp_dir / name).write_text("")
+
+        result = await execute_glob({"pattern": "**/*.js"}, temp_dir)
+        assert result["files"] == ["src/app.js"]
+
+        result = await execute_glob({"pattern": "build/**/*.js"}, temp_dir)
+        assert result["files"] == ["build/app.js"]
+
+
+class TestGrepTool:
+    """Tests for execute_grep()."""
+
+    @pytest.fixture(autouse=True)
+    def python_search(self, monkeypatch):
+        """Exercise the Python search even where ripgrep is installed."""
+        monkeypatch.setattr("core.glm_tools.filesystem.RG_PATH", None)
+
+    async def test_matches_with_line_numbers(self, temp_dir: Path):
+        """Matching lines are reported with their file and line number."""
+        (temp_dir / "a.py").write_text("import os\nx = 1\nimport sys\n")
+
+        result = await execute_grep({"pattern": r"^import \w+"}, cwd=temp_dir)
+
+        assert [(m["file"], m["line"], m["content"]) for m in result["matches"]] == [
+            ("a.py", 1, "import os"),
+            ("a.py", 3, "import sys"),
+        ]
+
+    @pytest.mark.parametrize(
+        "pattern, lines",
+        [
+            (r"foo\Z", [1, 3]),
+            (r"foo$", [1, 3]),
+            (r"foo[^;]", []),
+            (r"foo\s", []),
+        ],
+    )
+    @pytest.mark.parametrize("mmap_threshold", [0, 10**9])
+    async def test_line_terminator_not_searched(
+        self, temp_dir: Path, monkeypatch, pattern, lines, mmap_threshold
+    ):
+        """Patterns see each line without its newline, streamed or mapped."""
+        monkeypatch.setattr("core.glm_tools.filesystem.GREP_MMAP_THRESHOLD", mmap_threshold)
+        (temp_dir / "a.py").write_text("x = foo\nfoo;\nfoo\n")
+
+        result = await execute_grep({"pattern": pattern}, cwd=temp_dir)
+
+        assert [m["line"] for m in result["matches"]] == lines
+
+    async def test_per_file_match_limit(self, temp_dir: Path):
+        """At most 10 matches are reported per file."""
+        (temp_dir / "many.py").write_text("hit\n" * 50)
+        (temp_dir / "one.py").write_text("miss\nhit\n")
+
+        result = await execute_grep({"pattern": "hit"}, cwd=temp_dir)
+
+        files = [m["file"] for m in result["matches"]]
+        assert files.count("many.py") == 10
+        assert files.count("one.py") == 1
+
+    @pytest.mark.parametrize(
+        "pattern, case_sensitive, line",
+        [
+            ("foo?bar", True, "fobar"),
+            ("abc|xyz", True, "xyz"),
+            (r"def\s+run", True, "def   run():"),
+            ("HELLO world", False, "Hello World"),
+        ],
+    )
+    async def test_literal_prefilter_keeps_matches(self, temp_dir: Path, pattern, case_sensitive, line):
+        """Skipping lines by required literal never drops a real match."""
+        (temp_dir / "a.py").write_text(f"nothing here\n{line}\n")
+
+        result = await execute_grep(
+            {"pattern": pattern, "case_sensitive": case_sensitive}, cwd=temp_dir
+        )
+
+        assert [m["line"] for m in result["matches"]] == [2]
+
+    async def test_files_reported_in_glob_order(self, temp_dir: Path):
+        """Files searched concurrently are still reported in glob order."""
+        from core.glm_tools.filesystem import execute_glob
+
+        for i in range(20):
+            (temp_dir / f"f{i}.py").write_text("hit\n" * (i % 3 + 1))
+
+        result = await execute_grep({"pattern": "hit"}, cwd=temp_dir)
+        globbed = (await execute_glob({"pattern": "**/*.py"}, temp_dir))["files"]
+
+        reported = list(dict.fromkeys(m["file"] for m in result["matches"]))
+        assert reported == [str(f) for f in globbed]
+
+    async def test_large_file_memory_mapped(self, temp_dir: Path, monkeypatch):
+        """Large files give the same matches through the mmap path."""
+        import core.glm_tools.filesystem as filesystem_module
+
+        lines = [f"line {i}" for i in range(1, 200)]
+        lines[9] = "def target_one():\r"
+        lines[150] = "    return target_two  # é"
+        lines[160] = "target_three is not at the start"
+        (temp_dir / "big.py").write_text("\n".join(lines) + "\n")
+        args = {"pattern": r"^\s*(def|return) target_\w+"}
+
+        streamed = await execute_grep(args, cwd=temp_dir)
+        monkeypatch.setattr(filesystem_module, "GREP_MMAP_THRESHOLD", 0)
+        mapped = await execute_grep(args, cwd=temp_dir)
+
+        assert [m["line"] for m in mapped["matches"]] == [10, 151]
+        assert mapped["matches"] == streamed["matches"]
+
+    async def test_carriage_return_lines_same_in_both_paths(self, temp_dir: Path, monkeypatch):
+        """Lone \\r ends a line whether the file is streamed or mapped."""
+        import core.glm_tools.filesystem as filesystem_module
+
+        (temp_dir / "cr.txt").write_bytes(
+            b"first\rtarget one\rmiddle\r\r\ntarget two\r\nx\ntarget three"
+        )
+        args = {"pattern": "target \\w+", "file_pattern": "*.txt"}
+
+        streamed = await execute_grep(args, cwd=temp_dir)
+        monkeypatch.setattr(filesystem_module, "GREP_MMAP_THRESHOLD", 0)
+        mapped = await execute_grep(args, cwd=temp_dir)
+
+        assert [(m["line"], m["content"]) for m in streamed["matches"]] == [
+            (2, "target one"), (5, "target two"), (7, "target three"),
+        ]
+        assert mapped["matches"] == streamed["matches"]
+
+    async def test_non_files_skipped(self, temp_dir: Path):
+        """Directories matched by the file pattern are not searched."""
+        (temp_dir / "pkg.py").mkdir()
+        (temp_dir / "pkg.py" / "mod.py").write_text("hit\n")
+
+        result = await execute_grep({"pattern": "hit", "file_pattern": "**/*.py"}, cwd=temp_dir)
+
+        assert [m["file"] for m in result["matches"]] == ["pkg.py/mod.py"]
+        assert result["files_searched"] == 2
+
+    @pytest.mark.parametrize("mmap_threshold", [0, 10**9])
+    async def test_binary_files_skipped(self, temp_dir: Path, monkeypatch, mmap_threshold):
+        """Files with a NUL byte near the start aren't searched."""
+        import core.glm_tools.filesystem as filesystem_module
+
+        monkeypatch.setattr(filesystem_module, "GREP_MMAP_THRESHOLD", mmap_threshold)
+        (temp_dir / "blob.bin").write_bytes(b"\x89PNG\x00\x00 needle\n")
+        (temp_dir / "text.txt").write_text("needle\n")
+
+        result = await execute_grep({"pattern": "needle", "file_pattern": "*"}, cwd=temp_dir)
+
+        assert [m["file"] for m in result["matches"]] == ["text.txt"]
+
+    async def test_compiled_pattern_reused(self, temp_dir: Path):
+        """Repeated searches with the same pattern compile it once."""
+        from core.glm_tools.filesystem import _compile
+
+        (temp_dir / "a.py").write_text("x = 1\n")
+        _compile.cache_clear()
+
+        await execute_grep({"pattern": "x ="}, cwd=temp_dir)
+        await execute_grep({"pattern": "x ="}, cwd=temp_dir)
+
+        assert _compile.cache_info().hits == 1
+
+    async def test_invalid_pattern(self, temp_dir: Path):
+        """A malformed regex is reported as an error."""
+        result = await execute_grep({"pattern": "(unclosed"}, cwd=temp_dir)
+
+        assert "Invalid regex pattern" in result["error"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX shell commands")
+class TestRipgrepSearch:
+    """Tests for the ripgrep path of execute_grep()."""
+
+    def test_json_output_parsed(self):
+        """Matches are sorted by file and line; non-UTF-8 lines are decoded."""
+        from core.glm_tools.filesystem import _parse_rg_json
+
+        output = b"\n".join([
+            b'{"type":"begin","data":{"path":{"text":"b.py"}}}',
+            b'{"type":"match","data":{"path":{"text":"b.py"},"lines":{"text":"  hit\\n"},"line_number":3}}',
+            b'{"type":"match","data":{"path":{"text":"a.py"},"lines":{"bytes":"aGl0/w=="},"line_number":7}}',
+            b'{"type":"summary","data":{"stats":{"searches":4}}}',
+        ])
+
+        matches, files_searched = _parse_rg_json(output)
+
+        assert [(m["file"], m["line"], m["content"]) for m in matches] == [
+            ("a.py", 7, "hit"),
+            ("b.py", 3, "hit"),
+        ]
+        assert files_searched == 4
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")
+    async def test_failure_falls_back_to_python(self, temp_dir: Path, monkeypatch):
+        """When ripgrep exits with an error the Python search is used."""
+        fake_rg = temp_dir / "rg"
+        fake_rg.write_text("#!/bin/sh\nexit 2\n")
+        fake_rg.chmod(0o755)
+        monkeypatch.setattr("core.glm_tools.filesystem.RG_PATH", str(fake_rg))
+        (temp_dir / "a.py").write_text("hit\n")
+
+        result = await execute_grep({"pattern": "hit"}, cwd=temp_dir)
+
+        assert [m["file"] for m in result["matches"]] == ["a.py"]
+
+
+class TestBashTool:
+    """Tests for execute_bash() (no security profile)."""
+
+    async def test_runs_command_in_cwd(self, temp_dir: Path):
+        """Output, exit code and working directory are reported."""
+        result = await execute_bash({"command": "pwd"}, cwd=temp_dir)
+
+        assert result["exit_code"] == 0
+        assert result["stdout"].strip() == str(temp_dir.resolve())
+
+    async def test_inherits_current_environment(self, temp_dir: Path, monkeypatch):
+        """Variables set after import are visible to the command."""
+        monkeypatch.setenv("GLM_BASH_TEST_VAR", "visible")
+
+        result = await execute_bash({"command": "echo $GLM_BASH_TEST_VAR"}, cwd=temp_dir)
+
+        assert result["stdout"].strip() == "visible"
+
+    async def test_timeout(self, temp_dir: Path):
+        """Commands exceeding the timeout are killed and reported."""
+        result = await execute_bash({"command": "sleep 2", "timeout": 0.2}, cwd=temp_dir)
+
+        assert result.get("timeout") is True
+
+    async def test_large_output_truncated(self, temp_dir: Path, monkeypatch):
+        """Only the start and end of large output are kept."""
+        import core.glm_tools.bash as bash_module
+
+        monkeypatch.setattr(bash_module, "OUTPUT_HEAD_BYTES", 1000)
+        monkeypatch.setattr(bash_module, "OUTPUT_TAIL_BYTES", 500)
+
+        result = await execute_bash(
+            {"command": "head -c 5000 /dev/zero | tr '\\0' x; printf END"}, cwd=temp_dir
+        )
+
+        head, marker, tail = result["stdout"].partition(
+            "\n... [output truncated: 3503 bytes omitted] ...\n"
+        )
+        assert result["exit_code"] == 0
+        assert marker
+        assert head == "x" * 1000
+        assert tail == "x" * 497 + "END"
+
+    async def test_simple_command_skips_shell(self, temp_dir: Path, monkeypatch):
+        """Plain invocations are exec'd; shell syntax still goes to the shell."""
+        import asyncio
+
+        shell_calls = []
+        real_shell = asyncio.create_subprocess_shell
+
+        async def spy_shell(cmd, **kwargs):
+            shell_calls.append(cmd)
+            return await real_shell(cmd, **kwargs)
+
+        monkeypatch.setattr(asyncio, "create_subprocess_shell", spy_shell)
+
+        quoted = await execute_bash({"command": "printf '%s' 'a b'"}, cwd=temp_dir)
+        piped = await execute_bash({"command": "echo hi | tr h H"}, cwd=temp_dir)
+
+        assert quoted["stdout"] == "a b"
+        assert piped["stdout"].strip() == "Hi"
+        assert shell_calls == ["echo hi | tr h H"]
+
+    @pytest.mark.parametrize(
+        "command, expected",
+        [
+            ("command -v sh", "/sh"),
+            ("hash sh", ""),
+            ("type sh", "sh is"),
+        ],
+    )
+    async def test_builtins_run_in_shell(self, temp_dir: Path, command, expected):
+        """Builtins without an executable on PATH still run through the shell."""
+        result = await execute_bash({"command": command}, cwd=temp_dir)
+
+        assert result["exit_code"] == 0
+        assert expected in result["stdout"]
+
+    async def test_missing_program(self, temp_dir: Path):
+        """An unknown program reports exit code 127 like the shell does."""
+        result = await execute_bash({"command": "no-such-program-xyz --help"}, cwd=temp_dir)
+
+        assert result["exit_code"] == 127
+        assert result["success"] is False
+
+
+class TestCommandValidation:
+    """Tests for validate_command_with_profile()."""
+
+    def test_results_cached_per_profile(self, monkeypatch):
+        """Repeated commands are checked once per profile object."""
+        pytest.importorskip("project_analyzer")
+        import core.glm_tools.bash as bash_module
+        from project_analyzer import SecurityProfile
+
+        checks = []
+        real_check = bash_module.is_command_allowed
+
+        def counting_check(cmd, profile):
+            checks.append(cmd)
+            return real_check(cmd, profile)
+
+        monkeypatch.setattr(bash_module, "is_command_allowed", counting_check)
+        bash_module._validate_cached.cache_clear()
+
+        profile = SecurityProfile(base_commands={"git"})
+        assert bash_module.validate_command_with_profile("git status", profile) == (True, "")
+        assert bash_module.validate_command_with_profile("git status", profile) == (True, "")
+        assert checks == ["git"]
+
+        # A new profile (e.g. after the profile file changed) is re-checked
+        stricter = SecurityProfile(base_commands={"ls"})
+        allowed, _ = bash_module.validate_command_with_profile("git status", stricter)
+        assert not allowed
+        assert checks == ["git", "git"]
+
+
+class TestWebFetch:
+    """Tests for execute_web_fetch()."""
+
+    async def test_client_reused_across_fetches(self, monkeypatch):
+        """Fetches share one pooled client until it is shut down."""
+        httpx = pytest.importorskip("httpx")
+        import weakref
+
+        import core.glm_tools.web as web_module
+        from core.glm_tools.web import execute_web_fetch, shutdown_web_client
+
+        created = []
+        real_client = httpx.AsyncClient
+
+        def make_client(**kwargs):
+            def handler(request):
+                return httpx.Response(200, text=f"page {request.url.path}")
+
+            client = real_client(transport=httpx.MockTransport(handler))
+            created.append(client)
+            return client
+
+        monkeypatch.setattr(httpx, "AsyncClient", make_client)
+        monkeypatch.setattr(web_module, "_FETCH_CLIENTS", weakref.WeakKeyDictionary())
+
+        first = await execute_web_fetch({"url": "https://docs.example/a"})
+        second = await execute_web_fetch({"url": "https://docs.example/b"})
+
+        assert (first["content"], second["content"]) == ("page /a", "page /b")
+        assert len(created) == 1
+        await shutdown_web_client()
+        assert created[0].is_closed
+
+    async def test_cookies_not_carried_between_fetches(self, monkeypatch):
+        """Cookies set by one fetch are not sent with the next."""
+        httpx = pytest.importorskip("httpx")
+        import weakref
+
+        import core.glm_tools.web as web_module
+        from core.glm_tools.web import execute_web_fetch, shutdown_web_client
+
+        sent_cookies = []
+        real_client = httpx.AsyncClient
+
+        def make_client(**kwargs):
+            def handler(request):
+                sent_cookies.append(request.headers.get("cookie"))
+                return httpx.Response(200, text="ok", headers={"set-cookie": "session=abc"})
+
+            return real_client(
+                transport=httpx.MockTransport(handler), cookies=kwargs.get("cookies")
+            )
+
+        monkeypatch.setattr(httpx, "AsyncClient", make_client)
+        monkeypatch.setattr(web_module, "_FETCH_CLIENTS", weakref.WeakKeyDictionary())
+
+        await execute_web_fetch({"url": "https://docs.example/a"})
+        await execute_web_fetch({"url": "https://docs.example/b"})
+        await shutdown_web_client()
+
+        assert sent_cookies == [None, None]
@@ -0,0 +1,103 @@
+"""
+Tests for the auto-claude custom tool registry and tool decorator.
+
+Covers tool list caching in agents.tools_pkg.registry and the metadata
+helpers in agents.tools_pkg.tools.decorators.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent / "apps" / "backend"
+sys.path.insert(0, str(backend_path))
+
+
+class TestCreateAllTools:
+    """Tests for create_all_tools() caching."""
+
+    def test_returns_fresh_list_with_shared_tools(self, temp_dir: Path):
+        """Repeated calls reuse tool closures but return independent lists."""
+        from agents.tools_pkg.registry import clear_tool_cache, create_all_tools
+
+        clear_tool_cache()
+        first = create_all_tools(temp_dir, temp_dir)
+        second = create_all_tools(temp_dir, temp_dir)
+
+        assert first is not second
+        assert first == second
+        assert len(first) > 0
+
+        first.clear()
+        assert len(create_all_tools(temp_dir, temp_dir)) == len(second)
+
+    def test_clear_tool_cache_rebuilds_tools(self, temp_dir: Path):
+        """clear_tool_cache() forces new tool closures to be created."""
+        from agents.tools_pkg.registry import clear_tool_cache, create_all_tools
+
+        before = create_all_tools(temp_dir, temp_dir)
+        clear_tool_cache()
+        after = create_all_tools(temp_dir, temp_dir)
+
+        assert before[0] is not after[0]
+
+    def test_categories_filter(self, temp_dir: Path):
+        """Only the requested tool categories are built."""
+        from agents.tools_pkg.registry import create_all_tools
+        from agents.tools_pkg.tools.decorators import get_tool_metadata
+
+        tools = create_all_tools(temp_dir, temp_dir, categories=frozenset({"qa"}))
+        names = {get_tool_metadata(t)["name"] for t in tools}
+
+        assert names == {"update_qa_status"}
+
+    def test_unknown_category_raises(self, temp_dir: Path):
+        """Unknown category names are rejected."""
+        from agents.tools_pkg.registry import create_all_tools
+
+        with pytest.raises(ValueError):
+            create_all_tools(temp_dir, temp_dir, categories=frozenset({"nope"}))
+
+
+class TestToolDecorator:
+    """Tests for the @tool decorator and metadata helpers."""
+
+    def test_decorator_returns_original_function(self):
+        """@tool attaches metadata without wrapping the coroutine function."""
+        from agents.tools_pkg.tools.decorators import is_tool, tool
+
+        async def sample(args: dict) -> dict:
+            return {"content": []}
+
+        decorated = tool("sample", "A sample tool", {"x": str})(sample)
+
+        assert decorated is sample
+        assert is_tool(decorated)
+        assert decorated._tool_name == "sample"
+
+    def test_get_tool_metadata(self):
+        """get_tool_metadata returns name, description and parameters."""
+        from agents.tools_pkg.tools.decorators import get_tool_metadata, tool
+
+        @tool("sample", "A sample tool", {"x": str})
+        async def sample(args: dict) -> dict:
+            return {"content": []}
+
+        assert get_tool_metadata(sample) == {
+            "name": "sample",
+            "description": "A sample tool",
+            "parameters": {"x": str},
+        }
+        assert get_tool_metadata(sample) is get_tool_metadata(sample)
+
+    def test_get_tool_metadata_rejects_plain_function(self):
+        """Undecorated functions raise ValueError."""
+        from agents.tools_pkg.tools.decorators import get_tool_metadata
+
+        def plain():
+            pass
+
+        with pytest.raises(ValueError):
+            get_tool_metadata(plain)